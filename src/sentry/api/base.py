@@ -205,7 +205,7 @@ class BaseEndpointMixin(abc.ABC):
         paginator_cls=Paginator,
         default_per_page: int | None = None,
         max_per_page: int | None = None,
-        cursor_cls=Cursor,
+        cursor_cls=None,
         response_cls=Response,
         response_kwargs=None,
         count_hits=None,
@@ -545,12 +545,17 @@ class Endpoint(APIView):
         paginator_cls=Paginator,
         default_per_page: int | None = None,
         max_per_page: int | None = None,
-        cursor_cls=Cursor,
+        cursor_cls=None,
         response_cls=Response,
         response_kwargs=None,
         count_hits=None,
         **paginator_kwargs,
     ):
+        if cursor_cls is None:
+            # Paginators with their own cursor format (like the `KeysetPaginator`) declare it, so
+            # they can be swapped in by only changing the paginator.
+            cursor_cls = getattr(paginator or paginator_cls, "cursor_cls", Cursor)
+
         try:
             per_page = self.get_per_page(request, default_per_page, max_per_page)
             cursor = self.get_cursor_from_request(request, cursor_cls)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import re
-from collections import namedtuple
-from collections.abc import Mapping, Sequence
+import threading
+from copy import deepcopy
+from collections import OrderedDict, namedtuple
+from collections.abc import Hashable, Mapping, Sequence
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from functools import reduce
@@ -565,6 +567,25 @@ class SearchConfig:
             setattr(config, key, val)
         return config
 
+    def cache_key(self) -> Hashable:
+        """
+        A hashable fingerprint of the configuration, used to cache the queries
+        parsed with it.
+        """
+        # `vars` includes the dataclass fields and attributes set by
+        # `create_from`, like `allow_boolean` and `free_text_key`.
+        return (type(self), _freeze(vars(self)))
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return frozenset((key, _freeze(val)) for key, val in value.items())
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    return value
+
 
 class SearchVisitor(NodeVisitor):
     unwrapped_exceptions = (InvalidSearchQuery,)
@@ -576,18 +597,23 @@ class SearchVisitor(NodeVisitor):
             config = SearchConfig()
         self.config = config
         self.params = params if params is not None else {}
-        if builder is None:
-            # Avoid circular import
-            from sentry.search.events.builder.discover import UnresolvedQuery
-
-            # TODO: read dataset from config
-            self.builder = UnresolvedQuery(
-                dataset=Dataset.Discover,
-                params=self.params,
-                config=QueryBuilderConfig(functions_acl=list(FUNCTIONS)),
-            )
-        else:
+        if builder is not None:
             self.builder = builder
+        # Whether the query has filters relative to the current time
+        self.uses_current_time = False
+
+    @cached_property
+    def builder(self):
+        # Avoid circular import
+        from sentry.search.events.builder.discover import UnresolvedQuery
+
+        # Only built when the type of a key is needed, it's expensive to create.
+        # TODO: read dataset from config
+        return UnresolvedQuery(
+            dataset=Dataset.Discover,
+            params=self.params,
+            config=QueryBuilderConfig(functions_acl=list(FUNCTIONS)),
+        )
 
     @cached_property
     def key_mappings_lookup(self):
@@ -734,6 +760,7 @@ class SearchVisitor(NodeVisitor):
         (search_key, _, value) = children
 
         if self.is_date_key(search_key.name):
+            self.uses_current_time = True
             try:
                 from_val, to_val = parse_datetime_range(value.text)
             except InvalidQuery as exc:
@@ -943,6 +970,7 @@ class SearchVisitor(NodeVisitor):
         operator = handle_negation(negation, operator)
         is_date_aggregate = any(key in search_key.name for key in self.config.date_keys)
         if is_date_aggregate:
+            self.uses_current_time = True
             try:
                 from_val, to_val = parse_datetime_range(search_value.text)
             except InvalidQuery as exc:
@@ -976,7 +1004,9 @@ class SearchVisitor(NodeVisitor):
 
     def visit_is_filter(self, node, children):
         negation, _, _, _, search_value = children
+        return self._handle_is_filter(is_negated(negation), search_value)
 
+    def _handle_is_filter(self, negated, search_value):
         translators = self.config.is_filter_translation
 
         if not translators:
@@ -993,7 +1023,7 @@ class SearchVisitor(NodeVisitor):
 
         search_key, search_value = translators[search_value.raw_value]
 
-        operator = "!=" if is_negated(negation) else "="
+        operator = "!=" if negated else "="
         search_key = SearchKey(search_key)
         search_value = SearchValue(search_value)
 
@@ -1075,7 +1105,9 @@ class SearchVisitor(NodeVisitor):
         return f'"{value}"'
 
     def visit_search_key(self, node, children):
-        key = children[0]
+        return self._handle_search_key(children[0])
+
+    def _handle_search_key(self, key):
         if (
             self.config.allowed_keys
             and key not in self.config.allowed_keys
@@ -1232,6 +1264,86 @@ QueryOp = Literal["AND", "OR"]
 QueryToken = Union[SearchFilter, QueryOp, ParenExpression]
 
 
+#: Number of parsed queries kept by `parse_search_query`
+PARSE_CACHE_SIZE = 2000
+
+
+class ParsedQueryCache:
+    """
+    A process-local LRU cache of parsed search queries, keyed by the query and
+    the fingerprint of the config it was parsed with.
+
+    Callers get their own copy of the cached tokens, so changes to the
+    returned tokens (or to lists in them, like `raw_value`s and the children of
+    `ParenExpression`s) don't leak into the cache.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._items: OrderedDict[Hashable, tuple[QueryToken, ...]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> list[QueryToken] | None:
+        with self._lock:
+            tokens = self._items.get(key)
+            if tokens is None:
+                return None
+            self._items.move_to_end(key)
+        return deepcopy(list(tokens))
+
+    def set(self, key: Hashable, tokens: Sequence[QueryToken]) -> None:
+        with self._lock:
+            self._items[key] = tuple(deepcopy(list(tokens)))
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+parse_cache = ParsedQueryCache(PARSE_CACHE_SIZE)
+
+# A `key:value` text filter (or `is:` filter) without quotes or escapes. Values which don't start
+# with a digit, sign, operator or bracket can't be numbers, dates, durations, sizes or lists, so
+# the grammar parses these with `text_filter` or `is_filter`.
+SIMPLE_FILTER_RE = re.compile(r'(!?)([a-zA-Z0-9_.-]+):([^\s()"\\0-9<>=!+\-\[][^\s()"\\]*)')
+
+
+def _parse_simple_query(query: str, visitor: SearchVisitor) -> list[SearchFilter] | None:
+    """
+    Parses queries which consist of nothing but simple `key:value` filters, such
+    as `is:unresolved assigned:me`, without running the grammar. Returns `None`
+    for any other query.
+    """
+    terms = []
+    for term in query.split(" "):
+        if not term:
+            continue
+        match = SIMPLE_FILTER_RE.fullmatch(term)
+        if match is None:
+            return None
+        negation, key, value = match.groups()
+        # `has:` filters and boolean values are parsed by other rules
+        if key == "has" or value.lower() in ("true", "false"):
+            return None
+        terms.append((bool(negation), key, SearchValue(value)))
+
+    search_filters = []
+    for negated, key, search_value in terms:
+        search_key = visitor._handle_search_key(key)
+        if key == "is":
+            search_filters.append(visitor._handle_is_filter(negated, search_value))
+        else:
+            operator = "!=" if negated else "="
+            search_filters.append(visitor._handle_text_filter(search_key, operator, search_value))
+    return search_filters
+
+
 def parse_search_query(
     query, config=None, params=None, builder=None, config_overrides=None
 ) -> list[
@@ -1240,20 +1352,43 @@ def parse_search_query(
     if config is None:
         config = default_config
 
-    try:
-        tree = event_search_grammar.parse(query)
-    except IncompleteParseError as e:
-        idx = e.column()
-        prefix = query[max(0, idx - 5) : idx]
-        suffix = query[idx : (idx + 5)]
-        raise InvalidSearchQuery(
-            "{} {}".format(
-                f"Parse error at '{prefix}{suffix}' (column {e.column():d}).",
-                "This is commonly caused by unmatched parentheses. Enclose any text in double quotes.",
-            )
-        )
-
     if config_overrides:
         config = SearchConfig.create_from(config, **config_overrides)
 
-    return SearchVisitor(config, params=params, builder=builder).visit(tree)
+    # The types of keys depend on the builder (and the params it's created
+    # with), so only queries parsed without either are cached.
+    cache_key: Hashable | None = None
+    if builder is None and not params:
+        try:
+            cache_key = (query, config.cache_key())
+            search_filters = parse_cache.get(cache_key)
+        except TypeError:
+            # Unhashable config values
+            cache_key = None
+        else:
+            if search_filters is not None:
+                return search_filters
+
+    visitor = SearchVisitor(config, params=params, builder=builder)
+    search_filters = _parse_simple_query(query, visitor) if isinstance(query, str) else None
+
+    if search_filters is None:
+        try:
+            tree = event_search_grammar.parse(query)
+        except IncompleteParseError as e:
+            idx = e.column()
+            prefix = query[max(0, idx - 5) : idx]
+            suffix = query[idx : (idx + 5)]
+            raise InvalidSearchQuery(
+                "{} {}".format(
+                    f"Parse error at '{prefix}{suffix}' (column {e.column():d}).",
+                    "This is commonly caused by unmatched parentheses. Enclose any text in double quotes.",
+                )
+            )
+
+        search_filters = visitor.visit(tree)
+
+    if cache_key is not None and not visitor.uses_current_time:
+        parse_cache.set(cache_key, search_filters)
+
+    return search_filters
@@ -1,17 +1,26 @@
+import base64
 import bisect
+import binascii
 import functools
 import logging
 import math
 from collections.abc import Callable, Sequence
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import Any
 from urllib.parse import quote
 
-from django.core.exceptions import EmptyResultSet, ObjectDoesNotExist
+from django.core.exceptions import (
+    EmptyResultSet,
+    FieldDoesNotExist,
+    ObjectDoesNotExist,
+    ValidationError,
+)
 from django.db import connections
+from django.db.models import Field, Q
 from django.db.models.functions import Lower
 
-from sentry.utils.cursors import Cursor, CursorResult, build_cursor
+from sentry.utils import json
+from sentry.utils.cursors import Cursor, CursorResult, StringCursor, build_cursor
 from sentry.utils.pagination_factory import PaginatorLike
 
 quote_name = connections["default"].ops.quote_name
@@ -41,6 +50,33 @@ def count_hits(queryset, max_hits):
     return cursor.fetchone()[0]
 
 
+def estimate_hits(queryset, max_hits):
+    """
+    Estimates the number of rows of a queryset from the Postgres planner statistics, instead of
+    counting them. Small estimates are unreliable (e.g. for tables that were never analyzed) and
+    cheap to verify, so they are replaced with an exact count.
+    """
+    if not max_hits:
+        return 0
+    hits_query = queryset.values().query
+    hits_query.clear_select_clause()
+    hits_query.add_fields(["id"])
+    hits_query.clear_ordering(force=True, clear_default=True)
+    try:
+        h_sql, h_params = hits_query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    cursor = connections[queryset.using_replica().db].cursor()
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {h_sql}", h_params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate < max_hits:
+        return count_hits(queryset, max_hits)
+    return max_hits
+
+
 class BadPaginationError(Exception):
     pass
 
@@ -383,6 +419,195 @@ class MergingOffsetPaginator(OffsetPaginator):
         return CursorResult(results=results, next=next_cursor, prev=prev_cursor)
 
 
+class KeysetPaginator(PaginatorLike):
+    """
+    A drop-in replacement for the ``OffsetPaginator`` which pages through a queryset by filtering
+    on the values of the ordered columns of the last row of the previous page, instead of using
+    OFFSET. As long as the ordered columns are indexed, the cost of a page doesn't depend on how
+    deep it is.
+
+    The primary key is added to the ordered columns as a tie-breaker, unless it is part of them
+    already, so rows are totally ordered. Columns can be ordered in different directions, but must
+    not be nullable. Cursors are ``StringCursor`` instances whose value encodes the ordered values
+    of a row. Their offset is 1 if the page includes the row the cursor was built from, which is
+    only the case for cursors of empty pages.
+
+    With ``estimate_hits``, hits are estimated from the Postgres planner statistics instead of
+    being counted.
+    """
+
+    cursor_cls = StringCursor
+
+    def __init__(
+        self,
+        queryset,
+        order_by=None,
+        max_limit=MAX_LIMIT,
+        max_offset=None,
+        on_results=None,
+        estimate_hits=False,
+    ):
+        # `max_offset` is accepted for compatibility with the `OffsetPaginator`, but the cost of a
+        # page doesn't depend on its depth.
+        if order_by is None:
+            order_by = queryset.query.order_by or ("pk",)
+        elif isinstance(order_by, str):
+            order_by = (order_by,)
+
+        model = queryset.model
+        self.order_by: list[tuple[str, bool]] = []
+        self.fields: list[Field] = []
+        for column in order_by:
+            desc = column.startswith("-")
+            name = column.lstrip("-")
+            self.order_by.append((name, desc))
+            self.fields.append(self._get_field(model, name))
+
+        if not any(field.primary_key and field.model is model for field in self.fields):
+            self.order_by.append((model._meta.pk.name, self.order_by[-1][1]))
+            self.fields.append(model._meta.pk)
+
+        self.queryset = queryset
+        self.max_limit = max_limit
+        self.on_results = on_results
+        self.estimate_hits = estimate_hits
+
+    @staticmethod
+    def _get_field(model, name):
+        field = None
+        for part in name.split("__"):
+            if field is not None:
+                if field.related_model is None:
+                    raise ValueError(f"Cannot order by {name!r}")
+                model = field.related_model
+            try:
+                field = model._meta.pk if part == "pk" else model._meta.get_field(part)
+            except FieldDoesNotExist:
+                raise ValueError(f"Cannot order by {name!r}")
+            if not field.concrete:
+                raise ValueError(f"Cannot order by {name!r}")
+        assert field is not None
+        return field
+
+    def get_item_key(self, item) -> tuple[Any, ...]:
+        key = []
+        for (name, _), field in zip(self.order_by, self.fields):
+            value = item
+            for part in name.split("__")[:-1]:
+                value = getattr(value, part)
+            key.append(getattr(value, field.attname))
+        return tuple(key)
+
+    def _encode_key(self, key: tuple[Any, ...]) -> str:
+        values = [
+            (
+                value.isoformat()
+                if isinstance(value, date)
+                else value
+                if isinstance(value, (int, float, str))
+                else str(value)
+            )
+            for value in key
+        ]
+        raw = json.dumps(values)
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def _decode_key(self, value: str) -> tuple[Any, ...]:
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return tuple(field.to_python(value) for field, value in zip(self.fields, values))
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, ValidationError):
+            raise BadPaginationError("Invalid cursor")
+
+    def _build_queryset(self, key, is_prev, inclusive):
+        queryset = self.queryset.order_by(
+            *(f"-{name}" if desc != is_prev else name for name, desc in self.order_by)
+        )
+        if key is None:
+            return queryset
+
+        # (a, b) > (x, y) is expanded to a >= x AND (a > x OR (a = x AND b > y)), the redundant
+        # bound on the first column allows Postgres to use it for an index range scan.
+        condition = Q()
+        equal = Q()
+        for (name, desc), value in zip(self.order_by, key):
+            lookup = "lt" if desc != is_prev else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        if inclusive:
+            condition |= equal
+
+        name, desc = self.order_by[0]
+        lookup = "lte" if desc != is_prev else "gte"
+        return queryset.filter(Q(**{f"{name}__{lookup}": key[0]}) & condition)
+
+    def get_result(
+        self,
+        limit: int = 100,
+        cursor: Any = None,
+        count_hits: Any = False,
+        known_hits: Any = None,
+        max_hits: Any = None,
+    ):
+        limit = min(limit, self.max_limit)
+
+        if cursor is None:
+            cursor = StringCursor("", 0, 0)
+
+        key = self._decode_key(str(cursor.value)) if cursor.value else None
+        is_prev = cursor.is_prev
+        inclusive = bool(cursor.offset)
+
+        queryset = self._build_queryset(key, is_prev, inclusive)
+        results = list(queryset[: limit + 1])
+        has_more = len(results) > limit
+        results = results[:limit]
+        if is_prev:
+            results.reverse()
+
+        if results:
+            first_value = self._encode_key(self.get_item_key(results[0]))
+            last_value = self._encode_key(self.get_item_key(results[-1]))
+            next_cursor = StringCursor(last_value, 0, False, has_more if not is_prev else True)
+            prev_cursor = StringCursor(
+                first_value, 0, True, has_more if is_prev else key is not None
+            )
+        else:
+            # There is no row to build the cursors from, so they start from the row the current
+            # cursor was built from, including it.
+            value = cursor.value if key is not None else ""
+            next_cursor = StringCursor(value, 1, False, is_prev and key is not None)
+            prev_cursor = StringCursor(value, 1, True, not is_prev and key is not None)
+
+        if self.on_results:
+            results = self.on_results(results)
+
+        if max_hits is None:
+            max_hits = MAX_HITS_LIMIT
+        if count_hits:
+            hits = self.count_hits(max_hits)
+        elif known_hits is not None:
+            hits = known_hits
+        else:
+            hits = None
+
+        return CursorResult(
+            results=results,
+            next=next_cursor,
+            prev=prev_cursor,
+            hits=hits,
+            max_hits=max_hits if count_hits else None,
+        )
+
+    def count_hits(self, max_hits):
+        if self.estimate_hits:
+            return estimate_hits(self.queryset, max_hits)
+        return count_hits(self.queryset, max_hits)
+
+
 def reverse_bisect_left(a, x, lo=0, hi=None):
     """\
     Similar to ``bisect.bisect_left``, but expects the data in the array ``a``
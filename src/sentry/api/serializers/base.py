@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import contextvars
 import logging
-from collections.abc import Callable, Mapping, MutableMapping, Sequence
+import threading
+from collections.abc import Callable, Generator, Mapping, MutableMapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from operator import attrgetter
 from typing import Any, TypeVar
 
 import sentry_sdk
 from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections, connections
+
+from sentry import options
+from sentry.utils.env import in_test_environment
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +23,196 @@ K = TypeVar("K")
 
 registry: MutableMapping[Any, Any] = {}
 
+PREFETCH_WORKERS_OPTION = "api.serializers.prefetch-workers"
+
+
+def _none() -> None:
+    return None
+
+
+@dataclass(frozen=True)
+class Prefetch:
+    """
+    Related data a serializer loads for all of its items at once, stored in the attrs of every item.
+
+    `loader` is called with the items (one per key) and the viewing user, and returns the data by
+    `key(item)`. Items it returns nothing for get `default()`. Loaders of data that doesn't depend
+    on the viewing user set `per_user=False`, are called with the items only and share their
+    results between users. Serializers using the same loader share its results for the duration
+    of the outermost `serialize` call, so it must always be used with the same kind of key.
+    """
+
+    loader: Callable[..., Mapping[Any, Any]]
+    key: Callable[[Any], Any] = attrgetter("id")
+    default: Callable[[], Any] = _none
+    per_user: bool = True
+
+    def loaded_key(self, user: Any) -> tuple[Any, Any]:
+        """The key of the data loaded so far in the results shared by nested `serialize` calls."""
+        return (self.loader, getattr(user, "id", None) if self.per_user else None)
+
+    def load(self, items: Sequence[Any], user: Any) -> Mapping[Any, Any]:
+        if self.per_user:
+            return self.loader(items, user)
+        return self.loader(items)
+
+
+# Results of loaders, by loader and user, shared by nested `serialize` calls
+_prefetched: contextvars.ContextVar[
+    dict[tuple[Any, Any], dict[Any, Any]] | None
+] = contextvars.ContextVar("serializer_prefetched", default=None)
+
+_MISSING = object()
+
+
+class _PendingLoad:
+    """A call of a loader, whose results are stored with the data loaded so far once it's done."""
+
+    def __init__(
+        self,
+        loaded: dict[Any, Any],
+        keys: Sequence[Any],
+        result: Future[Mapping[Any, Any]] | Mapping[Any, Any],
+    ) -> None:
+        self.loaded = loaded
+        self.keys = keys
+        self.result = result
+        self.done = False
+
+    def wait(self) -> None:
+        if self.done:
+            return
+        result = self.result.result() if isinstance(self.result, Future) else self.result
+        for key in self.keys:
+            self.loaded[key] = result.get(key, _MISSING)
+        self.done = True
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ThreadPoolExecutor:
+    global _executor, _executor_workers
+
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="serializers")
+            _executor_workers = workers
+        return _executor
+
+
+@contextmanager
+def _prefetch_scope() -> Generator[dict[tuple[Any, Any], dict[Any, Any]], None, None]:
+    prefetched = _prefetched.get()
+    if prefetched is not None:
+        yield prefetched
+        return
+
+    prefetched = {}
+    token = _prefetched.set(prefetched)
+    try:
+        yield prefetched
+    finally:
+        _prefetched.reset(token)
+
+
+def _run_loader_in_worker(prefetch: Prefetch, items: Sequence[Any], user: Any) -> Mapping[Any, Any]:
+    # Worker threads hold their own connection, which is recycled the
+    # same way Django recycles the connection of a request.
+    close_old_connections()
+    try:
+        return prefetch.load(items, user)
+    finally:
+        close_old_connections()
+
+
+def _in_transaction() -> bool:
+    """
+    Whether a transaction is open on any database. Worker threads use their own connections, so
+    they can't see the rows written in it.
+    """
+    if in_test_environment():
+        # Tests run in transactions, only the ones opened by the test itself count
+        from sentry.testutils.hybrid_cloud import simulated_transaction_watermarks  # NOQA:S007
+
+        return bool(simulated_transaction_watermarks.connections_above_watermark())
+    return any(connection.in_atomic_block for connection in connections.all())
+
+
+def _start_prefetch(
+    plan: Mapping[str, Prefetch],
+    item_list: Sequence[Any],
+    user: Any,
+    prefetched: dict[tuple[Any, Any], dict[Any, Any]],
+) -> list[_PendingLoad]:
+    """
+    Calls every loader of the plan once, with the items whose keys weren't loaded yet. With
+    prefetch workers configured the loaders run in the background, unless a transaction is open.
+    """
+    prefetch_by_loaded_key: dict[tuple[Any, Any], Prefetch] = {}
+    items_by_loaded_key: dict[tuple[Any, Any], dict[Any, Any]] = {}
+    for prefetch in plan.values():
+        loaded_key = prefetch.loaded_key(user)
+        loaded = prefetched.setdefault(loaded_key, {})
+        prefetch_by_loaded_key.setdefault(loaded_key, prefetch)
+        items = items_by_loaded_key.setdefault(loaded_key, {})
+        for item in item_list:
+            key = prefetch.key(item)
+            if key not in loaded and key not in items:
+                items[key] = item
+
+    workers = options.get(PREFETCH_WORKERS_OPTION)
+    executor = _get_executor(workers) if workers > 0 and not _in_transaction() else None
+
+    loads: list[_PendingLoad] = []
+    for loaded_key, items in items_by_loaded_key.items():
+        if not items:
+            continue
+        prefetch = prefetch_by_loaded_key[loaded_key]
+        result: Future[Mapping[Any, Any]] | Mapping[Any, Any]
+        if executor is None:
+            result = prefetch.load(list(items.values()), user)
+        else:
+            context = contextvars.copy_context()
+            result = executor.submit(
+                context.run, _run_loader_in_worker, prefetch, list(items.values()), user
+            )
+        loaded = prefetched[loaded_key]
+        load = _PendingLoad(loaded, list(items), result)
+        # Nested serializers wait for this load rather than loading the same keys again
+        for key in items:
+            loaded[key] = load
+        loads.append(load)
+    return loads
+
+
+def _finish_prefetch(
+    plan: Mapping[str, Prefetch],
+    item_list: Sequence[Any],
+    user: Any,
+    prefetched: dict[tuple[Any, Any], dict[Any, Any]],
+    loads: Sequence[_PendingLoad],
+    attrs: MutableMapping[Any, Any],
+) -> None:
+    """Waits for the loaders of the plan and adds their data to the attrs of every item."""
+    for load in loads:
+        load.wait()
+
+    for name, prefetch in plan.items():
+        loaded = prefetched[prefetch.loaded_key(user)]
+        for item in item_list:
+            key = prefetch.key(item)
+            value = loaded[key]
+            if isinstance(value, _PendingLoad):
+                # Loaded by an enclosing serializer
+                value.wait()
+                value = loaded[key]
+            attrs.setdefault(item, {})[name] = prefetch.default() if value is _MISSING else value
+
 
 def register(type: Any) -> Callable[[type[K]], type[K]]:
     """A wrapper that adds the wrapped Serializer to the Serializer registry (see above) for the key `type`."""
@@ -61,17 +261,32 @@ def serialize(
                 pass
         else:
             return objects
-    with sentry_sdk.start_span(op="serialize", description=type(serializer).__name__) as span:
+    with (
+        sentry_sdk.start_span(op="serialize", description=type(serializer).__name__) as span,
+        _prefetch_scope() as prefetched,
+    ):
         span.set_data("Object Count", len(objects))
 
+        # avoid passing NoneType's to the serializer as they're allowed and
+        # filtered out of serialize()
+        item_list = [o for o in objects if o is not None]
+
+        plan = serializer.get_prefetch_plan(item_list=item_list, user=user, **kwargs)
+        loads: list[_PendingLoad] = []
+        if plan:
+            with sentry_sdk.start_span(
+                op="serialize.prefetch", description=type(serializer).__name__
+            ):
+                loads = _start_prefetch(plan, item_list, user, prefetched)
+
         with sentry_sdk.start_span(op="serialize.get_attrs", description=type(serializer).__name__):
-            attrs = serializer.get_attrs(
-                # avoid passing NoneType's to the serializer as they're allowed and
-                # filtered out of serialize()
-                item_list=[o for o in objects if o is not None],
-                user=user,
-                **kwargs,
-            )
+            attrs = serializer.get_attrs(item_list=item_list, user=user, **kwargs)
+
+        if plan:
+            with sentry_sdk.start_span(
+                op="serialize.prefetch", description=type(serializer).__name__
+            ):
+                _finish_prefetch(plan, item_list, user, prefetched, loads, attrs)
 
         with sentry_sdk.start_span(op="serialize.iterate", description=type(serializer).__name__):
             return [serializer(o, attrs=attrs.get(o, {}), user=user, **kwargs) for o in objects]
@@ -88,6 +303,22 @@ class Serializer:
             return None
         return self._serialize(obj, attrs, user, **kwargs)
 
+    def get_prefetch_plan(
+        self, item_list: Sequence[Any], user: Any, **kwargs: Any
+    ) -> Mapping[str, Prefetch]:
+        """
+        Declare the related data of the objects in `item_list` that `serialize` loads up front.
+
+        Data of the plan is loaded before (or, with prefetch workers, while) `get_attrs` runs and
+        then stored in the attrs of every object, under its name in the plan.
+
+        :param item_list: List of input objects that should be serialized.
+        :param user: The user who will be viewing the objects.
+        :param kwargs: Any
+        :returns A mapping of attribute names to a `Prefetch` loading them.
+        """
+        return {}
+
     def get_attrs(
         self, item_list: Sequence[Any], user: Any, **kwargs: Any
     ) -> MutableMapping[Any, Any]:
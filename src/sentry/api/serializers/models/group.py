@@ -13,7 +13,7 @@ from django.conf import settings
 from django.db.models import Min, prefetch_related_objects
 
 from sentry import features, tagstore
-from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers import Prefetch, Serializer, register, serialize
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.api.serializers.models.plugin import is_plugin_deprecated
 from sentry.app import env
@@ -72,6 +72,21 @@ def merge_list_dictionaries(
         dict1.setdefault(key, []).extend(val)
 
 
+def get_bookmarked_groups(groups: Sequence[Group], user: Any) -> Mapping[int, bool]:
+    if not user.is_authenticated:
+        return {}
+    return dict.fromkeys(
+        GroupBookmark.objects.filter(user_id=user.id, group__in=groups).values_list(
+            "group_id", flat=True
+        ),
+        True,
+    )
+
+
+def get_share_ids_by_groups(groups: Sequence[Group]) -> Mapping[int, str]:
+    return dict(GroupShare.objects.filter(group__in=groups).values_list("group_id", "uuid"))
+
+
 class GroupAnnotation(TypedDict):
     displayName: str
     url: str
@@ -189,6 +204,14 @@ class GroupSerializerBase(Serializer, ABC):
 
         return result
 
+    def get_prefetch_plan(
+        self, item_list: Sequence[Group], user: Any, **kwargs: Any
+    ) -> Mapping[str, Prefetch]:
+        return {
+            "is_bookmarked": Prefetch(get_bookmarked_groups, default=bool),
+            "share_id": Prefetch(get_share_ids_by_groups, per_user=False),
+        }
+
     def get_attrs(
         self, item_list: Sequence[Group], user: Any, **kwargs: Any
     ) -> MutableMapping[Group, MutableMapping[str, Any]]:
@@ -199,11 +222,6 @@ class GroupSerializerBase(Serializer, ABC):
         prefetch_related_objects(item_list, "project__organization")
 
         if user.is_authenticated and item_list:
-            bookmarks = set(
-                GroupBookmark.objects.filter(user_id=user.id, group__in=item_list).values_list(
-                    "group_id", flat=True
-                )
-            )
             seen_groups = dict(
                 GroupSeen.objects.filter(user_id=user.id, group__in=item_list).values_list(
                     "group_id", "last_seen"
@@ -211,7 +229,6 @@ class GroupSerializerBase(Serializer, ABC):
             )
             subscriptions = self._get_subscriptions(item_list, user)
         else:
-            bookmarks = set()
             seen_groups = {}
             subscriptions = defaultdict(lambda: (False, False, None))
 
@@ -238,10 +255,6 @@ class GroupSerializerBase(Serializer, ABC):
         else:
             actors = {}
 
-        share_ids = dict(
-            GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid")
-        )
-
         seen_stats = self._get_seen_stats(item_list, user)
 
         organization_id_list = list({item.project.organization_id for item in item_list})
@@ -292,7 +305,6 @@ class GroupSerializerBase(Serializer, ABC):
             result[item] = {
                 "id": item.id,
                 "assigned_to": resolved_assignees.get(item.id),
-                "is_bookmarked": item.id in bookmarks,
                 "subscription": subscriptions[item.id],
                 "has_seen": seen_groups.get(item.id, active_date) > active_date,
                 "annotations": self._resolve_and_extend_plugin_annotation(
@@ -303,7 +315,6 @@ class GroupSerializerBase(Serializer, ABC):
                 "resolution": resolution,
                 "resolution_type": resolution_type,
                 "resolution_actor": resolution_actor,
-                "share_id": share_ids.get(item.id),
                 "authorized": authorized,
             }
             if snuba_stats is not None:
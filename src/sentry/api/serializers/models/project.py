@@ -12,7 +12,7 @@ from django.db.models import prefetch_related_objects
 from django.utils import timezone
 
 from sentry import features, options, projectoptions, release_health, roles
-from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers import Prefetch, Serializer, register, serialize
 from sentry.api.serializers.models.plugin import PluginSerializer
 from sentry.api.serializers.models.team import get_org_roles
 from sentry.api.serializers.types import OrganizationSerializerResponse, SerializedAvatarFields
@@ -232,6 +232,56 @@ def get_features_for_projects(
     return features_by_project
 
 
+def get_bookmarked_projects(projects: Sequence[Project], user: User) -> Mapping[int, bool]:
+    if not user.is_authenticated:
+        return {}
+    return dict.fromkeys(
+        ProjectBookmark.objects.filter(
+            user_id=user.id, project_id__in=[p.id for p in projects]
+        ).values_list("project_id", flat=True),
+        True,
+    )
+
+
+def get_platforms_by_projects(projects: Sequence[Project]) -> MutableMapping[int, list[str]]:
+    platforms = ProjectPlatform.objects.filter(project_id__in=[p.id for p in projects]).values_list(
+        "project_id", "platform"
+    )
+    platforms_by_project = defaultdict(list)
+    for project_id, platform in platforms:
+        platforms_by_project[project_id].append(platform)
+    return platforms_by_project
+
+
+def get_projects_with_user_reports(projects: Sequence[Project]) -> Mapping[int, bool]:
+    return dict.fromkeys(
+        UserReport.objects.filter(project_id__in=[p.id for p in projects]).values_list(
+            "project_id", flat=True
+        ),
+        True,
+    )
+
+
+def get_teams_by_projects(
+    projects: Sequence[Project],
+) -> MutableMapping[int, list[TeamResponseDict]]:
+    project_teams = list(ProjectTeam.objects.filter(project__in=projects).select_related("team"))
+
+    teams = {
+        pt.team_id: {
+            "id": str(pt.team.id),
+            "slug": pt.team.slug,
+            "name": pt.team.name,
+        }
+        for pt in project_teams
+    }
+
+    teams_by_project_id = defaultdict(list)
+    for pt in project_teams:
+        teams_by_project_id[pt.project_id].append(teams[pt.team_id])
+    return teams_by_project_id
+
+
 class _ProjectSerializerOptionalBaseResponse(TypedDict, total=False):
     stats: Any
     transactionStats: Any
@@ -319,6 +369,14 @@ class ProjectSerializer(Serializer):
             return False
         return key in self.collapse
 
+    def get_prefetch_plan(
+        self, item_list: Sequence[Project], user: User, **kwargs: Any
+    ) -> Mapping[str, Prefetch]:
+        return {
+            "is_bookmarked": Prefetch(get_bookmarked_projects, default=bool),
+            "platforms": Prefetch(get_platforms_by_projects, default=list, per_user=False),
+        }
+
     def get_attrs(
         self, item_list: Sequence[Project], user: User, **kwargs: Any
     ) -> MutableMapping[Project, MutableMapping[str, Any]]:
@@ -327,17 +385,6 @@ class ProjectSerializer(Serializer):
             span.set_data("Object Count", len(item_list))
             return span
 
-        with measure_span("preamble"):
-            project_ids = [i.id for i in item_list]
-            if user.is_authenticated and item_list:
-                bookmarks = set(
-                    ProjectBookmark.objects.filter(
-                        user_id=user.id, project_id__in=project_ids
-                    ).values_list("project_id", flat=True)
-                )
-            else:
-                bookmarks = set()
-
         with measure_span("stats"):
             stats = None
             transaction_stats = None
@@ -356,14 +403,6 @@ class ProjectSerializer(Serializer):
             if self._expand("options"):
                 options = self.get_options(item_list)
 
-        project_ids = [i.id for i in item_list]
-        platforms = ProjectPlatform.objects.filter(project_id__in=project_ids).values_list(
-            "project_id", "platform"
-        )
-        platforms_by_project = defaultdict(list)
-        for project_id, platform in platforms:
-            platforms_by_project[project_id].append(platform)
-
         with measure_span("access"):
             result = get_access_by_project(item_list, user)
 
@@ -376,12 +415,6 @@ class ProjectSerializer(Serializer):
 
         with measure_span("other"):
             for project, serialized in result.items():
-                serialized.update(
-                    {
-                        "is_bookmarked": project.id in bookmarks,
-                        "platforms": platforms_by_project[project.id],
-                    }
-                )
                 if stats:
                     serialized["stats"] = stats[project.id]
                 if transaction_stats:
@@ -574,32 +607,14 @@ class ProjectWithTeamResponseDict(ProjectSerializerResponse):
 
 
 class ProjectWithTeamSerializer(ProjectSerializer):
-    def get_attrs(
+    def get_prefetch_plan(
         self, item_list: Sequence[Project], user: User, **kwargs: Any
-    ) -> MutableMapping[Project, MutableMapping[str, Any]]:
-        attrs = super().get_attrs(item_list, user)
-
-        project_teams = list(
-            ProjectTeam.objects.filter(project__in=item_list).select_related("team")
-        )
-
-        teams = {
-            pt.team_id: {
-                "id": str(pt.team.id),
-                "slug": pt.team.slug,
-                "name": pt.team.name,
-            }
-            for pt in project_teams
+    ) -> Mapping[str, Prefetch]:
+        return {
+            **super().get_prefetch_plan(item_list, user),
+            "teams": Prefetch(get_teams_by_projects, default=list, per_user=False),
         }
 
-        teams_by_project_id = defaultdict(list)
-        for pt in project_teams:
-            teams_by_project_id[pt.project_id].append(teams[pt.team_id])
-
-        for item in item_list:
-            attrs[item]["teams"] = teams_by_project_id[item.id]
-        return attrs
-
     def serialize(self, obj, attrs, user) -> ProjectWithTeamResponseDict:
         data = cast(ProjectWithTeamResponseDict, super().serialize(obj, attrs, user))
         # TODO(jess): remove this when this is deprecated
@@ -640,77 +655,28 @@ class ProjectSummarySerializer(ProjectWithTeamSerializer):
         self.access = access
         super().__init__(**kwargs)
 
-    def get_deploys_by_project(self, item_list):
-        cursor = connection.cursor()
-        cursor.execute(
-            """
-            select srpe.project_id, se.name, sr.version, date_finished
-            from (
-                select *
-                -- Finally, filter to the top row for each project/environment.
-                from (
-                    -- Next we join to deploys and rank based recency of latest deploy for each project/environment.
-                    select srpe.project_id, srpe.release_id, srpe.environment_id, sd.date_finished,
-                    row_number() OVER (partition by (srpe.project_id, srpe.environment_id) order by sd.date_finished desc) row_num
-                    from
-                    (
-                        -- First we fetch all related ReleaseProjectEnvironments, then filter to the x most recent for
-                        -- each project/environment that actually have a deploy. This cuts out a lot of data volume
-                        select *
-                        from (
-                            select *, row_number() OVER (partition by (srpe.project_id, srpe.environment_id) order by srpe.id desc) row_num
-                            from sentry_releaseprojectenvironment srpe
-                            where srpe.last_deploy_id is not null
-                            and project_id = ANY(%s)
-                        ) srpe
-                        where row_num <= %s
-                    ) srpe
-                    inner join sentry_deploy sd on sd.id = srpe.last_deploy_id
-                    where sd.date_finished is not null
-                ) srpe
-                where row_num = 1
-            ) srpe
-            inner join sentry_release sr on sr.id = srpe.release_id
-            inner join sentry_environment se on se.id = srpe.environment_id;
-            """,
-            ([p.id for p in item_list], 10),
-        )
-        deploys_by_project = defaultdict(dict)
-
-        for project_id, env_name, release_version, date_finished in cursor.fetchall():
-            deploys_by_project[project_id][env_name] = {
-                "version": release_version,
-                "dateFinished": date_finished,
-            }
-
-        return deploys_by_project
+    def get_prefetch_plan(
+        self, item_list: Sequence[Project], user: User, **kwargs: Any
+    ) -> Mapping[str, Prefetch]:
+        plan = {
+            **super().get_prefetch_plan(item_list, user),
+            "has_user_reports": Prefetch(
+                get_projects_with_user_reports, default=bool, per_user=False
+            ),
+            "environments": Prefetch(get_environments_by_projects, default=list, per_user=False),
+            # Only fetch the latest release version key for each project to cut down on response size
+            "latest_release": Prefetch(_get_project_to_release_version_mapping, per_user=False),
+        }
+        if not self._collapse(LATEST_DEPLOYS_KEY):
+            plan["deploys"] = Prefetch(get_deploys_by_projects, per_user=False)
+        return plan
 
     def get_attrs(
         self, item_list: Sequence[Project], user: User, **kwargs: Any
     ) -> MutableMapping[Project, MutableMapping[str, Any]]:
         attrs = super().get_attrs(item_list, user)
 
-        projects_with_user_reports = set(
-            UserReport.objects.filter(project_id__in=[item.id for item in item_list]).values_list(
-                "project_id", flat=True
-            )
-        )
-
-        environments_by_project = get_environments_by_projects(item_list)
-
-        # Only fetch the latest release version key for each project to cut down on response size
-        latest_release_versions = _get_project_to_release_version_mapping(item_list)
-
-        deploys_by_project = None
-        if not self._collapse(LATEST_DEPLOYS_KEY):
-            deploys_by_project = self.get_deploys_by_project(item_list)
-
         for item in item_list:
-            attrs[item]["latest_release"] = latest_release_versions.get(item.id)
-            attrs[item]["environments"] = environments_by_project.get(item.id, [])
-            attrs[item]["has_user_reports"] = item.id in projects_with_user_reports
-            if not self._collapse(LATEST_DEPLOYS_KEY):
-                attrs[item]["deploys"] = deploys_by_project.get(item.id)
             # check if the project is in LPQ for any platform
             # XXX(joshferge): determine if the frontend needs this flag at all
             # removing redis call as was causing problematic latency issues
@@ -838,6 +804,65 @@ def _get_project_to_release_version_mapping(
     }
 
 
+def get_options_by_projects(projects: Sequence[Project]) -> MutableMapping[int, dict[str, Any]]:
+    queryset = ProjectOption.objects.filter(project__in=projects, key__in=OPTION_KEYS)
+    options_by_project: MutableMapping[int, dict[str, Any]] = defaultdict(dict)
+    for option in queryset.iterator():
+        options_by_project[option.project_id][option.key] = option.value
+    return options_by_project
+
+
+def get_deploys_by_projects(
+    projects: Sequence[Project],
+) -> MutableMapping[int, dict[str, dict[str, Any]]]:
+    """
+    Return mapping of project ID -> environment name -> latest deploy of the project in the environment
+    """
+    cursor = connection.cursor()
+    cursor.execute(
+        """
+        select srpe.project_id, se.name, sr.version, date_finished
+        from (
+            select *
+            -- Finally, filter to the top row for each project/environment.
+            from (
+                -- Next we join to deploys and rank based recency of latest deploy for each project/environment.
+                select srpe.project_id, srpe.release_id, srpe.environment_id, sd.date_finished,
+                row_number() OVER (partition by (srpe.project_id, srpe.environment_id) order by sd.date_finished desc) row_num
+                from
+                (
+                    -- First we fetch all related ReleaseProjectEnvironments, then filter to the x most recent for
+                    -- each project/environment that actually have a deploy. This cuts out a lot of data volume
+                    select *
+                    from (
+                        select *, row_number() OVER (partition by (srpe.project_id, srpe.environment_id) order by srpe.id desc) row_num
+                        from sentry_releaseprojectenvironment srpe
+                        where srpe.last_deploy_id is not null
+                        and project_id = ANY(%s)
+                    ) srpe
+                    where row_num <= %s
+                ) srpe
+                inner join sentry_deploy sd on sd.id = srpe.last_deploy_id
+                where sd.date_finished is not null
+            ) srpe
+            where row_num = 1
+        ) srpe
+        inner join sentry_release sr on sr.id = srpe.release_id
+        inner join sentry_environment se on se.id = srpe.environment_id;
+        """,
+        ([p.id for p in projects], 10),
+    )
+    deploys_by_project = defaultdict(dict)
+
+    for project_id, env_name, release_version, date_finished in cursor.fetchall():
+        deploys_by_project[project_id][env_name] = {
+            "version": release_version,
+            "dateFinished": date_finished,
+        }
+
+    return deploys_by_project
+
+
 class Plugin(TypedDict):
     id: str
     name: str
@@ -905,27 +930,27 @@ class DetailedProjectResponse(ProjectWithTeamResponseDict):
 
 
 class DetailedProjectSerializer(ProjectWithTeamSerializer):
+    def get_prefetch_plan(
+        self, item_list: Sequence[Project], user: User, **kwargs: Any
+    ) -> Mapping[str, Prefetch]:
+        return {
+            **super().get_prefetch_plan(item_list, user),
+            # Only fetch the latest release version key for each project to cut down on response size
+            "latest_release": Prefetch(_get_project_to_release_version_mapping, per_user=False),
+            "options": Prefetch(get_options_by_projects, default=dict, per_user=False),
+        }
+
     def get_attrs(
         self, item_list: Sequence[Project], user: User, **kwargs: Any
     ) -> MutableMapping[Project, MutableMapping[str, Any]]:
         attrs = super().get_attrs(item_list, user)
 
-        queryset = ProjectOption.objects.filter(project__in=item_list, key__in=OPTION_KEYS)
-        options_by_project = defaultdict(dict)
-        for option in queryset.iterator():
-            options_by_project[option.project_id][option.key] = option.value
-
         orgs = {d["id"]: d for d in serialize(list({i.organization for i in item_list}), user)}
 
-        # Only fetch the latest release version key for each project to cut down on response size
-        latest_release_versions = _get_project_to_release_version_mapping(item_list)
-
         for item in item_list:
             attrs[item].update(
                 {
-                    "latest_release": latest_release_versions.get(item.id),
                     "org": orgs[str(item.organization_id)],
-                    "options": options_by_project[item.id],
                     "processing_issues": 0,
                     "highlight_preset": get_highlight_preset_for_project(item),
                 }
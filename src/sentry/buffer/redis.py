@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import logging
 import pickle
-from collections.abc import Callable
+from collections import defaultdict
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from enum import Enum
@@ -13,6 +14,7 @@ import rb
 from django.utils.encoding import force_bytes, force_str
 from rediscluster import RedisCluster
 
+from sentry import options
 from sentry.buffer.base import Buffer
 from sentry.db import models
 from sentry.tasks.process_buffer import process_incr
@@ -24,6 +26,7 @@ from sentry.utils.redis import (
     get_dynamic_cluster_from_options,
     is_instance_rb_cluster,
     is_instance_redis_cluster,
+    load_redis_script,
     validate_dynamic_cluster,
 )
 
@@ -36,6 +39,8 @@ _last_validation_log: float | None = None
 Pipeline = Any
 # TODO type Pipeline instead of using Any here
 
+flush_batch = load_redis_script("buffer/flush_batch.lua")
+
 
 def _get_model_key(model: type[models.Model]) -> str:
     return str(model._meta)
@@ -191,6 +196,27 @@ class RedisOperation(Enum):
     HASH_LENGTH = "hlen"
 
 
+@dataclass
+class BufferedIncr:
+    """
+    The decoded contents of a single buffer hash, ready to be applied to the database.
+    """
+
+    model: type[models.Model]
+    columns: dict[str, int]
+    filters: dict[str, Any]
+    extra: dict[str, Any]
+    signal_only: bool | None
+
+    def merge(self, other: BufferedIncr) -> None:
+        for column, amount in other.columns.items():
+            self.columns[column] = self.columns.get(column, 0) + amount
+        # extra values are last write wins, just like they are in `incr`
+        self.extra.update(other.extra)
+        if other.signal_only:
+            self.signal_only = True
+
+
 class PendingBuffer:
     def __init__(self, size: int):
         assert size > 0
@@ -609,6 +635,14 @@ class RedisBuffer(Buffer):
             batch_keys = [key]
 
         if batch_keys is not None:
+            if (
+                len(batch_keys) > 1
+                and is_instance_rb_cluster(self.cluster, self.is_redis_cluster)
+                and options.get("buffer.batched-flush.enabled")
+            ):
+                self._process_batch_incr(batch_keys)
+                return
+
             for key in batch_keys:
                 self._process_single_incr(key)
 
@@ -637,39 +671,115 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
-
             if not values:
                 metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
                 logger.debug("buffer.revoked.empty", extra={"redis_key": key})
                 return
 
-            model = import_string(force_str(values.pop("m")))
-
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
+            buffered = self._load_buffered_incr(values)
+            self._process(
+                buffered.model,
+                buffered.columns,
+                buffered.filters,
+                buffered.extra,
+                buffered.signal_only,
+            )
         finally:
             client.delete(lock_key)
+
+    def _load_buffered_incr(self, values: dict[Any, Any]) -> BufferedIncr:
+        """
+        Decodes the raw contents of a buffer hash as written by `incr`.
+        """
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_str(k): v for k, v in values.items()}
+
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return BufferedIncr(
+            model=model,
+            columns=incr_values,
+            filters=filters,
+            extra=extra_values,
+            signal_only=signal_only,
+        )
+
+    def _process_batch_incr(self, batch_keys: Sequence[str]) -> None:
+        """
+        Flushes a whole batch of buffer keys at once.
+
+        Rather than taking a lock, reading and deleting every key with its own
+        round trips, the keys are grouped by the host they live on and drained
+        with a single script call per host. The decoded increments are then
+        merged by model and filters and applied to the database grouped by
+        model.
+        """
+        assert is_instance_rb_cluster(self.cluster, self.is_redis_cluster)
+
+        router = self.cluster.get_router()
+        keys_by_host: dict[int, list[str]] = defaultdict(list)
+        for key in batch_keys:
+            keys_by_host[router.get_host_for_key(key)].append(key)
+
+        pending: dict[str, BufferedIncr] = {}
+        for host_id, keys in keys_by_host.items():
+            client = self.cluster.get_local_client(host_id)
+            results = flush_batch([self.pending_key, *keys], [10], client)
+
+            for key, raw in zip(keys, results):
+                if raw is None:
+                    metrics.incr("buffer.revoked", tags={"reason": "locked"}, skip_internal=False)
+                    logger.debug("buffer.revoked.locked", extra={"redis_key": key})
+                    continue
+                if not raw:
+                    metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+                    logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+                    continue
+
+                # HGETALL inside of a script returns a flat list of alternating
+                # fields and values.
+                buffered = self._load_buffered_incr(dict(zip(raw[::2], raw[1::2])))
+                # The buffer key is derived from the model and the filters, so
+                # it identifies the row that is going to be updated.
+                if key in pending:
+                    pending[key].merge(buffered)
+                else:
+                    pending[key] = buffered
+
+        metrics.distribution("buffer.batched-flush.keys", len(batch_keys))
+        metrics.distribution("buffer.batched-flush.updates", len(pending))
+
+        # Apply updates for the same model next to each other.
+        for buffered in sorted(
+            pending.values(), key=lambda b: f"{b.model.__module__}.{b.model.__name__}"
+        ):
+            self._process(
+                buffered.model,
+                buffered.columns,
+                buffered.filters,
+                buffered.extra,
+                buffered.signal_only,
+            )
@@ -134,6 +134,31 @@ def ingest_monitors_options() -> list[click.Option]:
     return options
 
 
+def monitors_clock_tasks_options() -> list[click.Option]:
+    """Return a list of monitors-clock-tasks options."""
+    options = [
+        click.Option(
+            ["--mode", "mode"],
+            type=click.Choice(["serial", "batched"]),
+            default="serial",
+            help="The mode to process tasks in. Batched marks missed monitors in bulk.",
+        ),
+        click.Option(
+            ["--max-batch-size", "max_batch_size"],
+            type=int,
+            default=500,
+            help="Maximum number of tasks to batch before processing them.",
+        ),
+        click.Option(
+            ["--max-batch-time", "max_batch_time"],
+            type=int,
+            default=1,
+            help="Maximum time spent batching tasks before processing them.",
+        ),
+    ]
+    return options
+
+
 def ingest_events_options() -> list[click.Option]:
     """
     Options for the "events"-like consumers: `events`, `attachments`, `transactions`.
@@ -241,6 +266,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "monitors-clock-tasks": {
         "topic": Topic.MONITORS_CLOCK_TASKS,
         "strategy_factory": "sentry.monitors.consumers.clock_tasks_consumer.MonitorClockTasksStrategyFactory",
+        "click_options": monitors_clock_tasks_options(),
     },
     "uptime-results": {
         "topic": Topic.UPTIME_RESULTS,
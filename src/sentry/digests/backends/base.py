@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Iterable, Mapping
+from collections.abc import Generator, Iterable, Mapping
+from contextlib import ExitStack, contextmanager
 from typing import TYPE_CHECKING, Any, NamedTuple
 
 from sentry.digests.types import Record
 from sentry.utils.imports import import_string
+from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.services import Service
 
 if TYPE_CHECKING:
@@ -14,6 +16,10 @@ if TYPE_CHECKING:
 logger = logging.getLogger("sentry.digests")
 
 
+class _DigestRemoved(Exception):
+    pass
+
+
 class ScheduleEntry(NamedTuple):
     key: str
     timestamp: float
@@ -66,7 +72,16 @@ class Backend(Service):
     be transitioned to "waiting" instead.)
     """
 
-    __all__ = ("add", "delete", "digest", "enabled", "maintenance", "schedule", "validate")
+    __all__ = (
+        "add",
+        "delete",
+        "digest",
+        "digest_many",
+        "enabled",
+        "maintenance",
+        "schedule",
+        "validate",
+    )
 
     def __init__(self, **options: Any) -> None:
         # The ``minimum_delay`` option defines the default minimum amount of
@@ -126,6 +141,7 @@ class Backend(Service):
         increment_delay: int | None = None,
         maximum_delay: int | None = None,
         timestamp: float | None = None,
+        compact: bool = False,
     ) -> bool:
         """
         Add a record to a timeline.
@@ -136,6 +152,11 @@ class Backend(Service):
         If another record exists in the timeline with the same record key, it
         will be overwritten.
 
+        Backends which support compaction may only evict older records of the
+        same group in favor of this one if ``compact`` is set. This must not
+        be set if the recipients of the digest depend on the individual
+        records (e.g. because they are routed by ownership rules.)
+
         The return value this function indicates whether or not the timeline is
         ready for immediate digestion.
         """
@@ -176,6 +197,60 @@ class Backend(Service):
         """
         raise NotImplementedError
 
+    @contextmanager
+    def digest_many(
+        self, keys: Iterable[str], minimum_delay: int | None = None
+    ) -> Generator[dict[str, list[Record]]]:
+        """
+        Extract records from many timelines for processing.
+
+        This method acts as a context manager like ``digest``. The target of
+        the ``as`` clause is a mapping of timeline keys to the records of
+        their digest. Timelines that can't be digested (e.g. because they are
+        not in the "ready" state, or are being digested concurrently) are left
+        out of the mapping.
+
+        If the context manager exits successfully, the digests of all
+        timelines that are still part of the mapping are closed. Timelines
+        removed from the mapping within the block (e.g. because their digest
+        couldn't be built) are left unclosed, and are digested again once
+        they are rescheduled. Backends may also remove timelines whose digest
+        couldn't be closed from the mapping, so only the timelines that are
+        still part of it should be delivered once the context manager has
+        exited::
+
+            with timelines.digest_many(['project:1', 'project:2']) as digests:
+                messages = {key: build_digest_email(records) for key, records in digests.items()}
+
+            for key in digests:
+                messages[key].send_async()
+
+        Backends should override this to claim timelines in bulk, the
+        default implementation digests one timeline after the other.
+        """
+        with ExitStack() as stack:
+            digests: dict[str, list[Record]] = {}
+            for key in keys:
+                try:
+                    stack.enter_context(self.__digest_unless_removed(key, minimum_delay, digests))
+                except (InvalidState, UnableToAcquireLock) as error:
+                    logger.info("Skipped digest: %s", error)
+            yield digests
+
+    @contextmanager
+    def __digest_unless_removed(
+        self, key: str, minimum_delay: int | None, digests: dict[str, list[Record]]
+    ) -> Generator[None]:
+        try:
+            with self.digest(key, minimum_delay) as records:
+                digests[key] = records
+                yield
+                if key not in digests:
+                    # Exiting the digest with an error leaves it unclosed.
+                    raise _DigestRemoved
+        except _DigestRemoved:
+            pass
+
     def schedule(self, deadline: float, timestamp: float | None = None) -> Iterable[ScheduleEntry]:
         """
         Identify timelines that are ready for processing.
@@ -17,6 +17,7 @@ class DummyBackend(Backend):
         increment_delay: int | None = None,
         maximum_delay: int | None = None,
         timestamp: float | None = None,
+        compact: bool = False,
     ) -> bool:
         return False
 
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import logging
 import time
-from collections.abc import Generator, Iterable
+from collections import defaultdict
+from collections.abc import Generator, Iterable, Sequence
 from contextlib import contextmanager
 from typing import Any
 
@@ -70,6 +71,15 @@ class RedisBackend(Backend):
         1) "mail:p:1"
         2) "1444847638"
 
+    When compaction is enabled, a hash (in this case ``d:t:mail:p:1:c``)
+    indexes the oldest and newest record of each group and rule combination
+    in the timeline. Any record added with ``compact`` in between is evicted
+    from the timeline as soon as a newer one for the same group and rules
+    arrives, so that the timeline doesn't grow with the number of events of a
+    noisy group. Digests only display the newest record of each group and use
+    the oldest record to determine their time range. Digests whose recipients
+    are resolved for every single event (e.g. by ownership rules) can lose
+    groups this way, so their records must not be added with ``compact``.
     """
 
     def __init__(self, **options: Any) -> None:
@@ -88,6 +98,9 @@ class RedisBackend(Backend):
         # too early.
         self.ttl = options.pop("ttl", 60 * 60)
 
+        # Enables compaction of timelines, see above.
+        self.compaction = options.pop("compaction", False)
+
         super().__init__(**options)
 
     def validate(self) -> None:
@@ -103,6 +116,43 @@ class RedisBackend(Backend):
             lock_key, duration=duration, routing_key=lock_key, name="digest_timeline_lock"
         )
 
+    def _get_compaction_key(self, record: Record, compact: bool) -> str:
+        if not (self.compaction and compact) or record.value.event.group_id is None:
+            return ""
+        rules = ",".join(str(rule) for rule in sorted(record.value.rules))
+        return f"{record.value.event.group_id}:{rules}"
+
+    def _decode_records(
+        self, key: str, response: Iterable[tuple[bytes, bytes | None, bytes]]
+    ) -> tuple[list[Record], list[Record]]:
+        """
+        Returns all records of a digest, and the records which still have
+        their contents.
+        """
+        records = [
+            Record(
+                record_key.decode(),
+                self.codec.decode(value) if value is not None else None,
+                float(timestamp),
+            )
+            for record_key, value, timestamp in response
+        ]
+
+        # If the record value is `None`, this means the record data was
+        # missing (it was presumably evicted by Redis) so we don't need to
+        # return it here.
+        filtered_records = [record for record in records if record.value is not None]
+        if len(records) != len(filtered_records):
+            logger.warning(
+                "Filtered out missing records when fetching digest",
+                extra={
+                    "key": key,
+                    "record_count": len(records),
+                    "filtered_record_count": len(filtered_records),
+                },
+            )
+        return records, filtered_records
+
     def add(
         self,
         key: str,
@@ -110,6 +160,7 @@ class RedisBackend(Backend):
         increment_delay: int | None = None,
         maximum_delay: int | None = None,
         timestamp: float | None = None,
+        compact: bool = False,
     ) -> bool:
         if timestamp is None:
             timestamp = time.time()
@@ -138,6 +189,7 @@ class RedisBackend(Backend):
                     maximum_delay,
                     self.capacity if self.capacity else -1,
                     self.truncation_chance,
+                    self._get_compaction_key(record, compact),
                 ],
                 self._get_connection(key),
             )
@@ -219,28 +271,7 @@ class RedisBackend(Backend):
                 else:
                     raise
 
-            records = [
-                Record(
-                    key.decode(),
-                    self.codec.decode(value) if value is not None else None,
-                    float(timestamp),
-                )
-                for key, value, timestamp in response
-            ]
-
-            # If the record value is `None`, this means the record data was
-            # missing (it was presumably evicted by Redis) so we don't need to
-            # return it here.
-            filtered_records = [record for record in records if record.value is not None]
-            if len(records) != len(filtered_records):
-                logger.warning(
-                    "Filtered out missing records when fetching digest",
-                    extra={
-                        "key": key,
-                        "record_count": len(records),
-                        "filtered_record_count": len(filtered_records),
-                    },
-                )
+            records, filtered_records = self._decode_records(key, response)
             yield filtered_records
 
             script(
@@ -250,6 +281,128 @@ class RedisBackend(Backend):
                 connection,
             )
 
+    def __get_lock_arguments(self, duration: int) -> list[Any]:
+        lock_backend = self.locks.backend
+        assert isinstance(lock_backend, RedisLockBackend)
+        return [lock_backend.prefix, lock_backend.uuid, duration]
+
+    def __release_timeline_locks(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            lock_key = f"{self.namespace}:t:{key}"
+            try:
+                self.locks.backend.release(lock_key, routing_key=lock_key)
+            except Exception:
+                logger.exception("Failed to release digest timeline lock", extra={"key": key})
+
+    def __digest_partition(
+        self, host: int, keys: Sequence[str], timestamp: float
+    ) -> list[tuple[bytes, list[tuple[bytes, bytes | None, bytes]]]]:
+        return script(
+            keys,
+            [
+                "DIGEST_OPEN_MANY",
+                self.namespace,
+                self.ttl,
+                timestamp,
+                *self.__get_lock_arguments(duration=30),
+                self.capacity if self.capacity else -1,
+                *keys,
+            ],
+            self.cluster.get_local_client(host),
+        )
+
+    def __close_partition(
+        self,
+        host: int,
+        records_by_key: dict[str, list[Record]],
+        minimum_delay: int,
+        timestamp: float,
+    ) -> None:
+        arguments: list[Any] = [
+            "DIGEST_CLOSE_MANY",
+            self.namespace,
+            self.ttl,
+            timestamp,
+            *self.__get_lock_arguments(duration=30),
+            minimum_delay,
+        ]
+        for key, records in records_by_key.items():
+            arguments.extend([key, len(records)])
+            arguments.extend(record.key for record in records)
+
+        script(list(records_by_key), arguments, self.cluster.get_local_client(host))
+
+    @contextmanager
+    def digest_many(
+        self, keys: Iterable[str], minimum_delay: int | None = None, timestamp: float | None = None
+    ) -> Generator[dict[str, list[Record]]]:
+        if minimum_delay is None:
+            minimum_delay = self.minimum_delay
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        router = self.cluster.get_router()
+        keys_by_host: dict[int, list[str]] = defaultdict(list)
+        for key in keys:
+            keys_by_host[router.get_host_for_key(f"{self.namespace}:t:{key}")].append(key)
+
+        # Timelines are claimed (locked and opened) with a single call per
+        # partition. Timelines that could not be claimed are left out of the
+        # result, as are all timelines of a partition that failed.
+        records_by_host: dict[int, dict[str, list[Record]]] = {}
+        digests: dict[str, list[Record]] = {}
+        for host, host_keys in keys_by_host.items():
+            try:
+                response = self.__digest_partition(host, host_keys, timestamp)
+            except Exception as error:
+                logger.exception(
+                    "Failed to open digests for partition %s due to error: %s",
+                    host,
+                    error,
+                )
+                continue
+
+            records_by_host[host] = {}
+            for key, records_response in response:
+                key = key.decode("utf-8")
+                records, digests[key] = self._decode_records(key, records_response)
+                records_by_host[host][key] = records
+
+        skipped = sum(len(host_keys) for host_keys in keys_by_host.values()) - len(digests)
+        if skipped:
+            logger.info("Skipped digests that could not be claimed", extra={"count": skipped})
+
+        try:
+            yield digests
+        except BaseException:
+            self.__release_timeline_locks(digests)
+            raise
+
+        for host, host_records in records_by_host.items():
+            # Timelines which were removed from the mapping are left unclosed.
+            removed = [key for key in host_records if key not in digests]
+            if removed:
+                self.__release_timeline_locks(removed)
+                host_records = {
+                    key: records for key, records in host_records.items() if key in digests
+                }
+
+            if not host_records:
+                continue
+            try:
+                self.__close_partition(host, host_records, minimum_delay, timestamp)
+            except Exception as error:
+                logger.exception(
+                    "Failed to close digests for partition %s due to error: %s",
+                    host,
+                    error,
+                )
+                # The digests are delivered again once they are rescheduled,
+                # so they must not be delivered now.
+                for key in host_records:
+                    del digests[key]
+
     def delete(self, key: str, timestamp: float | None = None) -> None:
         if timestamp is None:
             timestamp = time.time()
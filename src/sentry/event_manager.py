@@ -4,6 +4,7 @@ import ipaddress
 import logging
 import uuid
 from collections.abc import Callable, Mapping, MutableMapping, Sequence
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, overload
@@ -1071,54 +1072,63 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
 
     # XXX: validate whether anybody actually uses those metrics
 
-    for job in jobs:
-        incrs = []
-        frequencies = []
-        records = []
-        incrs.append((TSDBModel.project, job["project_id"]))
-        event = job["event"]
-        release = job["release"]
-        environment = job["environment"]
-        user = job["user"]
+    manager: AbstractContextManager[None]
+    if options.get("store.tsdb-coalesce-writes"):
+        manager = tsdb.backend.coalesce_writes()
+    else:
+        manager = nullcontext()
+
+    with manager:
+        for job in jobs:
+            _tsdb_record_job_metrics(job)
+
+
+def _tsdb_record_job_metrics(job: Job) -> None:
+    incrs = []
+    frequencies = []
+    records = []
+    incrs.append((TSDBModel.project, job["project_id"]))
+    event = job["event"]
+    release = job["release"]
+    environment = job["environment"]
+    user = job["user"]
+
+    for group_info in job["groups"]:
+        incrs.append((TSDBModel.group, group_info.group.id))
+        frequencies.append(
+            (
+                TSDBModel.frequent_environments_by_group,
+                {group_info.group.id: {environment.id: 1}},
+            )
+        )
 
-        for group_info in job["groups"]:
-            incrs.append((TSDBModel.group, group_info.group.id))
+        if group_info.group_release:
             frequencies.append(
                 (
-                    TSDBModel.frequent_environments_by_group,
-                    {group_info.group.id: {environment.id: 1}},
+                    TSDBModel.frequent_releases_by_group,
+                    {group_info.group.id: {group_info.group_release.id: 1}},
                 )
             )
+        if user:
+            records.append(
+                (TSDBModel.users_affected_by_group, group_info.group.id, (user.tag_value,))
+            )
 
-            if group_info.group_release:
-                frequencies.append(
-                    (
-                        TSDBModel.frequent_releases_by_group,
-                        {group_info.group.id: {group_info.group_release.id: 1}},
-                    )
-                )
-            if user:
-                records.append(
-                    (TSDBModel.users_affected_by_group, group_info.group.id, (user.tag_value,))
-                )
-
-        if release:
-            incrs.append((TSDBModel.release, release.id))
+    if release:
+        incrs.append((TSDBModel.release, release.id))
 
-        if user:
-            project_id = job["project_id"]
-            records.append((TSDBModel.users_affected_by_project, project_id, (user.tag_value,)))
+    if user:
+        project_id = job["project_id"]
+        records.append((TSDBModel.users_affected_by_project, project_id, (user.tag_value,)))
 
-        if incrs:
-            tsdb.backend.incr_multi(incrs, timestamp=event.datetime, environment_id=environment.id)
+    if incrs:
+        tsdb.backend.incr_multi(incrs, timestamp=event.datetime, environment_id=environment.id)
 
-        if records:
-            tsdb.backend.record_multi(
-                records, timestamp=event.datetime, environment_id=environment.id
-            )
+    if records:
+        tsdb.backend.record_multi(records, timestamp=event.datetime, environment_id=environment.id)
 
-        if frequencies:
-            tsdb.backend.record_frequency_multi(frequencies, timestamp=event.datetime)
+    if frequencies:
+        tsdb.backend.record_frequency_multi(frequencies, timestamp=event.datetime)
 
 
 def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
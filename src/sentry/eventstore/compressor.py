@@ -8,6 +8,7 @@ This is not used in production yet, we are still collecting metrics there.
 from __future__ import annotations
 
 import hashlib
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from typing import Any
 
 import orjson
@@ -41,6 +42,32 @@ class DebugMeta:
 
         return dedup, data
 
+    @staticmethod
+    def iter_encode(data) -> Iterator[bytes]:
+        """
+        Incremental version of `encode`. Instead of building a dict of lists,
+        yields the serialized deduplicated fields chunk by chunk while walking
+        the images and strips them from `data` in place. The concatenated
+        chunks are byte-for-byte identical to `orjson.dumps(encode(data)[0])`.
+        """
+        images = (data.get("images") or []) if data else []
+        if not images:
+            yield b"{}"
+            return
+
+        for i, name in enumerate(DebugMeta._DEDUP_FIELDS):
+            yield b"%s%s:[" % (b"{" if i == 0 else b",", orjson.dumps(name))
+            for j, image in enumerate(images):
+                value = image.get(name) if image else None
+                yield orjson.dumps(value) if j == 0 else b"," + orjson.dumps(value)
+            yield b"]"
+        yield b"}"
+
+        for image in images:
+            if image:
+                for name in DebugMeta._DEDUP_FIELDS:
+                    image.pop(name, None)
+
     @staticmethod
     def decode(dedup, data):
         if data:
@@ -89,3 +116,102 @@ def assemble(data, get_extra_keys):
 
     del data["__nodestore_patchsets"]
     return data
+
+
+def deduplicate_stream(data) -> tuple[Any, dict[str, bytes]]:
+    """
+    Like `deduplicate`, but never materializes the deduplicated interfaces as
+    Python objects. Each interface is serialized and hashed chunk by chunk
+    while it is walked, and the extra keys are returned as serialized bytes
+    rather than dicts. Checksums are identical to the ones of `deduplicate`.
+    """
+    patchsets = []
+    extra_keys = {}
+
+    for key, interface in _INTERFACES.items():
+        if key not in data:
+            continue
+
+        to_inline = data.pop(key)
+        hasher = hashlib.md5()
+        buf = bytearray()
+        for chunk in interface.iter_encode(to_inline):
+            hasher.update(chunk)
+            buf += chunk
+
+        checksum = hasher.hexdigest()
+        extra_keys[checksum] = bytes(buf)
+        patchsets.append([key, checksum, to_inline])
+
+    if patchsets:
+        data["__nodestore_patchsets"] = patchsets
+
+    return data, extra_keys
+
+
+class LazyAssembledData(Mapping[str, Any]):
+    """
+    A read-only view on deduplicated event data that only fetches and decodes
+    the deduplicated interfaces that are actually accessed. Extra keys may be
+    given either as decoded dicts or as the serialized bytes produced by
+    `deduplicate_stream`.
+    """
+
+    def __init__(
+        self,
+        data: dict[str, Any],
+        get_extra_keys: Callable[[Sequence[str]], Mapping[str, Any]],
+    ) -> None:
+        self._data = dict(data)
+        self._get_extra_keys = get_extra_keys
+        self._pending = {
+            key: (checksum, inlined)
+            for key, checksum, inlined in self._data.pop("__nodestore_patchsets", None) or ()
+        }
+
+    def _materialize(self, keys: Iterable[str]) -> None:
+        pending = [key for key in keys if key in self._pending]
+        if not pending:
+            return
+
+        deduplicated_interfaces = self._get_extra_keys(
+            [self._pending[key][0] for key in pending]
+        )
+        for key in pending:
+            checksum, inlined = self._pending.pop(key)
+            deduplicated = deduplicated_interfaces[checksum]
+            if isinstance(deduplicated, bytes):
+                deduplicated = orjson.loads(deduplicated)
+            self._data[key] = _INTERFACES[key].decode(deduplicated, inlined)
+
+    def __getitem__(self, key: str) -> Any:
+        self._materialize([key])
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._data
+        yield from (key for key in self._pending if key not in self._data)
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._pending)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data or key in self._pending
+
+    def materialize(self) -> dict[str, Any]:
+        """
+        Assembles all remaining interfaces and returns the full event data.
+        """
+        self._materialize(list(self._pending))
+        return self._data
+
+
+def assemble_lazy(data, get_extra_keys) -> Mapping[str, Any]:
+    """
+    Lazy version of `assemble`. Returns a mapping that calls `get_extra_keys`
+    only for the deduplicated interfaces a caller reads.
+    """
+    if not data.get("__nodestore_patchsets"):
+        return data
+
+    return LazyAssembledData(data, get_extra_keys)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import copy
 import logging
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import TYPE_CHECKING
 
 import sentry_sdk
@@ -238,7 +238,87 @@ def get_hash_values(
     return (primary_hashes, secondary_hashes)
 
 
-def get_or_create_grouphashes(project: Project, hashes: Sequence[str]) -> list[GroupHash]:
+def _should_create_grouphash_metadata(project: Project) -> bool:
+    return options.get("grouping.grouphash_metadata.ingestion_writes_enabled") and features.has(
+        "organizations:grouphash-metadata-creation", project.organization
+    )
+
+
+class GroupHashBatch:
+    """
+    A short-lived map of `(project_id, hash)` to `GroupHash`, shared by the events of a single
+    ingest batch.
+
+    Hashes are resolved with one query per project, and rows which don't exist yet are created with
+    a single bulk insert, rather than issuing a `get_or_create` per hash and event. The map is only
+    meant to live for the duration of a batch: grouphashes which get a group assigned while the
+    batch is being processed are not updated, which is fine because group creation re-checks the
+    rows under a lock anyway.
+    """
+
+    def __init__(self) -> None:
+        self._grouphashes: dict[tuple[int, str], GroupHash] = {}
+
+    def prefetch(self, project_hashes: Iterable[tuple[Project, Iterable[str]]]) -> None:
+        """
+        Fetch or create the grouphashes for all of the given `(project, hashes)` pairs.
+        """
+        missing_by_project: dict[int, tuple[Project, set[str]]] = {}
+        for project, hashes in project_hashes:
+            missing = {
+                hash_value
+                for hash_value in hashes
+                if (project.id, hash_value) not in self._grouphashes
+            }
+            if missing:
+                missing_by_project.setdefault(project.id, (project, set()))[1].update(missing)
+
+        for project, hashes in missing_by_project.values():
+            self._fetch_or_create(project, hashes)
+
+    def get_or_create(self, project: Project, hashes: Sequence[str]) -> list[GroupHash]:
+        self.prefetch([(project, hashes)])
+        return [self._grouphashes[(project.id, hash_value)] for hash_value in hashes]
+
+    def _fetch_or_create(self, project: Project, hashes: set[str]) -> None:
+        grouphashes = {
+            grouphash.hash: grouphash
+            for grouphash in GroupHash.objects.filter(project=project, hash__in=hashes)
+        }
+        missing = hashes - grouphashes.keys()
+
+        if missing:
+            # Insert in a stable order so concurrent batches don't deadlock on each other. Rows
+            # which were created by someone else in the meantime are skipped, and since
+            # `ignore_conflicts` means we don't get ids back, all of them are read back below.
+            GroupHash.objects.bulk_create(
+                [GroupHash(project=project, hash=hash_value) for hash_value in sorted(missing)],
+                ignore_conflicts=True,
+            )
+            created = list(GroupHash.objects.filter(project=project, hash__in=missing))
+            grouphashes.update((grouphash.hash, grouphash) for grouphash in created)
+
+            if _should_create_grouphash_metadata(project):
+                GroupHashMetadata.objects.bulk_create(
+                    [GroupHashMetadata(grouphash=grouphash) for grouphash in created],
+                    ignore_conflicts=True,
+                )
+
+        metrics.incr("grouping.grouphash_batch.fetched", amount=len(hashes))
+        metrics.incr("grouping.grouphash_batch.created", amount=len(missing))
+
+        for hash_value, grouphash in grouphashes.items():
+            self._grouphashes[(project.id, hash_value)] = grouphash
+
+
+def get_or_create_grouphashes(
+    project: Project, hashes: Sequence[str], batch: GroupHashBatch | None = None
+) -> list[GroupHash]:
+    if batch is None and options.get("grouping.grouphash.batched-lookup.enabled"):
+        batch = GroupHashBatch()
+    if batch is not None:
+        return batch.get_or_create(project, hashes)
+
     grouphashes = []
 
     for hash_value in hashes:
@@ -246,11 +326,7 @@ def get_or_create_grouphashes(project: Project, hashes: Sequence[str]) -> list[G
 
         # TODO: Do we want to expand this to backfill metadata for existing grouphashes? If we do,
         # we'll have to override the metadata creation date for them.
-        if (
-            created
-            and options.get("grouping.grouphash_metadata.ingestion_writes_enabled")
-            and features.has("organizations:grouphash-metadata-creation", project.organization)
-        ):
+        if created and _should_create_grouphash_metadata(project):
             # For now, this just creates a record with a creation timestamp
             GroupHashMetadata.objects.create(grouphash=grouphash)
 
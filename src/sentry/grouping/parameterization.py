@@ -1,6 +1,8 @@
 import dataclasses
+import math
 import re
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
 from collections.abc import Callable, Sequence
 from functools import lru_cache
 
@@ -14,6 +16,7 @@ __all__ = [
     "ParameterizationRegexExperiment",
     "Parameterizer",
     "UniqueIdExperiment",
+    "UniqueIdFastExperiment",
 ]
 
 
@@ -181,6 +184,27 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
 
 DEFAULT_PARAMETERIZATION_REGEXES_MAP = {r.name: r.pattern for r in DEFAULT_PARAMETERIZATION_REGEXES}
 
+# For every default pattern, a cheap regex that is guaranteed to find something in any string the
+# pattern matches. If none of the prefilters of a `Parameterizer` find anything, the (much more
+# expensive) combined regex cannot match either and is skipped. Prefilters must use the same
+# character classes as their patterns, e.g. `\d` also matches non-ASCII digits.
+PARAMETERIZATION_PREFILTERS = {
+    "email": r"@",
+    "url": r":",
+    "hostname": r"\.",
+    "ip": r"[.:]",
+    "uuid": r"-",
+    "sha1": r"[0-9a-fA-F]{40}",
+    "md5": r"[0-9a-fA-F]{32}",
+    "date": r"[\d(]",
+    "duration": r"\d",
+    "hex": r"0",
+    "float": r"\d",
+    "int": r"\d",
+    "quoted_str": r"=",
+    "bool": r"=",
+}
+
 
 @dataclasses.dataclass
 class ParameterizationCallable:
@@ -266,11 +290,134 @@ class _UniqueId:
                 count += 1
         return (" ".join(strings), count)
 
+    # Splits a token into runs that roughly correspond to how a BPE tokenizer splits it: words
+    # (optionally capitalized), all-caps runs, digits and everything else. Like in the tokenizer,
+    # a single punctuation character is merged into the letters following it.
+    _RUN_RE = re.compile(
+        r"[^A-Za-z0-9]?(?P<letters>[A-Z]?[a-z]+|[A-Z]+(?![a-z]))|[0-9]+|[^A-Za-z0-9]+"
+    )
+    # English words have at most five consonants in a row ("strengths"), random letters often more.
+    _RANDOM_LETTERS_RE = re.compile(r"[^aeiouyAEIOUY]{6,}")
+    _HEX_LETTERS = frozenset("abcdef")
+
+    @staticmethod
+    def estimate_num_tokens(token_str: str) -> float:
+        """
+        Estimates the number of tokens `num_tokens_from_string` would return without running the
+        tokenizer.
+
+        The costs per run are fitted to the token counts of `cl100k_base` for the words and
+        identifiers of this codebase and of the grouping test inputs, and for random hex, base64
+        and alphanumeric ids. Digits take a token per three of them, words take one token and a bit
+        more for every letter, while the letters of hex ids and letters with long runs of
+        consonants take a token for about every other letter.
+        """
+        num_tokens = 0.0
+        for match in _UniqueId._RUN_RE.finditer(token_str):
+            run = match.group("letters") or match.group()
+            length = len(run)
+            first = run[0]
+            if first.isdigit():
+                num_tokens += math.ceil(length / 3)
+            elif not first.isalpha():
+                # Repeated characters ("----") are merged into few tokens
+                num_tokens += (
+                    1 + length // 8 if length > 1 and run == first * length else length / 4
+                )
+            elif length >= 4 and _UniqueId._HEX_LETTERS.issuperset(run):
+                num_tokens += 0.45 * length
+            elif _UniqueId._RANDOM_LETTERS_RE.search(run):
+                num_tokens += 0.55 * length
+            elif length > 1 and run.isupper():
+                num_tokens += 1.1 + 0.22 * (length - 1)
+            else:
+                num_tokens += 1 + 0.15 * (length - 1)
+        return num_tokens
+
+    @staticmethod
+    def is_probably_uniq_id_fast(token_str: str) -> bool:
+        """
+        Same as `is_probably_uniq_id`, but uses `estimate_num_tokens` instead of the tokenizer.
+        """
+        token_str = token_str.strip("\"'[]{}():;")
+        if len(token_str) < _UniqueId.TOKEN_LENGTH_MINIMUM:
+            return False
+        if (
+            token_str[0] == "<" and token_str[-1] == ">"
+        ):  # Don't replace already-parameterized tokens
+            return False
+        token_length_ratio = _UniqueId.estimate_num_tokens(token_str) / len(token_str)
+        if (
+            len(token_str) > _UniqueId.TOKEN_LENGTH_LONG
+            and token_length_ratio > _UniqueId.TOKEN_LENGTH_RATIO_LONG
+        ):
+            return True
+        return token_length_ratio > _UniqueId.TOKEN_LENGTH_RATIO_DEFAULT
+
+    @staticmethod
+    def replace_uniq_ids_in_str_fast(string: str) -> tuple[str, int]:
+        """
+        Return result and count of replacements, using `is_probably_uniq_id_fast`
+        """
+        strings = string.split(" ")
+        count = 0
+        for i, s in enumerate(strings):
+            if _UniqueId.is_probably_uniq_id_fast(s):
+                strings[i] = "<uniq_id>"
+                count += 1
+        return (" ".join(strings), count)
+
 
 UniqueIdExperiment = ParameterizationCallableExperiment(
     name=_UniqueId.NAME, apply=_UniqueId.replace_uniq_ids_in_str
 )
 
+# Same experiment (and rollout group) as `UniqueIdExperiment`, without the tokenizer.
+UniqueIdFastExperiment = ParameterizationCallableExperiment(
+    name=_UniqueId.NAME, apply=_UniqueId.replace_uniq_ids_in_str_fast
+)
+
+
+class _ParameterizationMemo:
+    """
+    A bounded, process-wide LRU mapping of `(pattern keys, message)` to the parameterized message
+    and the number of matches per pattern, so that repeated messages skip the regex entirely while
+    still being accounted for in `Parameterizer.matches_counter`.
+    """
+
+    MAX_SIZE = 4096
+    # Longer messages are rarely repeated verbatim and would make the memo expensive to hold.
+    MAX_CONTENT_LENGTH = 1024
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: OrderedDict[
+            tuple[tuple[str, ...], str], tuple[str, dict[str, int]]
+        ] = OrderedDict()
+
+    def get(self, key: tuple[tuple[str, ...], str]) -> tuple[str, dict[str, int]] | None:
+        with self._lock:
+            rv = self._items.get(key)
+            if rv is not None:
+                self._items.move_to_end(key)
+            return rv
+
+    def set(self, key: tuple[tuple[str, ...], str], value: tuple[str, dict[str, int]]) -> None:
+        if len(key[1]) > self.MAX_CONTENT_LENGTH:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.MAX_SIZE:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+parameterization_memo = _ParameterizationMemo()
+
 
 ParameterizationExperiment = ParameterizationCallableExperiment | ParameterizationRegexExperiment
 
@@ -281,7 +428,9 @@ class Parameterizer:
         regex_pattern_keys: Sequence[str],
         experiments: Sequence[ParameterizationExperiment] = (),
     ):
+        self._pattern_keys = tuple(regex_pattern_keys)
         self._parameterization_regex = self._make_regex_from_patterns(regex_pattern_keys)
+        self._prefilter_regex = self._make_prefilter_from_patterns(self._pattern_keys)
         self._experiments = experiments
 
         self.matches_counter: defaultdict[str, int] = defaultdict(int)
@@ -303,10 +452,24 @@ class Parameterizer:
             rf"(?x){'|'.join(DEFAULT_PARAMETERIZATION_REGEXES_MAP[k] for k in pattern_keys)}"
         )
 
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _make_prefilter_from_patterns(pattern_keys: tuple[str, ...]) -> re.Pattern[str] | None:
+        """
+        Takes list of pattern keys and returns a compiled regex that finds something in every
+        string that any of the patterns match, or `None` if nothing can be skipped.
+        """
+        if any(k not in PARAMETERIZATION_PREFILTERS for k in pattern_keys):
+            return None
+        return re.compile("|".join(PARAMETERIZATION_PREFILTERS[k] for k in pattern_keys))
+
     def parametrize_w_regex(self, content: str) -> str:
         """
         Replace all matches of the given regex in the content with a placeholder string.
 
+        Strings without any candidate characters are returned as is, and results for recently
+        seen strings are served from `parameterization_memo`.
+
         @param content: The string to replace matches in.
         @param parameterization_regex: The compiled regex pattern to match.
         @param match_callback: An optional callback function to call with the key of the matched pattern.
@@ -314,17 +477,36 @@ class Parameterizer:
         @returns: The content with all matches replaced with placeholders.
         """
 
+        if not self._pattern_keys:
+            return content
+        if self._prefilter_regex is not None and not self._prefilter_regex.search(content):
+            return content
+
+        memo_key = (self._pattern_keys, content)
+        memoized = parameterization_memo.get(memo_key)
+        if memoized is not None:
+            result, matches = memoized
+            for key, count in matches.items():
+                self.matches_counter[key] += count
+            return result
+
+        matches_counter: defaultdict[str, int] = defaultdict(int)
+
         def _handle_regex_match(match: re.Match[str]) -> str:
             # Find the first (should be only) non-None match entry, and sub in the placeholder. For
             # example, given the groupdict item `('hex', '0x40000015')`, this returns '<hex>' as a
             # replacement for the original value in the string.
             for key, value in match.groupdict().items():
                 if value is not None:
-                    self.matches_counter[key] += 1
+                    matches_counter[key] += 1
                     return f"<{key}>"
             return ""
 
-        return self._parameterization_regex.sub(_handle_regex_match, content)
+        result = self._parameterization_regex.sub(_handle_regex_match, content)
+        parameterization_memo.set(memo_key, (result, dict(matches_counter)))
+        for key, count in matches_counter.items():
+            self.matches_counter[key] += count
+        return result
 
     def parametrize_w_experiments(
         self, content: str, should_run: Callable[[str], bool] = lambda _: True
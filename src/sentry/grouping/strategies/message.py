@@ -1,11 +1,15 @@
 from itertools import islice
 from typing import Any
 
-from sentry import analytics
+from sentry import analytics, options
 from sentry.eventstore.models import Event
 from sentry.features.rollout import in_rollout_group
 from sentry.grouping.component import GroupingComponent
-from sentry.grouping.parameterization import Parameterizer, UniqueIdExperiment
+from sentry.grouping.parameterization import (
+    Parameterizer,
+    UniqueIdExperiment,
+    UniqueIdFastExperiment,
+)
 from sentry.grouping.strategies.base import (
     GroupingContext,
     ReturnedVariants,
@@ -48,7 +52,13 @@ def normalize_message_for_grouping(message: str, event: Event, share_analytics:
             "quoted_str",
             "bool",
         ),
-        experiments=(UniqueIdExperiment,),
+        experiments=(
+            (
+                UniqueIdFastExperiment
+                if options.get("grouping.experiments.parameterization.uniq_id.fast-heuristic")
+                else UniqueIdExperiment
+            ),
+        ),
     )
 
     def _shoudl_run_experiment(experiment_name: str) -> bool:
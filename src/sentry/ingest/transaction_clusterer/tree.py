@@ -46,8 +46,9 @@ The replacement rules are interpreted by Relay to match and replace `*`, and to
 """
 
 import logging
-from collections import UserDict, defaultdict
-from collections.abc import Iterable
+import sys
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from typing import TypeAlias, Union
 
 import sentry_sdk
@@ -87,7 +88,7 @@ class TreeClusterer(Clusterer):
             parts = string.split(SEP, maxsplit=MAX_DEPTH)
             node = self._tree
             for part in parts:
-                node = node.setdefault(part, Node())
+                node = node.get_or_add_child(part)
 
     def get_rules(self) -> list[ReplacementRule]:
         """Computes the rules for the current tree."""
@@ -131,35 +132,77 @@ class TreeClusterer(Clusterer):
 Edge: TypeAlias = Union[str, Merged]
 
 
-class Node(UserDict):
-    """Keys in this dict are names of the children"""
+class Node:
+    """A node in the URL tree, with its children keyed by the path segment leading to them.
 
-    def paths(self, ancestors: list[Edge] | None = None) -> Iterable[list[Edge]]:
-        """Collect all paths and subpaths through the graph"""
-        if ancestors is None:
-            ancestors = []
-        for name, child in self.items():
-            path = ancestors + [name]
-            yield path
-            yield from child.paths(ancestors=path)
+    Transaction name sets contain thousands of distinct URLs, and most nodes of
+    the tree are leaves. Nodes therefore only hold a (lazily created) dict of
+    children, and path segments are interned so that equal segments in
+    different branches of the tree share a single string.
+    """
 
-    def merge(self, merge_threshold: int) -> None:
-        """Recursively merge children of high-cardinality nodes"""
-        if len(self) >= merge_threshold:
-            merged_children = self._merge_nodes(self.values())
-            self.clear()
-            self[MERGED] = merged_children
+    __slots__ = ("children",)
+
+    def __init__(self, children: dict[Edge, "Node"] | None = None) -> None:
+        self.children = children
+
+    def __len__(self) -> int:
+        return len(self.children) if self.children else 0
+
+    def get_or_add_child(self, name: str) -> "Node":
+        if self.children is None:
+            self.children = {}
+        child = self.children.get(name)
+        if child is None:
+            child = self.children[sys.intern(name)] = Node()
+        return child
 
-        for child in self.values():
-            child.merge(merge_threshold)
+    def paths(self) -> Iterable[list[Edge]]:
+        """Collect all paths and subpaths through the graph, depth first"""
+        if not self.children:
+            return
+        # Iterative to not run into `RecursionError`s on deep trees
+        stack: list[tuple[list[Edge], Iterator[tuple[Edge, Node]]]] = [
+            ([], iter(self.children.items()))
+        ]
+        while stack:
+            ancestors, children = stack[-1]
+            for name, child in children:
+                path = ancestors + [name]
+                yield path
+                if child.children:
+                    stack.append((path, iter(child.children.items())))
+                break
+            else:
+                stack.pop()
+
+    def merge(self, merge_threshold: int) -> None:
+        """Merge children of high-cardinality nodes, parents before their children"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if not node.children:
+                continue
+            if len(node.children) >= merge_threshold:
+                node.children = {MERGED: self._merge_nodes(node.children.values())}
+            stack.extend(node.children.values())
 
     @classmethod
     def _merge_nodes(cls, nodes: Iterable["Node"]) -> "Node":
-        children_by_name = defaultdict(list)
+        children_by_name: dict[Edge, list[Node]] = defaultdict(list)
         for node in nodes:
-            for name, child in node.items():
-                children_by_name[name].append(child)
+            if node.children:
+                for name, child in node.children.items():
+                    children_by_name[name].append(child)
+
+        if not children_by_name:
+            return Node()
 
+        # A child without siblings of the same name is detached from the tree
+        # it was merged out of, so it can be moved instead of copied.
         return Node(
-            {name: cls._merge_nodes(children) for name, children in children_by_name.items()}
+            {
+                name: children[0] if len(children) == 1 else cls._merge_nodes(children)
+                for name, children in children_by_name.items()
+            }
         )
@@ -86,6 +86,8 @@ class MailAdapter:
                 event_to_record(event, rules, notification_uuid=notification_uuid),
                 increment_delay=get_digest_option("increment_delay"),
                 maximum_delay=get_digest_option("maximum_delay"),
+                # Ownership rules may route every event of a group to different owners.
+                compact=target_type != ActionTargetType.ISSUE_OWNERS,
             )
             if immediate_delivery:
                 deliver_digest.delay(digest_key, notification_uuid=notification_uuid)
@@ -134,8 +134,9 @@ class Rule(Model):
         return rv
 
     def _clear_project_rule_cache(self) -> None:
-        cache_key = f"project:{self.project_id}:rules"
-        cache.delete(cache_key)
+        cache.delete_many(
+            [f"project:{self.project_id}:rules", f"project:{self.project_id}:rule-index"]
+        )
 
     def get_audit_log_data(self):
         return {
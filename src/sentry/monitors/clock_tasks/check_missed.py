@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from datetime import datetime
+from typing import Any
 
 from arroyo.backends.kafka import KafkaPayload
+from django.db import router, transaction
 from django.db.models import Q
 from sentry_kafka_schemas.schema_types.monitors_clock_tasks_v1 import MarkMissing
 
@@ -106,6 +109,56 @@ def mark_environment_missing(monitor_environment_id: int, ts: datetime):
         # (or the environment was deleted)
         return
 
+    checkin = MonitorCheckIn.objects.create(**_missed_checkin_kwargs(monitor_environment))
+    mark_failed(checkin, ts=_get_most_recent_expected_ts(monitor_environment, ts))
+
+
+def mark_environments_missing(monitor_environment_ids: Sequence[int], ts: datetime):
+    """
+    Marks a batch of monitor environments as missed for the same clock tick,
+    see `mark_environment_missing`.
+
+    The environments are loaded and their missed check-ins created with a
+    single query each, and everything happens in one transaction. Marking an
+    environment failed happens in a savepoint, so that one failure doesn't
+    roll back the rest of the batch.
+    """
+    logger.info("mark_missing_batch", extra={"monitor_environment_ids": monitor_environment_ids})
+
+    with transaction.atomic(router.db_for_write(MonitorCheckIn)):
+        monitor_environments = list(
+            MonitorEnvironment.objects.select_related("monitor").filter(
+                IGNORE_MONITORS,
+                id__in=monitor_environment_ids,
+                # See mark_environment_missing
+                next_checkin_latest__lte=ts,
+            )
+        )
+        checkins = MonitorCheckIn.objects.bulk_create(
+            [
+                MonitorCheckIn(**_missed_checkin_kwargs(monitor_environment))
+                for monitor_environment in monitor_environments
+            ]
+        )
+
+        for monitor_environment, checkin in zip(monitor_environments, checkins):
+            try:
+                with transaction.atomic(router.db_for_write(MonitorCheckIn)):
+                    mark_failed(checkin, ts=_get_most_recent_expected_ts(monitor_environment, ts))
+            except Exception:
+                logger.exception(
+                    "Failed to mark monitor environment missing",
+                    extra={"monitor_environment_id": monitor_environment.id},
+                )
+
+    metrics.distribution(
+        "sentry.monitors.tasks.check_missing.batch_size",
+        len(monitor_environments),
+        sample_rate=1.0,
+    )
+
+
+def _missed_checkin_kwargs(monitor_environment: MonitorEnvironment) -> dict[str, Any]:
     monitor = monitor_environment.monitor
     # next_checkin must be set, since detecting this monitor as missed means
     # there must have been an initial user check-in.
@@ -117,15 +170,21 @@ def mark_environment_missing(monitor_environment_id: int, ts: datetime):
     # XXX(epurkhiser): The date_added is backdated so that this missed
     # check-in correctly reflects the time of when the checkin SHOULD
     # have happened. It is the same as the expected_time.
-    checkin = MonitorCheckIn.objects.create(
-        project_id=monitor_environment.monitor.project_id,
-        monitor=monitor_environment.monitor,
-        monitor_environment=monitor_environment,
-        status=CheckInStatus.MISSED,
-        date_added=expected_time,
-        expected_time=expected_time,
-        monitor_config=monitor.get_validated_config(),
-    )
+    return {
+        "project_id": monitor.project_id,
+        "monitor": monitor,
+        "monitor_environment": monitor_environment,
+        "status": CheckInStatus.MISSED,
+        "date_added": expected_time,
+        "expected_time": expected_time,
+        "monitor_config": monitor.get_validated_config(),
+    }
+
+
+def _get_most_recent_expected_ts(monitor_environment: MonitorEnvironment, ts: datetime) -> datetime:
+    monitor = monitor_environment.monitor
+    assert monitor_environment.next_checkin is not None
+    expected_time = monitor_environment.next_checkin
 
     # Compute when the check-in *should* have happened given the current
     # reference timestamp. This is different from the expected_time usage above
@@ -155,10 +214,8 @@ def mark_environment_missing(monitor_environment_id: int, ts: datetime):
     #
     # When computing our timestamps MUST be in the correct timezone of the
     # monitor to compute the previous schedule
-    most_recent_expected_ts = get_prev_schedule(
+    return get_prev_schedule(
         expected_time.astimezone(monitor.timezone),
         ts.astimezone(monitor.timezone),
         monitor.schedule,
     )
-
-    mark_failed(checkin, ts=most_recent_expected_ts)
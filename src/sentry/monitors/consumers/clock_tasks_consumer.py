@@ -3,10 +3,11 @@ from __future__ import annotations
 import logging
 from collections.abc import Mapping
 from datetime import datetime, timezone
-from typing import TypeGuard
+from typing import Literal, TypeGuard
 
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
+from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import BrokerValue, Commit, FilteredPayload, Message, Partition
@@ -18,7 +19,10 @@ from sentry_kafka_schemas.schema_types.monitors_clock_tasks_v1 import (
 )
 
 from sentry.conf.types.kafka_definition import Topic, get_topic_codec
-from sentry.monitors.clock_tasks.check_missed import mark_environment_missing
+from sentry.monitors.clock_tasks.check_missed import (
+    mark_environment_missing,
+    mark_environments_missing,
+)
 from sentry.monitors.clock_tasks.check_timeout import mark_checkin_timeout
 
 MONITORS_CLOCK_TASKS_CODEC: Codec[MonitorsClockTasks] = get_topic_codec(Topic.MONITORS_CLOCK_TASKS)
@@ -55,15 +59,107 @@ def process_clock_task(message: Message[KafkaPayload | FilteredPayload]):
         logger.exception("Failed to process clock tick task")
 
 
+def process_clock_task_batch(message: Message[ValuesBatch[KafkaPayload]]):
+    """
+    Processes a batch of clock tasks in order. Consecutive mark_missing tasks
+    of the same clock tick are handed to `mark_environments_missing` together,
+    which is what the top of the hour looks like, when many monitors miss at
+    once.
+    """
+    missing_ts: datetime | None = None
+    missing_ids: list[int] = []
+
+    def flush_missing():
+        nonlocal missing_ids
+        if missing_ts is None or not missing_ids:
+            return
+        try:
+            mark_environments_missing(missing_ids, missing_ts)
+        except Exception:
+            logger.exception("Failed to process clock tick task batch")
+        missing_ids = []
+
+    for item in message.payload:
+        try:
+            wrapper = MONITORS_CLOCK_TASKS_CODEC.decode(item.payload.value)
+            ts = datetime.fromtimestamp(wrapper["ts"], tz=timezone.utc)
+        except Exception:
+            logger.exception("Failed to process clock tick task")
+            continue
+
+        if is_mark_missing(wrapper):
+            monitor_environment_id = int(wrapper["monitor_environment_id"])
+            # Tasks for the same monitor environment MUST happen in-order, so the
+            # batch is cut short when an environment is missed a second time.
+            if ts != missing_ts or monitor_environment_id in missing_ids:
+                flush_missing()
+                missing_ts = ts
+            missing_ids.append(monitor_environment_id)
+            continue
+
+        # Keep the order of tasks of other types relative to the mark_missing tasks
+        flush_missing()
+        if is_mark_timeout(wrapper):
+            try:
+                mark_checkin_timeout(int(wrapper["checkin_id"]), ts)
+            except Exception:
+                logger.exception("Failed to process clock tick task")
+            continue
+
+        logger.error("Unsupported clock-tick task type: %s", wrapper["type"])
+
+    flush_missing()
+
+
 class MonitorClockTasksStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
-    def __init__(self) -> None:
-        pass
+    batched = False
+    """
+    Does the consumer mark missed monitor environments in batches?
+    """
+
+    max_batch_size = 500
+    """
+    How many messages will be batched at once when in batched mode.
+    """
+
+    max_batch_time = 1
+    """
+    The maximum time in seconds to accumulate a batch of tasks.
+    """
+
+    def __init__(
+        self,
+        mode: Literal["batched", "serial"] | None = None,
+        max_batch_size: int | None = None,
+        max_batch_time: int | None = None,
+    ) -> None:
+        if mode == "batched":
+            self.batched = True
+
+        if max_batch_size is not None:
+            self.max_batch_size = max_batch_size
+        if max_batch_time is not None:
+            self.max_batch_time = max_batch_time
+
+    def create_batched_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
+        batch_processor = RunTask(
+            function=process_clock_task_batch,
+            next_step=CommitOffsets(commit),
+        )
+        return BatchStep(
+            max_batch_size=self.max_batch_size,
+            max_batch_time=self.max_batch_time,
+            next_step=batch_processor,
+        )
 
     def create_with_partitions(
         self,
         commit: Commit,
         partitions: Mapping[Partition, int],
     ) -> ProcessingStrategy[KafkaPayload]:
+        if self.batched:
+            return self.create_batched_worker(commit)
+
         # XXX(epurkihser): We're going to want to add some form of parallelism
         # here, but we'll need to be careful that we keep tasks grouped by
         # their partitions.
@@ -65,6 +65,9 @@ MONITOR_CONFIG = {
     "additionalProperties": False,
 }
 
+# The schema is checked once, rather than on every validation
+MONITOR_CONFIG_VALIDATOR = jsonschema.validators.validator_for(MONITOR_CONFIG)(MONITOR_CONFIG)
+
 
 class MonitorLimitsExceeded(Exception):
     pass
@@ -370,7 +373,7 @@ class Monitor(Model):
 
     def get_validated_config(self):
         try:
-            jsonschema.validate(self.config, MONITOR_CONFIG)
+            MONITOR_CONFIG_VALIDATOR.validate(self.config)
             return self.config
         except jsonschema.ValidationError:
             logging.exception("Monitor: %s invalid config: %s", self.id, self.config)
@@ -1,4 +1,7 @@
-from datetime import datetime
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, tzinfo
 
 from croniter import croniter
 from dateutil import rrule
@@ -14,6 +17,81 @@ SCHEDULE_INTERVAL_MAP: dict[IntervalUnit, int] = {
     "minute": rrule.MINUTELY,
 }
 
+# How many ticks of a crontab schedule are computed at once
+SCHEDULE_TABLE_SIZE = 16
+
+# How many crontab schedules the process keeps the ticks of
+SCHEDULE_MEMO_SIZE = 10_000
+
+
+class CrontabTickMemo:
+    """
+    A process-wide LRU memo of the upcoming ticks of crontab schedules, so that
+    the next and previous schedule of monitors sharing a crontab (typically all
+    missed at once, at the top of the hour) are looked up in a table rather than
+    each being computed through croniter.
+
+    Ticks are only memoized in timezones that don't observe daylight saving
+    time over the ticks, croniter's results are not consistent across
+    transitions.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._tables: OrderedDict[tuple[str, tzinfo | None], list[datetime]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_ticks(self, crontab: str, reference_ts: datetime) -> list[datetime] | None:
+        """
+        Returns ticks of the crontab, in the timezone of `reference_ts`, with at
+        least one tick before and after it. Returns `None` when the ticks can't
+        be memoized.
+        """
+        key = (crontab, reference_ts.tzinfo)
+        with self._lock:
+            ticks = self._tables.get(key)
+            if ticks is not None and ticks[0] < reference_ts < ticks[-1]:
+                self._tables.move_to_end(key)
+                return ticks
+
+        ticks = _compute_ticks(crontab, reference_ts)
+        if ticks is None:
+            return None
+        with self._lock:
+            self._tables[key] = ticks
+            self._tables.move_to_end(key)
+            while len(self._tables) > self.max_size:
+                self._tables.popitem(last=False)
+        return ticks
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+
+
+def _compute_ticks(crontab: str, reference_ts: datetime) -> list[datetime] | None:
+    # Crontabs with a seconds field don't tick on whole minutes
+    if len(crontab.split()) > 5:
+        return None
+
+    iterator = croniter(crontab, reference_ts)
+    ticks = [iterator.get_prev(datetime).replace(second=0, microsecond=0)]
+    iterator = croniter(crontab, ticks[0])
+    ticks.extend(iterator.get_next(datetime) for _ in range(SCHEDULE_TABLE_SIZE))
+
+    offsets = {tick.utcoffset() for tick in ticks}
+    offsets.update(
+        datetime(year, month, 1, tzinfo=reference_ts.tzinfo).utcoffset()
+        for year in range(ticks[0].year, ticks[-1].year + 1)
+        for month in (1, 7)
+    )
+    if len(offsets) != 1 or not ticks[0] < reference_ts < ticks[-1]:
+        return None
+    return ticks
+
+
+crontab_tick_memo = CrontabTickMemo(SCHEDULE_MEMO_SIZE)
+
 
 def get_next_schedule(
     reference_ts: datetime,
@@ -38,6 +116,9 @@ def get_next_schedule(
     # of granularity we're able to support
 
     if schedule.type == "crontab":
+        ticks = crontab_tick_memo.get_ticks(schedule.crontab, reference_ts)
+        if ticks is not None:
+            return ticks[bisect_right(ticks, reference_ts)]
         iterator = croniter(schedule.crontab, reference_ts)
         return iterator.get_next(datetime).replace(second=0, microsecond=0)
 
@@ -77,6 +158,9 @@ def get_prev_schedule(
     >>> 05:30
     """
     if schedule.type == "crontab":
+        ticks = crontab_tick_memo.get_ticks(schedule.crontab, reference_ts)
+        if ticks is not None:
+            return ticks[bisect_left(ticks, reference_ts) - 1]
         return (
             croniter(schedule.crontab, reference_ts)
             .get_prev(datetime)
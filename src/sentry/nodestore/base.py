@@ -10,6 +10,7 @@ from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
 from sentry import options
+from sentry.nodestore.lru import NodeLRUCache
 from sentry.utils import json, metrics
 from sentry.utils.services import Service
 
@@ -28,6 +29,10 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json.loads
 
+# Process-wide cache tier that is shared by the thread-local NodeStorage
+# instances and consulted before the Django cache and the backend.
+lru_cache = NodeLRUCache()
+
 
 class NodeStorage(local, Service):
     """
@@ -138,6 +143,11 @@ class NodeStorage(local, Service):
         """
         with sentry_sdk.start_span(op="nodestore.get") as span:
             span.set_tag("node_id", id)
+            bytes_from_lru = self._get_lru_item(id)
+            if bytes_from_lru is not None:
+                span.set_tag("origin", "from_lru")
+                return self._decode(bytes_from_lru, subkey=subkey)
+
             if subkey is None:
                 item_from_cache = self._get_cache_item(id)
                 if item_from_cache:
@@ -149,6 +159,7 @@ class NodeStorage(local, Service):
             span.set_tag("subkey", str(subkey))
             bytes_data = self._get_bytes(id)
             rv = self._decode(bytes_data, subkey=subkey)
+            self._set_lru_item(id, bytes_data)
             if subkey is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
@@ -183,10 +194,21 @@ class NodeStorage(local, Service):
             span.set_tag("subkey", str(subkey))
             span.set_tag("num_ids", len(id_list))
 
+            items_from_lru = {
+                id: self._decode(value, subkey=subkey)
+                for id, value in self._get_lru_items(id_list).items()
+            }
+            if items_from_lru:
+                if len(items_from_lru) == len(id_list):
+                    span.set_tag("result", "from_lru")
+                    return items_from_lru
+                id_list = [id for id in id_list if id not in items_from_lru]
+
             if subkey is None:
                 cache_items = self._get_cache_items(id_list)
                 if len(cache_items) == len(id_list):
                     span.set_tag("result", "from_cache")
+                    cache_items.update(items_from_lru)
                     return cache_items
 
                 uncached_ids = [id for id in id_list if id not in cache_items]
@@ -194,13 +216,15 @@ class NodeStorage(local, Service):
                 uncached_ids = id_list
 
             with sentry_sdk.start_span(op="nodestore._get_bytes_multi_and_decode") as span:
+                bytes_items = self._get_bytes_multi(uncached_ids)
                 items = {
-                    id: self._decode(value, subkey=subkey)
-                    for id, value in self._get_bytes_multi(uncached_ids).items()
+                    id: self._decode(value, subkey=subkey) for id, value in bytes_items.items()
                 }
+            self._set_lru_items(bytes_items)
             if subkey is None:
                 self._set_cache_items(items)
                 items.update(cache_items)
+            items.update(items_from_lru)
 
             span.set_tag("result", "from_service")
             span.set_tag("found", len(items))
@@ -264,6 +288,7 @@ class NodeStorage(local, Service):
         bytes_data = self._encode(data)
         self.set_bytes(item_id, bytes_data, ttl=ttl)
         # set cache only after encoding and write to nodestore has succeeded
+        self._set_lru_item(item_id, bytes_data, ttl=ttl)
         if options.get("nodestore.set-subkeys.enable-set-cache-item"):
             self._set_cache_item(item_id, cache_item)
 
@@ -294,13 +319,53 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, item_id: str) -> None:
+        lru_cache.delete(item_id)
         if self.cache:
             self.cache.delete(item_id)
 
     def _delete_cache_items(self, id_list: list[str]) -> None:
+        lru_cache.delete_many(id_list)
         if self.cache:
             self.cache.delete_many([item_id for item_id in id_list])
 
+    def _get_lru_item(self, item_id: str) -> bytes | None:
+        if options.get("nodestore.lru-cache.max-bytes") <= 0:
+            return None
+
+        rv = lru_cache.get(item_id)
+        metrics.incr("nodestore.lru", tags={"result": "hit" if rv is not None else "miss"})
+        return rv
+
+    def _get_lru_items(self, id_list: list[str]) -> dict[str, bytes]:
+        if options.get("nodestore.lru-cache.max-bytes") <= 0:
+            return {}
+
+        rv = lru_cache.get_many(id_list)
+        if rv:
+            metrics.incr("nodestore.lru", amount=len(rv), tags={"result": "hit"})
+        if len(rv) < len(id_list):
+            metrics.incr("nodestore.lru", amount=len(id_list) - len(rv), tags={"result": "miss"})
+        return rv
+
+    def _set_lru_item(self, item_id: str, data: bytes | None, ttl: timedelta | None = None) -> None:
+        self._set_lru_items({item_id: data}, ttl=ttl)
+
+    def _set_lru_items(
+        self, items: Mapping[str, bytes | None], ttl: timedelta | None = None
+    ) -> None:
+        max_bytes = options.get("nodestore.lru-cache.max-bytes")
+        if max_bytes <= 0:
+            return
+
+        lru_ttl = options.get("nodestore.lru-cache.ttl-seconds")
+        if ttl is not None:
+            lru_ttl = min(lru_ttl, ttl.total_seconds())
+
+        for item_id, data in items.items():
+            if data:
+                lru_cache.set(item_id, data, ttl=lru_ttl, max_bytes=max_bytes)
+        metrics.gauge("nodestore.lru.size", lru_cache.size)
+
     @cached_property
     def cache(self) -> BaseCache | None:
         try:
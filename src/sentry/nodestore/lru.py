@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+
+
+class NodeLRUCache:
+    """
+    A process-local LRU cache of encoded node payloads, bounded by the total
+    size of the stored payloads in bytes.
+
+    Values are the raw (still JSON encoded) bytes of a node including all of
+    its subkeys, so that every caller decodes its own copy and cached payloads
+    can never be mutated from the outside. Entries expire after a TTL, which
+    bounds how long other processes can observe a node that was deleted or
+    overwritten elsewhere.
+
+    The cache is shared by all threads of a process and guarded by a lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._get(key, time.monotonic())
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, bytes]:
+        now = time.monotonic()
+        rv = {}
+        with self._lock:
+            for key in keys:
+                value = self._get(key, now)
+                if value is not None:
+                    rv[key] = value
+        return rv
+
+    def set(self, key: str, value: bytes, ttl: float, max_bytes: int) -> None:
+        with self._lock:
+            self._pop(key)
+            # Never let a single payload flush the entire cache.
+            if len(value) > max_bytes:
+                return
+
+            self._items[key] = (time.monotonic() + ttl, value)
+            self._size += len(value)
+            while self._size > max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def _get(self, key: str, now: float) -> bytes | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at <= now:
+            self._pop(key)
+            return None
+
+        self._items.move_to_end(key)
+        return value
+
+    def _pop(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._size -= len(item[1])
@@ -720,6 +720,16 @@ register(
     "store.race-free-group-creation-force-disable", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
 
+# Buffer the TSDB counter writes of a save_event batch and write them with one
+# pipeline per redis host
+register("store.tsdb-coalesce-writes", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Merge the HyperLogLogs of distinct counter unions in process instead of with
+# temporary keys in redis
+register(
+    "tsdb.redis.client-side-distinct-counts-union", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+
 # Enable calling the severity modeling API on group creation
 register(
     "processing.calculate-severity-on-group-creation",
@@ -1294,6 +1304,23 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Maximum number of entries in the process-local cache of the caching indexer, 0 disables it
+register(
+    "sentry-metrics.indexer.local-cache.max-size",
+    default=0,
+    type=Int,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Number of threads (and database connections) the Postgres indexer uses to look up and
+# write strings of different tables and org shards in parallel, 0 or 1 records them serially
+register(
+    "sentry-metrics.indexer.postgres.parallel-workers",
+    default=0,
+    type=Int,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Option to control sampling percentage of schema validation on the generic metrics pipeline
 # based on namespace.
 register(
@@ -1923,6 +1950,10 @@ register("txnames.bump-lifetime-sample-rate", default=0.1, flags=FLAG_AUTOMATOR_
 register(
     "nodestore.set-subkeys.enable-set-cache-item", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
+# Size in bytes of the process-local LRU tier in front of nodestore. 0 disables it.
+# These are read on every nodestore access, so they are only taken from the config file.
+register("nodestore.lru-cache.max-bytes", type=Int, default=0, flags=FLAG_NOSTORE)
+register("nodestore.lru-cache.ttl-seconds", type=Int, default=60, flags=FLAG_NOSTORE)
 
 # === Backpressure related runtime options ===
 
@@ -2380,6 +2411,14 @@ register(
     default=0.0,
     flags=FLAG_ADMIN_MODIFIABLE | FLAG_AUTOMATOR_MODIFIABLE | FLAG_RATE,
 )
+# Detect unique ids in the `uniq_id` experiment with a character-class heuristic instead of the
+# tokenizer. This is read for every message, so it is only taken from the config file.
+register(
+    "grouping.experiments.parameterization.uniq_id.fast-heuristic",
+    type=Bool,
+    default=False,
+    flags=FLAG_NOSTORE,
+)
 
 # TODO: For now, only a small number of projects are going through a grouping config transition at
 # any given time, so we're sampling at 100% in order to be able to get good signal. Once we've fully
@@ -2506,6 +2545,17 @@ register(
     default=False,
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+register(
+    "standalone-spans.expand-segments.streaming.enable",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "standalone-spans.expand-segments.max-outstanding-bytes",
+    type=Int,
+    default=100 * 1000 * 1000,  # 100 MB
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "indexed-spans.agg-span-waterfall.enable",
     default=False,
@@ -2699,6 +2749,15 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Evaluate the slow conditions of delayed rules for all of a rule's groups at once, using a columnar
+# view of the condition query results.
+register(
+    "delayed_processing.columnar-evaluation.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 register(
     "grouping.grouphash_metadata.ingestion_writes_enabled",
     type=Bool,
@@ -2706,6 +2765,15 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Resolve all of an event's hashes with a single `GroupHash` query and create missing rows with one
+# bulk insert, rather than a `get_or_create` per hash.
+register(
+    "grouping.grouphash.batched-lookup.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 register(
     "ecosystem:enable_integration_form_error_raise", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
@@ -2736,3 +2804,90 @@ register(
     default=[],
     flags=FLAG_ALLOW_EMPTY | FLAG_AUTOMATOR_MODIFIABLE,
 )
+
+# Flush batches of buffer keys with a single script call per Redis host rather
+# than processing every key with its own lock and round trips.
+register(
+    "buffer.batched-flush.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Skip issue alert rules which can't fire for an event (because of their environment, level, issue
+# category or required tags) before evaluating their conditions.
+register(
+    "rules.processing.rule-index.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Number of scheduled digests delivered by a single task, which claims all of their timelines
+# with one call per Redis host. 0 delivers every digest with its own task.
+register(
+    "digests.delivery.batch-size",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Number of threads (and database connections) used to run the independent prefetch loaders of
+# API serializers concurrently with each other and with `get_attrs`. 0 runs them serially.
+register(
+    "api.serializers.prefetch-workers",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Coalesce concurrent identical Snuba queries missing the query cache: the first caller takes a
+# lease of the cache key and runs the query, the others wait for its result.
+register(
+    "snuba.query-cache.coalesce.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Referrers whose cached Snuba results are kept (for `snuba.query-cache.stale-ttl-seconds`) after
+# they expired, to be served while a single caller refreshes them in the background.
+register(
+    "snuba.query-cache.stale-while-revalidate.referrers",
+    type=Sequence,
+    default=[],
+    flags=FLAG_ALLOW_EMPTY | FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "snuba.query-cache.stale-ttl-seconds",
+    type=Int,
+    default=600,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Decode the rows of SnQL responses while they are being read, instead of buffering the whole body
+# first. Columnar queries are always decoded this way.
+register(
+    "snuba.query.streaming-decode.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# When the Postgres filters of an issue search match too many groups to pass down to Snuba, estimate
+# the selectivity of both sides of the query first and plan the query from that, rather than always
+# post-filtering chunks of Snuba results.
+register(
+    "snuba.search.planner.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Planned searches expected to need at least this many chunks of post-filtering run as a single
+# query joined with the group attributes instead. 0 never picks the joined query.
+register(
+    "snuba.search.planner.joined-query-min-chunks",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
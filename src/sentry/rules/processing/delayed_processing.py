@@ -1,6 +1,7 @@
 import logging
 import math
 import uuid
+from array import array
 from collections import defaultdict
 from collections.abc import Sequence
 from datetime import datetime, timedelta, timezone
@@ -405,6 +406,118 @@ def get_rules_to_fire(
     return rules_to_fire
 
 
+class ConditionResultColumns:
+    """
+    The results of the unique condition queries in columnar form. Every group is assigned a
+    position, and the results of each query are stored in a contiguous array indexed by that
+    position, so that a condition can be evaluated for all of a rule's groups at once instead of
+    looking up every `(query, group)` pair in nested dicts.
+    """
+
+    def __init__(self, condition_group_results: dict[UniqueConditionQuery, dict[int, int]]):
+        group_ids: set[int] = set()
+        for results in condition_group_results.values():
+            group_ids.update(results)
+
+        self.group_positions = {group_id: position for position, group_id in enumerate(group_ids)}
+        # The last position is never present in any column, it's used for unknown groups.
+        self.size = len(self.group_positions) + 1
+        self.columns: dict[UniqueConditionQuery, tuple[array[int], bytearray]] = {}
+
+        for unique_query, results in condition_group_results.items():
+            values = array("q", bytes(8 * self.size))
+            present = bytearray(self.size)
+            for group_id, value in results.items():
+                position = self.group_positions[group_id]
+                values[position] = value
+                present[position] = 1
+            self.columns[unique_query] = (values, present)
+
+    def get_positions(self, group_ids: Sequence[int]) -> list[int]:
+        unknown = self.size - 1
+        return [self.group_positions.get(group_id, unknown) for group_id in group_ids]
+
+    def passes_comparison(
+        self,
+        condition_data: EventFrequencyConditionData,
+        positions: Sequence[int],
+        environment_id: int,
+    ) -> tuple[list[bool], int]:
+        """
+        Columnar version of `passes_comparison`, evaluating a condition instance for all of the
+        groups at the given positions. Also returns the number of groups without query results.
+        """
+        unique_queries = generate_unique_queries(condition_data, environment_id)
+        query_columns = [
+            column
+            for column in (self.columns.get(unique_query) for unique_query in unique_queries)
+            if column is not None
+        ]
+        if len(query_columns) != len(unique_queries):
+            return [False] * len(positions), len(positions)
+
+        target_value = float(condition_data["value"])
+        values, present = query_columns[0]
+
+        if condition_data.get("comparisonType") == ComparisonType.PERCENT:
+            comparison_values, comparison_present = query_columns[1]
+            passes = [
+                bool(present[i] and comparison_present[i])
+                and percent_increase(values[i], comparison_values[i]) > target_value
+                for i in positions
+            ]
+            missing = sum(1 for i in positions if not (present[i] and comparison_present[i]))
+        else:
+            passes = [bool(present[i]) and values[i] > target_value for i in positions]
+            missing = sum(1 for i in positions if not present[i])
+
+        return passes, missing
+
+
+def get_rules_to_fire_columnar(
+    condition_group_results: dict[UniqueConditionQuery, dict[int, int]],
+    rules_to_slow_conditions: DefaultDict[Rule, list[EventFrequencyConditionData]],
+    rules_to_groups: DefaultDict[int, set[int]],
+    project_id: int,
+) -> DefaultDict[Rule, set[int]]:
+    """
+    Same as `get_rules_to_fire`, but evaluates every slow condition of a rule for all of its groups
+    at once, using a columnar view of the condition query results.
+    """
+    columns = ConditionResultColumns(condition_group_results)
+    rules_to_fire = defaultdict(set)
+    for alert_rule, slow_conditions in rules_to_slow_conditions.items():
+        action_match = alert_rule.data.get("action_match", "any")
+        if action_match not in ("any", "all"):
+            continue
+
+        group_ids = list(rules_to_groups[alert_rule.id])
+        positions = columns.get_positions(group_ids)
+        # "any" starts with no group matching, "all" with every group matching
+        matched = [action_match == "all"] * len(group_ids)
+
+        for slow_condition in slow_conditions:
+            passes, missing = columns.passes_comparison(
+                slow_condition, positions, alert_rule.environment_id
+            )
+            if missing:
+                logger.error(
+                    "delayed_processing.missing_query_results",
+                    extra={"rule_id": alert_rule.id, "missing": missing, "project_id": project_id},
+                )
+
+            if action_match == "any":
+                matched = [m or p for m, p in zip(matched, passes)]
+            else:
+                matched = [m and p for m, p in zip(matched, passes)]
+
+        for group_id, group_matched in zip(group_ids, matched):
+            if group_matched:
+                rules_to_fire[alert_rule].add(group_id)
+
+    return rules_to_fire
+
+
 def fire_rules(
     rules_to_fire: DefaultDict[Rule, set[int]],
     parsed_rulegroup_to_event_data: dict[tuple[str, str], dict[str, str]],
@@ -578,9 +691,14 @@ def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **k
 
     rules_to_fire = defaultdict(set)
     if condition_group_results:
-        rules_to_fire = get_rules_to_fire(
-            condition_group_results, rules_to_slow_conditions, rules_to_groups, project.id
-        )
+        if options.get("delayed_processing.columnar-evaluation.enabled"):
+            rules_to_fire = get_rules_to_fire_columnar(
+                condition_group_results, rules_to_slow_conditions, rules_to_groups, project.id
+            )
+        else:
+            rules_to_fire = get_rules_to_fire(
+                condition_group_results, rules_to_slow_conditions, rules_to_groups, project.id
+            )
         logger.info(
             "delayed_processing.rule_to_fire",
             extra={"rules_to_fire": list(rules_to_fire.keys()), "project_id": project_id},
@@ -10,7 +10,7 @@ from typing import Any
 from django.core.cache import cache
 from django.utils import timezone
 
-from sentry import analytics, buffer
+from sentry import analytics, buffer, options
 from sentry.eventstore.models import GroupEvent
 from sentry.models.environment import Environment
 from sentry.models.group import Group
@@ -24,6 +24,7 @@ from sentry.rules.actions.base import instantiate_action
 from sentry.rules.conditions.base import EventCondition
 from sentry.rules.conditions.event_frequency import EventFrequencyConditionData
 from sentry.rules.filters.base import EventFilter
+from sentry.rules.processing.rule_index import RuleIndex
 from sentry.types.rules import RuleFuture
 from sentry.utils import json, metrics
 from sentry.utils.hashlib import hash_values
@@ -210,6 +211,17 @@ class RuleProcessor:
         rules_: Sequence[Rule] = Rule.get_for_project(self.project.id)
         return rules_
 
+    def get_candidate_rules(self, rules: Sequence[Rule]) -> Sequence[Rule]:
+        """Skip the rules which the project's rule index rules out for this event."""
+        index = RuleIndex.get_for_project(self.project.id, rules)
+        candidate_rules = index.get_candidate_rules(rules, self.event)
+        metrics.distribution(
+            "rule_processor.rules_skipped",
+            len(rules) - len(candidate_rules),
+            tags={"has_candidates": bool(candidate_rules)},
+        )
+        return candidate_rules
+
     def condition_matches(
         self,
         condition: MutableMapping[str, Any],
@@ -394,6 +406,8 @@ class RuleProcessor:
 
         self.grouped_futures.clear()
         rules = self.get_rules()
+        if options.get("rules.processing.rule-index.enabled"):
+            rules = self.get_candidate_rules(rules)
         snoozed_rules = RuleSnooze.objects.filter(rule__in=rules, user_id=None).values_list(
             "rule", flat=True
         )
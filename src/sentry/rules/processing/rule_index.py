@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any
+
+from django.core.cache import cache
+
+from sentry import tagstore
+from sentry.constants import LOG_LEVELS_MAP
+from sentry.eventstore.models import GroupEvent
+from sentry.models.environment import Environment
+from sentry.models.rule import Rule
+from sentry.rules import MatchType, rules
+from sentry.rules.conditions.level import LevelCondition
+from sentry.rules.conditions.tagged_event import TaggedEventCondition
+from sentry.rules.filters.issue_category import IssueCategoryFilter
+
+RULE_INDEX_CACHE_TTL = 60
+
+# Tag matches which can only pass if the event has the tag at all.
+TAG_KEY_REQUIRED_MATCHES = frozenset(
+    [
+        MatchType.IS_SET,
+        MatchType.EQUAL,
+        MatchType.STARTS_WITH,
+        MatchType.ENDS_WITH,
+        MatchType.CONTAINS,
+        MatchType.IS_IN,
+    ]
+)
+
+
+def get_rule_index_cache_key(project_id: int) -> str:
+    return f"project:{project_id}:rule-index"
+
+
+@dataclass(frozen=True)
+class RuleRequirements:
+    """
+    Cheap, necessary conditions an event has to meet for a rule to possibly fire. An event which
+    doesn't meet them would be rejected by the rule's environment check, filters or conditions
+    anyway.
+    """
+
+    environment_id: int | None = None
+    # `None` means any level (or category) is fine
+    levels: frozenset[str] | None = None
+    categories: frozenset[int] | None = None
+    tag_keys: frozenset[str] = field(default_factory=frozenset)
+
+    def matches(self, level: str | None, category: int | None, tag_keys: frozenset[str]) -> bool:
+        if self.levels is not None and level not in self.levels:
+            return False
+        if self.categories is not None and category not in self.categories:
+            return False
+        return self.tag_keys <= tag_keys
+
+
+def _get_allowed_levels(data: Mapping[str, Any]) -> frozenset[str] | None:
+    try:
+        desired_level = int(data["level"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    match = data.get("match")
+    if match == MatchType.EQUAL:
+        return frozenset(name for name, level in LOG_LEVELS_MAP.items() if level == desired_level)
+    elif match == MatchType.GREATER_OR_EQUAL:
+        return frozenset(name for name, level in LOG_LEVELS_MAP.items() if level >= desired_level)
+    elif match == MatchType.LESS_OR_EQUAL:
+        return frozenset(name for name, level in LOG_LEVELS_MAP.items() if level <= desired_level)
+    return None
+
+
+def get_rule_requirements(rule: Rule) -> RuleRequirements:
+    """
+    Derive the requirements of a rule from its environment, filters and conditions. Only filters
+    and conditions which all have to pass (`"all"` match) are taken into account, and only the
+    kinds which can be checked without touching anything but the event itself.
+    """
+    levels: frozenset[str] | None = None
+    categories: frozenset[int] | None = None
+    tag_keys: set[str] = set()
+
+    filter_match = rule.data.get("filter_match") or Rule.DEFAULT_FILTER_MATCH
+    condition_match = rule.data.get("action_match") or Rule.DEFAULT_CONDITION_MATCH
+
+    for condition in rule.data.get("conditions", ()):
+        condition_cls = rules.get(condition.get("id"))
+        if condition_cls is None:
+            continue
+
+        match = filter_match if condition_cls.rule_type == "filter/event" else condition_match
+        if match != "all":
+            continue
+
+        if issubclass(condition_cls, LevelCondition):
+            allowed_levels = _get_allowed_levels(condition)
+            if allowed_levels is not None:
+                levels = allowed_levels if levels is None else levels & allowed_levels
+        elif issubclass(condition_cls, IssueCategoryFilter):
+            try:
+                category = frozenset([int(condition["value"])])
+            except (KeyError, TypeError, ValueError):
+                continue
+            categories = category if categories is None else categories & category
+        elif issubclass(condition_cls, TaggedEventCondition):
+            key = condition.get("key")
+            if key and condition.get("match") in TAG_KEY_REQUIRED_MATCHES:
+                tag_keys.add(key.lower())
+
+    return RuleRequirements(
+        environment_id=rule.environment_id,
+        levels=levels,
+        categories=categories,
+        tag_keys=frozenset(tag_keys),
+    )
+
+
+class RuleIndex:
+    """
+    An index of a project's rules, bucketed by environment, which is used to skip rules that
+    cannot possibly fire for an event before evaluating any of their conditions.
+
+    The index only holds rule ids, so it can be cached next to the project's rules and is cleared
+    alongside them whenever a rule is saved or deleted.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self._rule_ids = frozenset(rule.id for rule in rules)
+        self._by_environment: dict[int | None, list[tuple[int, RuleRequirements]]] = {}
+        self._uses_tags = False
+        for rule in rules:
+            requirements = get_rule_requirements(rule)
+            self._by_environment.setdefault(requirements.environment_id, []).append(
+                (rule.id, requirements)
+            )
+            self._uses_tags = self._uses_tags or bool(requirements.tag_keys)
+
+    @classmethod
+    def get_for_project(cls, project_id: int, rules: Sequence[Rule]) -> RuleIndex:
+        cache_key = get_rule_index_cache_key(project_id)
+        index = cache.get(cache_key)
+        if index is None:
+            index = cls(rules)
+            cache.set(cache_key, index, RULE_INDEX_CACHE_TTL)
+        return index
+
+    def get_candidate_rules(self, rules: Sequence[Rule], event: GroupEvent) -> list[Rule]:
+        """
+        Return the rules (in their original order) which might fire for the given event. Rules the
+        index doesn't know about are always returned.
+        """
+        try:
+            environment_id = event.get_environment().id
+        except Environment.DoesNotExist:
+            # No rule can fire without an environment
+            return []
+
+        level = event.get_tag("level")
+        category = event.group.issue_category.value if event.group else None
+        tag_keys: frozenset[str] = frozenset()
+        if self._uses_tags:
+            tag_keys = frozenset(
+                key
+                for raw_key, _ in event.tags
+                for key in (raw_key.lower(), tagstore.backend.get_standardized_key(raw_key))
+            )
+
+        candidate_rule_ids = {
+            rule_id
+            for rule_id, requirements in chain(
+                self._by_environment.get(None, ()), self._by_environment.get(environment_id, ())
+            )
+            if requirements.matches(level, category, tag_keys)
+        }
+        return [
+            rule for rule in rules if rule.id in candidate_rule_ids or rule.id not in self._rule_ids
+        ]
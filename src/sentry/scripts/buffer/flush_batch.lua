@@ -0,0 +1,30 @@
+-- Atomically drain a batch of buffered counter hashes.
+--
+-- KEYS[1] is the pending set for this partition, KEYS[2..n] are the buffer
+-- hashes to flush. ARGV[1] is the lock TTL (in seconds) used to coordinate
+-- with the per-key flush path.
+--
+-- For every hash the lock is taken, the hash is read and deleted, and the
+-- lock is released again. Hashes whose lock is held by another flusher are
+-- skipped and returned as `false` so that the caller can record them.
+assert(#KEYS >= 1, "provide the pending key")
+assert(#ARGV == 1, "provide a lock TTL")
+
+local pending_key = KEYS[1]
+local lock_ttl = ARGV[1]
+
+local results = {}
+for i = 2, #KEYS do
+    local key = KEYS[i]
+    local lock_key = "l:" .. key
+    if redis.call("SET", lock_key, "1", "NX", "EX", lock_ttl) then
+        results[#results + 1] = redis.call("HGETALL", key)
+        redis.call("ZREM", pending_key, key)
+        redis.call("DEL", key)
+        redis.call("DEL", lock_key)
+    else
+        results[#results + 1] = false
+    end
+end
+
+return results
@@ -84,6 +84,20 @@ local function variadic_argument_parser(argument_parser)
     end
 end
 
+local function counted_argument_parser(argument_parser)
+    -- Parses a count followed by that many arguments, which allows lists to
+    -- be embedded within other (e.g. variadic) arguments.
+    return function (cursor, arguments)
+        local count
+        cursor, count = cursor + 1, tonumber(arguments[cursor])
+        local results = {}
+        for i = 1, count do
+            cursor, results[i] = argument_parser(cursor, arguments)
+        end
+        return cursor, results
+    end
+end
+
 local function multiple_argument_parser(...)
     local parsers = {...}
     return function (cursor, arguments)
@@ -252,11 +266,56 @@ local function truncate_digest(configuration, timeline_id, capacity)
     )
 end
 
-local function add_record_to_timeline(configuration, timeline_id, record_id, value, timestamp, delay_increment, delay_maximum, timeline_capacity, truncation_chance)
+local function compact_timeline(configuration, timeline_id, compaction_key, record_id)
+    -- Only the oldest and the newest of the records sharing a compaction key
+    -- are kept: the newest record is the one that is displayed, while the
+    -- oldest one bounds the time range of the digest. Any record in between
+    -- is removed from the timeline.
+    local timeline_key = configuration:get_timeline_key(timeline_id)
+    local index_key = configuration:get_timeline_compaction_index_key(timeline_id)
+    local oldest_field = 'o:' .. compaction_key
+    local newest_field = 'n:' .. compaction_key
+
+    local candidates = {}
+    local seen = {[record_id] = true}
+    for _, candidate_id in ipairs(redis.call('HMGET', index_key, oldest_field, newest_field)) do
+        -- Index entries of records which were truncated, or moved to the
+        -- digest set, are stale and can be ignored.
+        if candidate_id ~= false and not seen[candidate_id] then
+            seen[candidate_id] = true
+            local score = redis.call('ZSCORE', timeline_key, candidate_id)
+            if score ~= false then
+                table.insert(candidates, {candidate_id, tonumber(score), #candidates})
+            end
+        end
+    end
+    table.insert(candidates, {record_id, tonumber(redis.call('ZSCORE', timeline_key, record_id)), #candidates})
+
+    -- Ties are broken by insertion order, so the added record is the newest
+    -- of the records sharing its timestamp.
+    table.sort(candidates, function (a, b)
+        return a[2] < b[2] or (a[2] == b[2] and a[3] < b[3])
+    end)
+
+    for i = 2, #candidates - 1 do
+        local candidate_id = candidates[i][1]
+        redis.call('ZREM', timeline_key, candidate_id)
+        redis.call('DEL', configuration:get_timeline_record_key(timeline_id, candidate_id))
+    end
+
+    redis.call('HMSET', index_key, oldest_field, candidates[1][1], newest_field, candidates[#candidates][1])
+    redis.call('EXPIRE', index_key, configuration.ttl)
+end
+
+local function add_record_to_timeline(configuration, timeline_id, record_id, value, timestamp, delay_increment, delay_maximum, timeline_capacity, truncation_chance, compaction_key)
     redis.call('SETEX', configuration:get_timeline_record_key(timeline_id, record_id), configuration.ttl, value)
     redis.call('ZADD', configuration:get_timeline_key(timeline_id), timestamp, record_id)
     redis.call('EXPIRE', configuration:get_timeline_key(timeline_id), configuration.ttl)
 
+    if compaction_key ~= '' then
+        compact_timeline(configuration, timeline_id, compaction_key, record_id)
+    end
+
     local ready = add_timeline_to_schedule(configuration, timeline_id, timestamp, delay_increment, delay_maximum)
 
     if timeline_capacity > 0 and math.random() < truncation_chance then
@@ -292,6 +351,7 @@ local function digest_timeline(configuration, timeline_id, timeline_capacity)
             redis.call('RENAME', timeline_key, digest_key)
         end
         redis.call('EXPIRE', digest_key, configuration.ttl)
+        redis.call('DEL', configuration:get_timeline_compaction_index_key(timeline_id))
     end
 
     local results = {}
@@ -341,11 +401,51 @@ end
 local function delete_timeline(configuration, timeline_id)
     truncate_timeline(configuration, timeline_id, 0)
     truncate_digest(configuration, timeline_id, 0)
+    redis.call('DEL', configuration:get_timeline_compaction_index_key(timeline_id))
     redis.call('DEL', configuration:get_timeline_last_processed_timestamp_key(timeline_id))
     redis.call('ZREM', configuration:get_schedule_ready_key(), timeline_id)
     redis.call('ZREM', configuration:get_schedule_waiting_key(), timeline_id)
 end
 
+local function acquire_timeline_lock(configuration, lock, timeline_id)
+    return redis.call('SET', lock:get_key(configuration, timeline_id), lock.token, 'EX', lock.duration, 'NX') ~= false
+end
+
+local function release_timeline_lock(configuration, lock, timeline_id)
+    local lock_key = lock:get_key(configuration, timeline_id)
+    if redis.call('GET', lock_key) == lock.token then
+        redis.call('DEL', lock_key)
+    end
+end
+
+local function digest_timelines(configuration, lock, timeline_capacity, timeline_ids)
+    -- Timelines that are locked by another digest or that are not in the
+    -- ready state are skipped, rather than causing the entire batch to fail.
+    local response = {}
+    local i = 0
+    for _, timeline_id in ipairs(timeline_ids) do
+        if acquire_timeline_lock(configuration, lock, timeline_id) then
+            if redis.call('ZSCORE', configuration:get_schedule_ready_key(), timeline_id) == false then
+                release_timeline_lock(configuration, lock, timeline_id)
+            else
+                i = i + 1
+                response[i] = {
+                    timeline_id,
+                    digest_timeline(configuration, timeline_id, timeline_capacity),
+                }
+            end
+        end
+    end
+    return response
+end
+
+local function close_digests(configuration, lock, delay_minimum, digests)
+    for _, digest in ipairs(digests) do
+        close_digest(configuration, digest.timeline_id, delay_minimum, digest.record_ids)
+        release_timeline_lock(configuration, lock, digest.timeline_id)
+    end
+end
+
 
 -- Command Execution
 
@@ -380,9 +480,27 @@ local configuration_argument_parser = object_argument_parser({
         return string.format('%s:t:%s:r:%s', self.namespace, timeline_id, record_id)
     end
 
+    function configuration:get_timeline_compaction_index_key(timeline_id)
+        return string.format('%s:t:%s:c', self.namespace, timeline_id)
+    end
+
     return configuration
 end)
 
+-- Locks are compatible with the ones taken by the lock manager, so that bulk
+-- operations are mutually exclusive with operations on a single timeline.
+local lock_argument_parser = object_argument_parser({
+    {"prefix", argument_parser()},
+    {"token", argument_parser()},
+    {"duration", argument_parser(tonumber)},
+}, function (lock)
+    function lock:get_key(configuration, timeline_id)
+        return string.format('%s%s', self.prefix, configuration:get_timeline_key(timeline_id))
+    end
+
+    return lock
+end)
+
 local commands = {
     SCHEDULE = function (cursor, arguments)
         local cursor, configuration, deadline = multiple_argument_parser(
@@ -410,6 +528,7 @@ local commands = {
                 {"delay_maximum", argument_parser(tonumber)},
                 {"timeline_capacity", argument_parser(tonumber)},
                 {"truncation_chance", argument_parser(tonumber)},
+                {"compaction_key", argument_parser()},
             })
         )(cursor, arguments)
         return add_record_to_timeline(
@@ -421,7 +540,8 @@ local commands = {
             arguments.delay_increment,
             arguments.delay_maximum,
             arguments.timeline_capacity,
-            arguments.truncation_chance
+            arguments.truncation_chance,
+            arguments.compaction_key
         )
     end,
     DELETE = function (cursor, arguments)
@@ -448,6 +568,29 @@ local commands = {
         )(cursor, arguments)
         return close_digest(configuration, timeline_id, delay_minimum, record_ids)
     end,
+    DIGEST_OPEN_MANY = function (cursor, arguments)
+        local cursor, configuration, lock, timeline_capacity, timeline_ids = multiple_argument_parser(
+            configuration_argument_parser,
+            lock_argument_parser,
+            argument_parser(tonumber),
+            variadic_argument_parser(argument_parser())
+        )(cursor, arguments)
+        return digest_timelines(configuration, lock, timeline_capacity, timeline_ids)
+    end,
+    DIGEST_CLOSE_MANY = function (cursor, arguments)
+        local cursor, configuration, lock, delay_minimum, digests = multiple_argument_parser(
+            configuration_argument_parser,
+            lock_argument_parser,
+            argument_parser(tonumber),
+            variadic_argument_parser(
+                object_argument_parser({
+                    {"timeline_id", argument_parser()},
+                    {"record_ids", counted_argument_parser(argument_parser())},
+                })
+            )
+        )(cursor, arguments)
+        return close_digests(configuration, lock, delay_minimum, digests)
+    end,
 }
 
 local cursor, command = argument_parser(
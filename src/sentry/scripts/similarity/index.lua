@@ -605,6 +605,21 @@ local function search(configuration, parameters, limit)
 end
 
 
+local function record_signatures(configuration, key, signatures)
+    return table_imap(
+        signatures,
+        function (signature)
+            set_frequencies(configuration, signature.index, key, signature.frequencies)
+            for band, buckets in ipairs(signature.frequencies) do
+                for bucket in pairs(buckets) do
+                    get_bucket_membership_set(configuration, signature.index, band, bucket):add(key)
+                end
+            end
+        end
+    )
+end
+
+
 -- Command Parsing
 
 local commands = {
@@ -619,15 +634,32 @@ local commands = {
             )
         )(cursor, arguments)
 
+        return record_signatures(configuration, key, signatures)
+    end,
+    RECORD_MANY = function (configuration, cursor, arguments)
+        --[[
+        Records the signatures of multiple keys at once, every key is followed
+        by the timestamp to record its signatures at, and the number of
+        signatures recorded for it.
+        ]]--
+        local cursor, records = variadic_argument_parser(
+            object_argument_parser({
+                {"key", argument_parser(validate_value)},
+                {"timestamp", argument_parser(validate_number)},
+                {"signatures", repeated_argument_parser(
+                    object_argument_parser({
+                        {"index", argument_parser(validate_value)},
+                        {"frequencies", frequencies_argument_parser(configuration)},
+                    })
+                )},
+            })
+        )(cursor, arguments)
+
         return table_imap(
-            signatures,
-            function (signature)
-                set_frequencies(configuration, signature.index, key, signature.frequencies)
-                for band, buckets in ipairs(signature.frequencies) do
-                    for bucket in pairs(buckets) do
-                        get_bucket_membership_set(configuration, signature.index, band, bucket):add(key)
-                    end
-                end
+            records,
+            function (record)
+                configuration.timestamp = record.timestamp
+                return record_signatures(configuration, record.key, record.signatures)
             end
         )
     end,
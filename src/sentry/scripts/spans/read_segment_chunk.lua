@@ -0,0 +1,17 @@
+-- Read a chunk of spans from a segment and delete the segment once its last
+-- chunk was read. Both happen atomically, so a span pushed concurrently is
+-- either part of a chunk read by the caller or pushed to a new key, which
+-- registers the segment again.
+assert(#KEYS == 1, "provide exactly one segment key")
+assert(#ARGV == 2, "provide a start offset and a chunk size")
+
+local key = KEYS[1]
+local start = tonumber(ARGV[1])
+local chunk_size = tonumber(ARGV[2])
+
+local spans = redis.call("LRANGE", key, start, start + chunk_size - 1)
+if #spans < chunk_size then
+    redis.call("DEL", key)
+end
+
+return spans
@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum, auto
 from hashlib import md5
-from math import floor
+from math import ceil, floor
 from typing import Any, TypedDict, cast
 
 import sentry_sdk
@@ -736,6 +736,33 @@ def trends_aggregation_impl(
             ]
 
 
+# How many more groups than estimated to read from Snuba in the first chunk of a planned query
+PLANNED_CHUNK_HEADROOM = 1.2
+
+
+class QueryPlan(Enum):
+    # Pass the groups matching the Postgres filters down to a single Snuba query
+    POSTGRES_FIRST = "postgres_first"
+    # Query Snuba in growing chunks and post-filter every chunk in Postgres
+    SNUBA_FIRST = "snuba_first"
+    # Run a single Snuba query joined with the group attributes
+    JOINED = "joined"
+
+
+@dataclass
+class SelectivityEstimate:
+    # The number of groups matching the Snuba filters
+    snuba_total: int
+    # The share of those groups that match the Postgres filters as well
+    hit_ratio: float
+    # The groups matching both, when the sample covered every group matching the Snuba filters
+    group_ids: list[int] | None = None
+
+    @property
+    def hits(self) -> int:
+        return int(self.hit_ratio * self.snuba_total)
+
+
 class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
     ISSUE_FIELD_NAME = "group_id"
 
@@ -923,24 +950,98 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         chunk_limit = limit
         offset = 0
         num_chunks = 0
-        hits = self.calculate_hits(
-            group_ids,
-            too_many_candidates,
-            sort_field,
-            projects,
-            retention_window_start,
-            group_queryset,
-            environments,
-            sort_by,
-            limit,
-            cursor,
-            count_hits,
-            paginator_options,
-            search_filters,
-            start,
-            end,
-            actor,
-        )
+        plan = QueryPlan.SNUBA_FIRST if too_many_candidates else QueryPlan.POSTGRES_FIRST
+        if too_many_candidates and options.get("snuba.search.planner.enabled"):
+            # Rather than paging through Snuba until enough groups pass the Postgres
+            # filters, estimate how selective both sides of the query are first and
+            # pick a plan from that. The estimate doubles as the hits of the query.
+            estimate = self.estimate_selectivity(
+                None,
+                sort_field,
+                projects,
+                group_queryset,
+                environments,
+                search_filters,
+                start,
+                end,
+                actor,
+            )
+            plan, expected_rows = self.plan_query(estimate, sort_by, limit, search_filters)
+            hits = estimate.hits if count_hits else None
+            self.logger.info(
+                "snuba.search.plan",
+                extra={
+                    "plan": plan.value,
+                    "organization_id": projects[0].organization_id,
+                    "sort_by": sort_by,
+                    "snuba_total": estimate.snuba_total,
+                    "hit_ratio": estimate.hit_ratio,
+                    "expected_rows": expected_rows,
+                },
+            )
+            metrics.incr("snuba.search.plan", tags={"plan": plan.value}, skip_internal=False)
+
+            if plan is QueryPlan.POSTGRES_FIRST:
+                assert estimate.group_ids is not None
+                if not estimate.group_ids:
+                    return self.empty_result
+                group_ids = estimate.group_ids
+                if count_hits:
+                    hits = len(group_ids)
+            elif plan is QueryPlan.JOINED:
+                try:
+                    paginator_results = GroupAttributesPostgresSnubaQueryExecutor().query(
+                        projects=projects,
+                        retention_window_start=retention_window_start,
+                        group_queryset=group_queryset,
+                        environments=environments,
+                        sort_by=sort_by,
+                        limit=limit,
+                        cursor=cursor,
+                        count_hits=count_hits,
+                        paginator_options=paginator_options,
+                        search_filters=search_filters,
+                        date_from=date_from,
+                        date_to=date_to,
+                        max_hits=max_hits,
+                        referrer=referrer,
+                        actor=actor,
+                        aggregate_kwargs=aggregate_kwargs,
+                    )
+                except InvalidQueryForExecutor:
+                    self.logger.info("snuba.search.plan.joined_query_unsupported", exc_info=True)
+                    plan = QueryPlan.SNUBA_FIRST
+                else:
+                    metrics.timing(
+                        "snuba.search.query",
+                        (timezone.now() - now).total_seconds(),
+                        tags={"postgres_only": False, "plan": plan.value},
+                    )
+                    return paginator_results
+
+            if plan is QueryPlan.SNUBA_FIRST:
+                # Size the first chunk so that it's expected to fill the page on its own,
+                # with some headroom for the error of the estimate.
+                chunk_limit = max(limit, int(expected_rows * PLANNED_CHUNK_HEADROOM / chunk_growth))
+        else:
+            hits = self.calculate_hits(
+                group_ids,
+                too_many_candidates,
+                sort_field,
+                projects,
+                retention_window_start,
+                group_queryset,
+                environments,
+                sort_by,
+                limit,
+                cursor,
+                count_hits,
+                paginator_options,
+                search_filters,
+                start,
+                end,
+                actor,
+            )
         if count_hits and hits == 0:
             return self.empty_result
 
@@ -1061,7 +1162,7 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         metrics.timing(
             "snuba.search.query",
             (timezone.now() - now).total_seconds(),
-            tags={"postgres_only": False},
+            tags={"postgres_only": False, "plan": plan.value},
         )
         return paginator_results
 
@@ -1124,38 +1225,102 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             # requires the most samples) we would need 96 samples to achieve
             # +/-10% @ 95% confidence.
 
-            sample_size = options.get("snuba.search.hits-sample-size")
-            kwargs = dict(
-                start=start,
-                end=end,
-                project_ids=[p.id for p in projects],
-                environment_ids=environments and [environment.id for environment in environments],
-                organization=projects[0].organization,
-                sort_field=sort_field,
-                limit=sample_size,
-                offset=0,
-                get_sample=True,
-                search_filters=search_filters,
-                actor=actor,
+            estimate = self.estimate_selectivity(
+                None if too_many_candidates else group_ids,
+                sort_field,
+                projects,
+                group_queryset,
+                environments,
+                search_filters,
+                start,
+                end,
+                actor,
             )
-            if not too_many_candidates:
-                kwargs["group_ids"] = group_ids
-
-            snuba_groups, snuba_total = self.snuba_search(**kwargs)
-            snuba_count = len(snuba_groups)
-            if snuba_count == 0:
-                # Maybe check for 0 hits and return EMPTY_RESULT in ::query? self.empty_result
-                return 0
-            else:
-                filtered_count = group_queryset.filter(
-                    id__in=[gid for gid, _ in snuba_groups]
-                ).count()
-
-                hit_ratio = filtered_count / float(snuba_count)
-                hits = int(hit_ratio * snuba_total)
-                return hits
+            return estimate.hits
         return None
 
+    def estimate_selectivity(
+        self,
+        group_ids: Sequence[int] | None,
+        sort_field: str,
+        projects: Sequence[Project],
+        group_queryset: Query,
+        environments: Sequence[Environment] | None,
+        search_filters: Sequence[SearchFilter] | None,
+        start: datetime,
+        end: datetime,
+        actor: Any | None = None,
+    ) -> SelectivityEstimate:
+        """
+        Estimates how many groups match the Snuba side of the query, and which share of
+        them match the Postgres side as well, from a sample of the groups matching the
+        Snuba side (see `calculate_hits`).
+        """
+        sample_size = options.get("snuba.search.hits-sample-size")
+        snuba_groups, snuba_total = self.snuba_search(
+            start=start,
+            end=end,
+            project_ids=[p.id for p in projects],
+            environment_ids=environments and [environment.id for environment in environments],
+            organization=projects[0].organization,
+            sort_field=sort_field,
+            group_ids=group_ids,
+            limit=sample_size,
+            offset=0,
+            get_sample=True,
+            search_filters=search_filters,
+            actor=actor,
+        )
+        snuba_count = len(snuba_groups)
+        if snuba_count == 0:
+            return SelectivityEstimate(snuba_total=0, hit_ratio=0.0, group_ids=[])
+
+        filtered_group_ids = list(
+            group_queryset.filter(id__in=[gid for gid, _ in snuba_groups]).values_list(
+                "id", flat=True
+            )
+        )
+        return SelectivityEstimate(
+            snuba_total=snuba_total,
+            hit_ratio=len(filtered_group_ids) / float(snuba_count),
+            # The sample holds every matching group when there are fewer than `sample_size`
+            group_ids=filtered_group_ids if snuba_count >= snuba_total else None,
+        )
+
+    def plan_query(
+        self,
+        estimate: SelectivityEstimate,
+        sort_by: str,
+        limit: int,
+        search_filters: Sequence[SearchFilter] | None,
+    ) -> tuple[QueryPlan, int]:
+        """
+        Picks how to run a query whose Postgres filters match too many groups to pass
+        them down to Snuba. Returns the plan and the number of groups expected to be
+        read from Snuba to fill a page of results.
+        """
+        if estimate.group_ids is not None:
+            # Every group matching the query is known already, they only need sorting
+            return QueryPlan.POSTGRES_FIRST, len(estimate.group_ids)
+
+        if estimate.hit_ratio:
+            expected_rows = min(ceil(limit / estimate.hit_ratio), estimate.snuba_total)
+        else:
+            # Matches are too rare to show up in the sample, expect to read all of Snuba's
+            expected_rows = estimate.snuba_total
+
+        max_chunk_size = options.get("snuba.search.max-chunk-size")
+        joined_min_chunks = options.get("snuba.search.planner.joined-query-min-chunks")
+        if (
+            joined_min_chunks
+            and ceil(expected_rows / max_chunk_size) >= joined_min_chunks
+            # The joined query can't apply these filters, nor sort by anything else
+            and sort_by in GroupAttributesPostgresSnubaQueryExecutor.sort_strategies
+            and not any(sf.key.name in POSTGRES_ONLY_SEARCH_FIELDS for sf in search_filters or ())
+        ):
+            return QueryPlan.JOINED, expected_rows
+        return QueryPlan.SNUBA_FIRST, expected_rows
+
 
 class InvalidQueryForExecutor(Exception):
     pass
@@ -374,10 +374,12 @@ class UseCaseKeyResults:
 
         new_results = UseCaseKeyResults()
 
-        new_results.results = {
-            use_case_id: merge_use_case(use_case_id)
-            for use_case_id in set(self.results.keys()) | set(other.results.keys())
-        }
+        new_results.results.update(
+            {
+                use_case_id: merge_use_case(use_case_id)
+                for use_case_id in set(self.results.keys()) | set(other.results.keys())
+            }
+        )
 
         return new_results
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import random
+from collections import Counter
 from collections.abc import Collection, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timedelta
 
@@ -19,6 +20,7 @@ from sentry.sentry_metrics.indexer.base import (
     metric_path_key_compatible_resolve,
     metric_path_key_compatible_rev_resolve,
 )
+from sentry.sentry_metrics.indexer.local_cache import TinyLFUCache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.utils import metrics
 from sentry.utils.hashlib import md5_text
@@ -34,6 +36,9 @@ _INDEXER_CACHE_DOUBLE_WRITE_METRIC = "sentry_metrics.indexer.memcache.double-wri
 _INDEXER_CACHE_DOUBLE_READ_METRIC = "sentry_metrics.indexer.memcache.new-schema-read"
 _INDEXER_CACHE_STALE_KEYS_METRIC = "sentry_metrics.indexer.memcache.stale-keys"
 
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+_INDEXER_LOCAL_CACHE_HIT_RATIO_METRIC = "sentry_metrics.indexer.local_cache.hit_ratio"
+
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
 
@@ -44,6 +49,8 @@ NAMESPACED_READ_FEAT_FLAG = "sentry-metrics.indexer.read-new-cache-namespace"
 BULK_RECORD_CACHE_NAMESPACE = "br"
 RESOLVE_CACHE_NAMESPACE = "res"
 
+LOCAL_CACHE_MAX_SIZE_OPTION = "sentry-metrics.indexer.local-cache.max-size"
+
 
 class StringIndexerCache:
     def __init__(self, cache_name: str, partition_key: str):
@@ -209,6 +216,54 @@ class CachingIndexer(StringIndexer):
     def __init__(self, cache: StringIndexerCache, indexer: StringIndexer) -> None:
         self.cache = cache
         self.indexer = indexer
+        self._local_cache: TinyLFUCache | None = None
+
+    def _get_local_cache(self) -> TinyLFUCache | None:
+        """
+        The process-local cache in front of `self.cache`, which holds
+        "use_case_id:org_id:string" keys to look up ids and
+        (use_case_id, org_id, id) keys to reverse resolve them.
+        """
+        max_size = options.get(LOCAL_CACHE_MAX_SIZE_OPTION)
+        if max_size <= 0:
+            self._local_cache = None
+        elif self._local_cache is None or self._local_cache.max_size != max_size:
+            self._local_cache = TinyLFUCache(max_size)
+        return self._local_cache
+
+    def _record_local_cache_lookup(self, use_case_id: str, caller: str, hit: bool) -> None:
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": str(hit).lower(), "caller": caller, "use_case": use_case_id},
+        )
+
+    def _record_local_cache_hit_ratio(
+        self, keys: Sequence[str], local_results: Mapping[str, int]
+    ) -> None:
+        lookups: Counter[str] = Counter()
+        hits: Counter[str] = Counter()
+        for key in keys:
+            use_case_id = key.split(":", 1)[0]
+            lookups[use_case_id] += 1
+            if key in local_results:
+                hits[use_case_id] += 1
+
+        for use_case_id, count in lookups.items():
+            metrics.incr(
+                _INDEXER_LOCAL_CACHE_METRIC,
+                tags={"cache_hit": "true", "caller": "bulk_record", "use_case": use_case_id},
+                amount=hits[use_case_id],
+            )
+            metrics.incr(
+                _INDEXER_LOCAL_CACHE_METRIC,
+                tags={"cache_hit": "false", "caller": "bulk_record", "use_case": use_case_id},
+                amount=count - hits[use_case_id],
+            )
+            metrics.distribution(
+                _INDEXER_LOCAL_CACHE_HIT_RATIO_METRIC,
+                hits[use_case_id] / count,
+                tags={"use_case": use_case_id},
+            )
 
     def bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]]
@@ -216,7 +271,17 @@ class CachingIndexer(StringIndexer):
         cache_keys = UseCaseKeyCollection(strings)
         metrics.gauge("sentry_metrics.indexer.lookups_per_batch", value=cache_keys.size)
         cache_key_strs = cache_keys.as_strings()
-        cache_results = self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, cache_key_strs)
+
+        local_cache = self._get_local_cache()
+        local_results: Mapping[str, int] = {}
+        if local_cache is not None:
+            local_results = local_cache.get_many(cache_key_strs)
+            self._record_local_cache_hit_ratio(cache_key_strs, local_results)
+            cache_key_strs = [k for k in cache_key_strs if k not in local_results]
+
+        cache_results: Mapping[str, int | None] = {}
+        if cache_key_strs:
+            cache_results = self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, cache_key_strs)
 
         hits = [k for k, v in cache_results.items() if v is not None]
 
@@ -238,9 +303,16 @@ class CachingIndexer(StringIndexer):
             amount=cache_keys.size,
         )
 
+        cache_hits = {k: v for k, v in cache_results.items() if v is not None}
+        if local_cache is not None and cache_hits:
+            local_cache.set_many(cache_hits, timeout=self.cache.randomized_ttl)
+
         cache_key_results = UseCaseKeyResults()
         cache_key_results.add_use_case_key_results(
-            [UseCaseKeyResult.from_string(k, v) for k, v in cache_results.items() if v is not None],
+            [
+                UseCaseKeyResult.from_string(k, v)
+                for k, v in (*local_results.items(), *cache_hits.items())
+            ],
             FetchType.CACHE_HIT,
         )
 
@@ -256,9 +328,10 @@ class CachingIndexer(StringIndexer):
             }
         )
 
-        self.cache.set_many(
-            BULK_RECORD_CACHE_NAMESPACE, db_record_key_results.get_mapped_strings_to_ints()
-        )
+        db_record_strings_to_ints = db_record_key_results.get_mapped_strings_to_ints()
+        self.cache.set_many(BULK_RECORD_CACHE_NAMESPACE, db_record_strings_to_ints)
+        if local_cache is not None:
+            local_cache.set_many(db_record_strings_to_ints, timeout=self.cache.randomized_ttl)
 
         return cache_key_results.merge(db_record_key_results)
 
@@ -269,6 +342,14 @@ class CachingIndexer(StringIndexer):
     @metric_path_key_compatible_resolve
     def resolve(self, use_case_id: UseCaseID, org_id: int, string: str) -> int | None:
         key = f"{use_case_id.value}:{org_id}:{string}"
+
+        local_cache = self._get_local_cache()
+        if local_cache is not None:
+            result = local_cache.get(key)
+            self._record_local_cache_lookup(use_case_id.value, "resolve", result is not None)
+            if result is not None:
+                return result
+
         result = self.cache.get(RESOLVE_CACHE_NAMESPACE, key)
 
         if result and isinstance(result, int):
@@ -276,10 +357,14 @@ class CachingIndexer(StringIndexer):
                 _INDEXER_CACHE_RESOLVE_METRIC,
                 tags={"cache_hit": "true", "use_case": use_case_id.value},
             )
+            if local_cache is not None:
+                local_cache.set(key, result, timeout=self.cache.randomized_ttl)
             return result
 
         id = self.indexer.resolve(use_case_id, org_id, string)
         if id is not None:
+            if local_cache is not None:
+                local_cache.set(key, id, timeout=self.cache.randomized_ttl)
             metrics.incr(
                 _INDEXER_CACHE_RESOLVE_METRIC,
                 tags={"cache_hit": "false", "use_case": use_case_id.value},
@@ -298,7 +383,20 @@ class CachingIndexer(StringIndexer):
 
     @metric_path_key_compatible_rev_resolve
     def reverse_resolve(self, use_case_id: UseCaseID, org_id: int, id: int) -> str | None:
-        return self.indexer.reverse_resolve(use_case_id, org_id, id)
+        local_cache = self._get_local_cache()
+        if local_cache is None:
+            return self.indexer.reverse_resolve(use_case_id, org_id, id)
+
+        key = (use_case_id.value, org_id, id)
+        result = local_cache.get(key)
+        self._record_local_cache_lookup(use_case_id.value, "reverse_resolve", result is not None)
+        if result is not None:
+            return result
+
+        result = self.indexer.reverse_resolve(use_case_id, org_id, id)
+        if result is not None:
+            local_cache.set(key, result, timeout=self.cache.randomized_ttl)
+        return result
 
     def bulk_reverse_resolve(
         self, use_case_id: UseCaseID, org_id: int, ids: Collection[int]
@@ -74,8 +74,8 @@ class DroppedString:
 class RateLimitState:
     _writes_limiter: WritesLimiter
     _namespace: str
-    _requests: Sequence[RequestedQuota]
-    _grants: Sequence[GrantedQuota]
+    _batches: Sequence[Sequence[RequestedQuota]]
+    _grants: Sequence[Sequence[GrantedQuota]]
     _timestamp: Timestamp
 
     accepted_keys: UseCaseKeyCollection
@@ -92,7 +92,9 @@ class RateLimitState:
         if exc_type is not None:
             return
 
-        self._writes_limiter.rate_limiter.use_quotas(self._requests, self._grants, self._timestamp)
+        self._writes_limiter.rate_limiter.use_quotas_bulk(
+            self._batches, self._grants, self._timestamp
+        )
 
 
 class WritesLimiter:
@@ -125,28 +127,34 @@ class WritesLimiter:
     @metrics.wraps("sentry_metrics.indexer.construct_quota_requests")
     def _construct_quota_requests(
         self, keys: UseCaseKeyCollection
-    ) -> tuple[Sequence[UseCaseID], Sequence[OrgId], Sequence[RequestedQuota]]:
+    ) -> tuple[Sequence[UseCaseID], Sequence[OrgId], Sequence[Sequence[RequestedQuota]]]:
+        """
+        Build one batch of quota requests per use case, with one request per
+        org in it.
+        """
         use_case_ids = []
         org_ids = []
-        requests = []
+        batches = []
 
         for use_case_id, key_collection in keys.mapping.items():
             quotas = self._construct_quotas(use_case_id)
 
             if not quotas:
                 continue
+            batch = []
             for org_id, strings in key_collection.mapping.items():
                 use_case_ids.append(use_case_id)
                 org_ids.append(org_id)
-                requests.append(
+                batch.append(
                     RequestedQuota(
                         prefix=self._build_quota_key(use_case_id, org_id),
                         requested=len(strings),
                         quotas=quotas,
                     )
                 )
+            batches.append(batch)
 
-        return use_case_ids, org_ids, requests
+        return use_case_ids, org_ids, batches
 
     @metrics.wraps("sentry_metrics.indexer.check_write_limits")
     def check_write_limits(
@@ -166,8 +174,8 @@ class WritesLimiter:
         Upon (successful) exit, rate limits are consumed.
         """
 
-        use_case_ids, org_ids, requests = self._construct_quota_requests(use_case_keys)
-        timestamp, grants = self.rate_limiter.check_within_quotas(requests)
+        use_case_ids, org_ids, batches = self._construct_quota_requests(use_case_keys)
+        timestamp, grants = self.rate_limiter.check_within_quotas_bulk(batches)
 
         accepted_keys = {
             use_case_id: {org_id: strings for org_id, strings in key_collection.mapping.items()}
@@ -175,7 +183,8 @@ class WritesLimiter:
         }
         dropped_strings = []
 
-        for use_case_id, org_id, grant in zip(use_case_ids, org_ids, grants):
+        flat_grants = [grant for batch_grants in grants for grant in batch_grants]
+        for use_case_id, org_id, grant in zip(use_case_ids, org_ids, flat_grants):
             if len(accepted_keys[use_case_id][org_id]) <= grant.granted:
                 continue
 
@@ -204,7 +213,7 @@ class WritesLimiter:
         state = RateLimitState(
             _writes_limiter=self,
             _namespace=self.namespace,
-            _requests=requests,
+            _batches=batches,
             _grants=grants,
             _timestamp=timestamp,
             accepted_keys=UseCaseKeyCollection(accepted_keys),
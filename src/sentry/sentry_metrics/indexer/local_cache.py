@@ -0,0 +1,143 @@
+"""
+A process-local cache sitting in front of the shared indexer cache.
+
+Most metric buckets are tagged with the same few thousand strings, so keeping
+their ids in process saves a cache round trip for most lookups. To keep the
+cache from being flushed by one-off strings, new entries are only admitted
+when they are requested more often than the entry they would evict, as in
+TinyLFU (https://arxiv.org/abs/1512.00727). Access frequencies are estimated
+with a count-min sketch which is periodically halved, so that strings which
+stopped being used eventually lose their advantage.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Mapping, MutableMapping
+from typing import Any
+
+#: Counters of the frequency sketch saturate at this value
+MAX_FREQUENCY = 15
+
+#: Number of rows of the frequency sketch
+SKETCH_DEPTH = 4
+
+
+class FrequencySketch:
+    """
+    A count-min sketch of the access frequencies of recently requested keys.
+
+    After ``sample_size`` increments all counters are halved, so frequencies
+    are an estimate of how often a key was requested recently.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        width = 1
+        while width < max(max_size, 16):
+            width <<= 1
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in range(SKETCH_DEPTH)]
+        self._sample_size = 10 * max(max_size, 1)
+        self._additions = 0
+
+    def _indexes(self, key: Hashable) -> list[int]:
+        h = hash(key)
+        # Double hashing, the rows use different combinations of both halves
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        return [(h1 + i * h2) & self._mask for i in range(SKETCH_DEPTH)]
+
+    def increment(self, key: Hashable) -> None:
+        added = False
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < MAX_FREQUENCY:
+                row[index] += 1
+                added = True
+
+        if added:
+            self._additions += 1
+            if self._additions >= self._sample_size:
+                self._reset()
+
+    def frequency(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def _reset(self) -> None:
+        for row in self._rows:
+            for i, count in enumerate(row):
+                if count:
+                    row[i] = count >> 1
+        self._additions //= 2
+
+
+class TinyLFUCache:
+    """
+    A size-bounded LRU cache with frequency based admission and per entry
+    expiration.
+
+    Every lookup is counted in the frequency sketch, whether it hits or not.
+    When the cache is full, a new entry replaces the least recently used one
+    only if its key was requested more often.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._sketch = FrequencySketch(max_size)
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: Iterable[Hashable]) -> MutableMapping[Hashable, Any]:
+        """Returns the values of all keys that are cached and not expired."""
+        now = time.monotonic()
+        results: MutableMapping[Hashable, Any] = {}
+        with self._lock:
+            for key in keys:
+                self._sketch.increment(key)
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                results[key] = value
+        return results
+
+    def get(self, key: Hashable) -> Any | None:
+        return self.get_many((key,)).get(key)
+
+    def set_many(self, key_values: Mapping[Hashable, Any], timeout: int) -> None:
+        """
+        Caches the values for ``timeout`` seconds, new keys are only stored if
+        they pass admission.
+        """
+        expires_at = time.monotonic() + timeout
+        with self._lock:
+            for key, value in key_values.items():
+                if key in self._entries:
+                    self._entries[key] = (value, expires_at)
+                    self._entries.move_to_end(key)
+                    continue
+
+                if len(self._entries) >= self.max_size:
+                    if not self._entries:
+                        return
+                    victim = next(iter(self._entries))
+                    if self._sketch.frequency(key) <= self._sketch.frequency(victim):
+                        continue
+                    del self._entries[victim]
+
+                self._entries[key] = (value, expires_at)
+
+    def set(self, key: Hashable, value: Any, timeout: int) -> None:
+        self.set_many({key: value}, timeout)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -1,4 +1,6 @@
-from collections.abc import Collection, Mapping, Sequence
+from collections import defaultdict
+from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from functools import reduce
 from operator import or_
 from time import sleep
@@ -6,10 +8,12 @@ from typing import Any
 
 import sentry_sdk
 from django.conf import settings
+from django.db import close_old_connections
 from django.db.models import Q
 from psycopg2 import OperationalError
 from psycopg2.errorcodes import DEADLOCK_DETECTED
 
+from sentry import options
 from sentry.sentry_metrics.configuration import IndexerStorage, UseCaseKey, get_ingest_config
 from sentry.sentry_metrics.indexer.base import (
     FetchType,
@@ -36,6 +40,8 @@ _INDEXER_DB_METRIC = "sentry_metrics.indexer.postgres"
 
 _PARTITION_KEY = "pg"
 
+PARALLEL_WORKERS_OPTION = "sentry-metrics.indexer.postgres.parallel-workers"
+
 indexer_cache = StringIndexerCache(
     **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, partition_key=_PARTITION_KEY
 )
@@ -47,6 +53,10 @@ class PGStringIndexerV2(StringIndexer):
     and the corresponding reverse lookup.
     """
 
+    def __init__(self) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_workers = 0
+
     def _get_db_records(self, db_use_case_keys: UseCaseKeyCollection) -> Any:
         """
         The order of operations for our changes needs to be:
@@ -115,29 +125,63 @@ class PGStringIndexerV2(StringIndexer):
             assert isinstance(last_seen_exception, BaseException)
             raise last_seen_exception
 
-    def _bulk_record(
-        self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]]
+    def _fetch_records(
+        self, keys: UseCaseKeyCollection, fetch_type: FetchType
     ) -> UseCaseKeyResults:
-        metric_path_key = self._get_metric_path_key(strings.keys())
-
-        db_read_keys = UseCaseKeyCollection(strings)
-
-        db_read_key_results = UseCaseKeyResults()
-        db_read_key_results.add_use_case_key_results(
+        metric_path_key = self._get_metric_path_key(keys.mapping.keys())
+        results = UseCaseKeyResults()
+        results.add_use_case_key_results(
             [
                 UseCaseKeyResult(
                     use_case_id=(
-                        UseCaseID(db_obj.use_case_id)
-                        if self._get_metric_path_key(strings.keys()) is UseCaseKey.PERFORMANCE
-                        else UseCaseID.SESSIONS
+                        UseCaseID.SESSIONS
+                        if metric_path_key is UseCaseKey.RELEASE_HEALTH
+                        else UseCaseID(db_obj.use_case_id)
                     ),
                     org_id=db_obj.organization_id,
                     string=db_obj.string,
                     id=db_obj.id,
                 )
-                for db_obj in self._get_db_records(db_read_keys)
+                for db_obj in self._get_db_records(keys)
             ],
-            FetchType.DB_READ,
+            fetch_type,
+        )
+        return results
+
+    def _create_records(self, keys: UseCaseKeyCollection) -> UseCaseKeyResults:
+        metric_path_key = self._get_metric_path_key(keys.mapping.keys())
+        table = self._get_table_from_metric_path_key(metric_path_key)
+
+        if metric_path_key is UseCaseKey.PERFORMANCE:
+            new_records = [
+                table(
+                    organization_id=int(organization_id),
+                    string=string,
+                    use_case_id=use_case_id.value,
+                )
+                for use_case_id, organization_id, string in keys.as_tuples()
+            ]
+        else:
+            new_records = [
+                table(
+                    organization_id=int(organization_id),
+                    string=string,
+                )
+                for _, organization_id, string in keys.as_tuples()
+            ]
+
+        self._bulk_create_with_retry(table, new_records)
+        return self._fetch_records(keys, FetchType.FIRST_SEEN)
+
+    def _bulk_record(
+        self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]], workers: int = 1
+    ) -> UseCaseKeyResults:
+        metric_path_key = self._get_metric_path_key(strings.keys())
+
+        db_read_keys = UseCaseKeyCollection(strings)
+
+        db_read_key_results = self._map_partitions(
+            lambda keys: self._fetch_records(keys, FetchType.DB_READ), db_read_keys, workers
         )
         db_write_keys = db_read_key_results.get_unmapped_use_case_keys(db_read_keys)
 
@@ -176,6 +220,8 @@ class PGStringIndexerV2(StringIndexer):
             }
         }
         """
+        # Write limits are checked and used for the whole batch at once, even
+        # when the writes themselves are spread over several workers.
         with writes_limiter.check_write_limits(db_write_keys) as writes_limiter_state:
             del db_write_keys
 
@@ -192,52 +238,92 @@ class PGStringIndexerV2(StringIndexer):
             if accepted_keys.size == 0:
                 return db_read_key_results.merge(rate_limited_key_results)
 
-            table = self._get_table_from_metric_path_key(metric_path_key)
+            db_write_key_results = self._map_partitions(
+                self._create_records, accepted_keys, workers
+            )
 
-            if metric_path_key is UseCaseKey.PERFORMANCE:
-                new_records = [
-                    table(
-                        organization_id=int(organization_id),
-                        string=string,
-                        use_case_id=use_case_id.value,
-                    )
-                    for use_case_id, organization_id, string in accepted_keys.as_tuples()
-                ]
-            else:
-                new_records = [
-                    table(
-                        organization_id=int(organization_id),
-                        string=string,
-                    )
-                    for _, organization_id, string in accepted_keys.as_tuples()
-                ]
+        return db_read_key_results.merge(db_write_key_results).merge(rate_limited_key_results)
 
-            self._bulk_create_with_retry(table, new_records)
+    def _get_executor(self, workers: int) -> ThreadPoolExecutor:
+        if self._executor is None or self._executor_workers != workers:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="metrics-indexer-postgres"
+            )
+            self._executor_workers = workers
+        return self._executor
 
-        db_write_key_results = UseCaseKeyResults()
-        db_write_key_results.add_use_case_key_results(
-            [
-                UseCaseKeyResult(
-                    use_case_id=(
-                        UseCaseID.SESSIONS
-                        if metric_path_key is UseCaseKey.RELEASE_HEALTH
-                        else UseCaseID(db_obj.use_case_id)
-                    ),
-                    org_id=db_obj.organization_id,
-                    string=db_obj.string,
-                    id=db_obj.id,
-                )
-                for db_obj in self._get_db_records(accepted_keys)
-            ],
-            fetch_type=FetchType.FIRST_SEEN,
-        )
+    def _partition_strings(
+        self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]], num_shards: int
+    ) -> Sequence[Mapping[UseCaseID, Mapping[OrgId, set[str]]]]:
+        """
+        Splits the strings by the table they are stored in and by org shard,
+        so that every partition can be looked up and written independently.
+        """
+        partitions: MutableMapping[
+            tuple[UseCaseKey, int], MutableMapping[UseCaseID, MutableMapping[OrgId, set[str]]]
+        ] = defaultdict(lambda: defaultdict(dict))
+        for use_case_id, org_strings in strings.items():
+            metric_path_key = METRIC_PATH_MAPPING[use_case_id]
+            for org_id, org_string_set in org_strings.items():
+                if org_string_set:
+                    shard = int(org_id) % num_shards
+                    partitions[(metric_path_key, shard)][use_case_id][org_id] = org_string_set
+        return list(partitions.values())
+
+    def _run_in_worker(
+        self,
+        func: Callable[[UseCaseKeyCollection], UseCaseKeyResults],
+        keys: UseCaseKeyCollection,
+    ) -> UseCaseKeyResults:
+        # Worker threads hold their own connection, which is recycled the
+        # same way Django recycles the connection of a request.
+        close_old_connections()
+        try:
+            return func(keys)
+        finally:
+            close_old_connections()
+
+    def _map_partitions(
+        self,
+        func: Callable[[UseCaseKeyCollection], UseCaseKeyResults],
+        keys: UseCaseKeyCollection,
+        workers: int,
+    ) -> UseCaseKeyResults:
+        """
+        Applies `func` to the keys. With more than one worker, the keys are
+        split with `_partition_strings` and `func` runs for every partition on
+        the executor. The results of the partitions are merged.
+        """
+        if workers > 1:
+            partitions = self._partition_strings(
+                {
+                    use_case_id: key_collection.mapping
+                    for use_case_id, key_collection in keys.mapping.items()
+                },
+                workers,
+            )
+            metrics.distribution(
+                "sentry_metrics.indexer.pg_bulk_record.partitions", len(partitions)
+            )
+            if len(partitions) > 1:
+                executor = self._get_executor(workers)
+                futures = [
+                    executor.submit(self._run_in_worker, func, UseCaseKeyCollection(partition))
+                    for partition in partitions
+                ]
+                results = UseCaseKeyResults()
+                for future in futures:
+                    results = results.merge(future.result())
+                return results
 
-        return db_read_key_results.merge(db_write_key_results).merge(rate_limited_key_results)
+        return func(keys)
 
     def bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]]
     ) -> UseCaseKeyResults:
-        return self._bulk_record(strings)
+        return self._bulk_record(strings, options.get(PARALLEL_WORKERS_OPTION))
 
     def record(self, use_case_id: UseCaseID, org_id: int, string: str) -> int | None:
         result = self.bulk_record(strings={use_case_id: {org_id: {string}}})
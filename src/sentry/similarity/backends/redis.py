@@ -40,6 +40,27 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
             arguments.extend([1, ",".join(str(b) for b in bucket), 1])
         return arguments
 
+    def _build_many_signature_arguments(self, feature_sets):
+        """
+        Builds the signature arguments of many feature sets, hashing every
+        distinct feature of the batch only once.
+        """
+        signatures = iter(
+            self.signature_builder.build_many([features for features in feature_sets if features])
+        )
+
+        results = []
+        for features in feature_sets:
+            if not features:
+                results.append([0] * self.bands)
+                continue
+
+            arguments = []
+            for bucket in band(self.bands, next(signatures)):
+                arguments.extend([1, ",".join(str(b) for b in bucket), 1])
+            results.append(arguments)
+        return results
+
     def __index(self, scope, args):
         # scope must be passed into the script call as a key to allow the
         # cluster client to determine what cluster the script should be
@@ -136,9 +157,51 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
             key,
         ]
 
-        for idx, features in items:
+        signature_arguments = self._build_many_signature_arguments(
+            [features for _, features in items]
+        )
+        for (idx, _), item_arguments in zip(items, signature_arguments):
             arguments.append(idx)
-            arguments.extend(self._build_signature_arguments(features))
+            arguments.extend(item_arguments)
+
+        return self.__index(scope, arguments)
+
+    def record_many(self, scope, records, timestamp=None):
+        """
+        Records the items of many keys with a single script call. ``records``
+        is a sequence of ``(key, items, timestamp)`` triples, with ``items``
+        as accepted by ``record``. Records without a timestamp are recorded at
+        ``timestamp``. The same key may be part of multiple records, which is
+        equivalent to calling ``record`` for each of them in order.
+        """
+        records = [(key, items, ts) for key, items, ts in records if items]
+        if not records:
+            return []  # nothing to do
+
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        arguments = [
+            "RECORD_MANY",
+            timestamp,
+            self.namespace,
+            self.bands,
+            self.interval,
+            self.retention,
+            self.candidate_set_limit,
+            scope,
+        ]
+
+        signature_arguments = iter(
+            self._build_many_signature_arguments(
+                [features for _, items, _ in records for _, features in items]
+            )
+        )
+        for key, items, ts in records:
+            arguments.extend([key, ts if ts is not None else timestamp, len(items)])
+            for idx, _ in items:
+                arguments.append(idx)
+                arguments.extend(next(signature_arguments))
 
         return self.__index(scope, arguments)
 
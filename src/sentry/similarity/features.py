@@ -92,6 +92,23 @@ class FeatureSet:
                 )
         return results
 
+    def __encode(self, event, label, features):
+        try:
+            return [self.encoder.dumps(feature) for feature in features]
+        except Exception as error:
+            log = (
+                logger.debug
+                if isinstance(error, self.expected_encoding_errors)
+                else functools.partial(logger.warning, exc_info=True)
+            )
+            log(
+                "Could not encode features from %r for %r due to error: %r",
+                event,
+                label,
+                error,
+            )
+            return None
+
     def record(self, events):
         if not events:
             return []
@@ -118,26 +135,48 @@ class FeatureSet:
                         self.__get_key(event.group) == key
                     ), "all events must be associated with the same group"
 
-                try:
-                    features = [self.encoder.dumps(feature) for feature in features]
-                except Exception as error:
-                    log = (
-                        logger.debug
-                        if isinstance(error, self.expected_encoding_errors)
-                        else functools.partial(logger.warning, exc_info=True)
-                    )
-                    log(
-                        "Could not encode features from %r for %r due to error: %r",
-                        event,
-                        label,
-                        error,
-                    )
-                else:
-                    if features:
-                        items.append((self.aliases[label], features))
+                features = self.__encode(event, label, features)
+                if features:
+                    items.append((self.aliases[label], features))
 
         return self.index.record(scope, key, items, timestamp=int(event.datetime.timestamp()))
 
+    def record_many(self, events):
+        """
+        Records events of many groups (of the same project) with a single
+        index call. This is equivalent to calling ``record`` for every event
+        on its own, in order.
+        """
+        if not events:
+            return []
+
+        scope = None
+
+        records = []
+        for event in events:
+            if not event.group_id:
+                continue
+
+            items = []
+            for label, features in self.extract(event).items():
+                if scope is None:
+                    scope = self.__get_scope(event.project)
+                else:
+                    assert (
+                        self.__get_scope(event.project) == scope
+                    ), "all events must be associated with the same project"
+
+                features = self.__encode(event, label, features)
+                if features:
+                    items.append((self.aliases[label], features))
+
+            if items:
+                records.append(
+                    (self.__get_key(event.group), items, int(event.datetime.timestamp()))
+                )
+
+        return self.index.record_many(scope, records)
+
     def classify(self, events, limit=None, thresholds=None):
         if not events:
             return []
@@ -158,24 +197,10 @@ class FeatureSet:
                         self.__get_scope(event.project) == scope
                     ), "all events must be associated with the same project"
 
-                try:
-                    features = [self.encoder.dumps(feature) for feature in features]
-                except Exception as error:
-                    log = (
-                        logger.debug
-                        if isinstance(error, self.expected_encoding_errors)
-                        else functools.partial(logger.warning, exc_info=True)
-                    )
-                    log(
-                        "Could not encode features from %r for %r due to error: %r",
-                        event,
-                        label,
-                        error,
-                    )
-                else:
-                    if features:
-                        items.append((self.aliases[label], thresholds.get(label, 0), features))
-                        labels.append(label)
+                features = self.__encode(event, label, features)
+                if features:
+                    items.append((self.aliases[label], thresholds.get(label, 0), features))
+                    labels.append(label)
 
         return [
             (int(key), dict(zip(labels, scores)))
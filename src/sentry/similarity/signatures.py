@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 
 import mmh3
 
@@ -15,3 +15,27 @@ class MinHashSignatureBuilder:
             min(mmh3.hash(feature, column) % self.rows for feature in features)
             for column in range(self.columns)
         ]
+
+    def build_many(self, feature_sets: Sequence[Iterable[str]]) -> list[list[int]]:
+        """
+        Builds the signatures of many (non-empty) feature sets at once. The
+        result is the same as calling the builder for every feature set, but
+        every distinct feature is only hashed once, no matter how many sets it
+        appears in.
+        """
+        hashes: dict[str, tuple[int, ...]] = {}
+        columns = range(self.columns)
+        rows = self.rows
+
+        signatures = []
+        for features in feature_sets:
+            vectors = []
+            for feature in features:
+                vector = hashes.get(feature)
+                if vector is None:
+                    vector = hashes[feature] = tuple(
+                        mmh3.hash(feature, column) % rows for column in columns
+                    )
+                vectors.append(vector)
+            signatures.append(list(map(min, zip(*vectors))))
+        return signatures
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import dataclasses
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping, Sequence
 from typing import NamedTuple
 
 import sentry_sdk
@@ -9,8 +9,11 @@ from django.conf import settings
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
 
 from sentry import options
-from sentry.utils import redis
+from sentry.utils import metrics, redis
 from sentry.utils.iterators import chunked
+from sentry.utils.redis import load_redis_script
+
+read_segment_chunk = load_redis_script("spans/read_segment_chunk.lua")
 
 
 @dataclasses.dataclass
@@ -129,6 +132,51 @@ class RedisSpansBuffer:
 
         return values
 
+    def iter_many_segments(
+        self, keys: Sequence[str], batch_size: int, chunk_size: int, max_bytes: int
+    ) -> Iterator[tuple[str, list[bytes] | None]]:
+        """
+        Streaming alternative to `read_and_expire_many_segments`. Yields `(key, spans)` for every
+        segment, reading the spans of a segment in chunks of at most `chunk_size`. The first chunks
+        of up to `batch_size` segments are fetched in a single pipeline.
+
+        Reading a segment stops as soon as its spans exceed `max_bytes`, and `None` is yielded
+        instead of its spans, so oversized segments are never loaded into memory in full.
+
+        A segment's key is deleted in the same script call which reads its last chunk, before the
+        segment is yielded. Spans pushed while a segment is being read are therefore either part of
+        a later chunk or pushed to a new key, which registers the segment again.
+        """
+        for batch in chunked(keys, batch_size):
+            with self.client.pipeline() as p:
+                for key in batch:
+                    # Scripts aren't loaded by cluster pipelines, so the source is sent along.
+                    p.eval(read_segment_chunk.script, 1, key, 0, chunk_size)
+                first_chunks = p.execute()
+
+            for key, chunk in zip(batch, first_chunks):
+                spans: list[bytes] = list(chunk)
+                size = sum(len(span) for span in chunk)
+                while len(chunk) == chunk_size and size <= max_bytes:
+                    chunk = read_segment_chunk([key], [len(spans), chunk_size], self.client)
+                    spans.extend(chunk)
+                    size += sum(len(span) for span in chunk)
+
+                if len(chunk) == chunk_size:
+                    # Oversized segments are dropped without reading their remaining chunks.
+                    self.client.delete(key)
+
+                if not spans:
+                    continue
+
+                metrics.distribution("spans.buffer.segment.bytes", size, unit="byte")
+                if size > max_bytes:
+                    metrics.incr("spans.buffer.segment.max_bytes_exceeded")
+                    yield key, None
+                else:
+                    metrics.distribution("spans.buffer.segment.spans", len(spans))
+                    yield key, spans
+
     def get_unprocessed_segments_and_prune_bucket(self, now: int, partition: int) -> list[str]:
         key = get_unprocessed_segments_key(partition)
         results = self.client.lrange(key, 0, -1) or []
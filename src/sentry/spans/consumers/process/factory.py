@@ -1,7 +1,7 @@
 import dataclasses
 import logging
 from collections import defaultdict
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 from typing import Any
 
 import orjson
@@ -22,7 +22,13 @@ from sentry_kafka_schemas.schema_types.snuba_spans_v1 import SpanEvent
 from sentry import options
 from sentry.conf.types.kafka_definition import Topic, get_topic_codec
 from sentry.spans.buffer.redis import ProcessSegmentsContext, RedisSpansBuffer, SegmentKey
-from sentry.spans.consumers.process.strategy import CommitSpanOffsets, NoOp
+from sentry.spans.consumers.process.strategy import (
+    CommitSpanOffsets,
+    ExpandSegments,
+    NoOp,
+    OutstandingBytes,
+    ReleaseOutstandingBytes,
+)
 from sentry.utils import metrics
 from sentry.utils.arroyo import MultiprocessingPool, run_task_with_multiprocessing
 from sentry.utils.kafka_config import get_kafka_producer_cluster_options, get_topic_definition
@@ -33,6 +39,7 @@ SPANS_CODEC: Codec[SpanEvent] = get_topic_codec(Topic.SNUBA_SPANS)
 MAX_PAYLOAD_SIZE = 10 * 1000 * 1000  # 10 MB
 
 BATCH_SIZE = 100
+SEGMENT_CHUNK_SIZE = 500
 
 
 def in_process_spans_rollout_group(project_id: int | None) -> bool:
@@ -248,6 +255,50 @@ def expand_segments(should_process_segments: list[ProcessSegmentsContext]):
         return []
 
 
+def _iter_segment_payloads(
+    should_process_segments: list[ProcessSegmentsContext],
+) -> Iterator[KafkaPayload]:
+    for result in should_process_segments:
+        if not result.should_process_segments:
+            continue
+
+        client = RedisSpansBuffer()
+        keys = client.get_unprocessed_segments_and_prune_bucket(result.timestamp, result.partition)
+        metrics.distribution("spans.process.expand_segments.segments", len(keys))
+
+        # Segments are read in chunks and the payloads yielded one at a time, so that only the
+        # segment currently being assembled is held in memory.
+        for key, segment in client.iter_many_segments(
+            keys,
+            batch_size=BATCH_SIZE,
+            chunk_size=SEGMENT_CHUNK_SIZE,
+            max_bytes=MAX_PAYLOAD_SIZE,
+        ):
+            payload_data = prepare_buffered_segment_payload(segment) if segment else None
+            if payload_data is None or len(payload_data) > MAX_PAYLOAD_SIZE:
+                logger.warning(
+                    "Failed to produce message: max payload size exceeded.",
+                    extra={"segment_key": key},
+                )
+                metrics.incr("performance.buffered_segments.max_payload_size_exceeded")
+                continue
+
+            yield KafkaPayload(None, payload_data, [])
+
+
+def iter_segment_payloads(
+    should_process_segments: list[ProcessSegmentsContext],
+) -> Iterator[KafkaPayload]:
+    """
+    Streaming version of `expand_segments`, yielding the payload of each ready segment as soon as
+    it has been read from the buffer.
+    """
+    try:
+        yield from _iter_segment_payloads(should_process_segments)
+    except Exception:
+        sentry_sdk.capture_exception()
+
+
 class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
     """
     1. Process spans and push them to redis
@@ -287,15 +338,31 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         partitions: Mapping[Partition, int],
     ) -> ProcessingStrategy[KafkaPayload]:
 
-        produce_step = Produce(
-            producer=self.producer,
-            topic=self.output_topic,
-            next_step=NoOp(),
-        )
-
-        unfold_step = Unfold(generator=expand_segments, next_step=produce_step)
+        expand_step: ProcessingStrategy[Any]
+        if options.get("standalone-spans.expand-segments.streaming.enable"):
+            outstanding_bytes = OutstandingBytes()
+            produce_step = Produce(
+                producer=self.producer,
+                topic=self.output_topic,
+                next_step=ReleaseOutstandingBytes(outstanding_bytes),
+            )
+            expand_step = ExpandSegments(
+                generator=iter_segment_payloads,
+                next_step=produce_step,
+                outstanding_bytes=outstanding_bytes,
+                max_outstanding_bytes=options.get(
+                    "standalone-spans.expand-segments.max-outstanding-bytes"
+                ),
+            )
+        else:
+            produce_step = Produce(
+                producer=self.producer,
+                topic=self.output_topic,
+                next_step=NoOp(),
+            )
+            expand_step = Unfold(generator=expand_segments, next_step=produce_step)
 
-        commit_step = CommitSpanOffsets(commit=commit, next_step=unfold_step)
+        commit_step = CommitSpanOffsets(commit=commit, next_step=expand_step)
 
         batch_processor = RunTask(
             function=batch_write_to_redis,
@@ -1,10 +1,17 @@
-from typing import Any, Generic, TypeVar
+import time
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from typing import Any, Generic, TypeVar, Union, cast
 
-from arroyo.processing.strategies.abstract import ProcessingStrategy
+from arroyo.backends.kafka.consumer import KafkaPayload
+from arroyo.processing.strategies.abstract import MessageRejected, ProcessingStrategy
 from arroyo.processing.strategies.commit import CommitOffsets
-from arroyo.types import Commit, Message
+from arroyo.types import Commit, FilteredPayload, Message, Value
+
+from sentry.utils import metrics
 
 TPayload = TypeVar("TPayload")
+TInput = TypeVar("TInput")
 
 
 class CommitSpanOffsets(CommitOffsets, Generic[TPayload]):
@@ -56,3 +63,110 @@ class NoOp(ProcessingStrategy[Any]):
 
     def join(self, timeout: float | None = None) -> None:
         pass
+
+
+class OutstandingBytes:
+    """
+    The size of the segment payloads which were handed to the producer but haven't been produced
+    yet. Shared between `ExpandSegments` and the `ReleaseOutstandingBytes` step after the producer.
+    """
+
+    def __init__(self) -> None:
+        self.value = 0
+
+
+class ReleaseOutstandingBytes(NoOp):
+    """
+    Terminal step after the producer, which releases the bytes of every produced payload.
+    """
+
+    def __init__(self, outstanding_bytes: OutstandingBytes) -> None:
+        self.__outstanding_bytes = outstanding_bytes
+
+    def submit(self, message: Message[Any]) -> None:
+        if isinstance(message.payload, KafkaPayload):
+            self.__outstanding_bytes.value -= len(message.payload.value)
+
+
+class ExpandSegments(ProcessingStrategy[Union[FilteredPayload, TInput]], Generic[TInput]):
+    """
+    Like arroyo's `Unfold`, but the generator is consumed lazily. A payload is only pulled from the
+    generator (and thereby read from the buffer) once the previous one was accepted by the next
+    step, and only while the payloads which are still being produced stay below
+    `max_outstanding_bytes`. New messages are rejected until the current generator is exhausted,
+    which applies backpressure to the steps before this one.
+    """
+
+    def __init__(
+        self,
+        generator: Callable[[TInput], Iterable[KafkaPayload]],
+        next_step: ProcessingStrategy[Union[FilteredPayload, KafkaPayload]],
+        outstanding_bytes: OutstandingBytes,
+        max_outstanding_bytes: int,
+    ) -> None:
+        self.__generator = generator
+        self.__next_step = next_step
+        self.__outstanding_bytes = outstanding_bytes
+        self.__max_outstanding_bytes = max_outstanding_bytes
+        self.__closed = False
+
+        self.__payloads: Iterator[KafkaPayload] | None = None
+        self.__pending: KafkaPayload | None = None
+        self.__timestamp: datetime | None = None
+
+    def submit(self, message: Message[Union[FilteredPayload, TInput]]) -> None:
+        assert not self.__closed
+        if self.__payloads is not None or self.__pending is not None:
+            metrics.incr("spans.process.expand_segments.backpressure")
+            raise MessageRejected
+
+        if isinstance(message.payload, FilteredPayload):
+            self.__next_step.submit(cast(Message[Union[FilteredPayload, KafkaPayload]], message))
+            return
+
+        self.__payloads = iter(self.__generator(message.payload))
+        self.__timestamp = message.timestamp
+        self.__flush()
+
+    def __flush(self) -> None:
+        while self.__outstanding_bytes.value < self.__max_outstanding_bytes:
+            if self.__pending is None:
+                if self.__payloads is None:
+                    return
+                self.__pending = next(self.__payloads, None)
+                if self.__pending is None:
+                    self.__payloads = None
+                    return
+
+            try:
+                # Offsets are committed before segments are expanded, so none of the generated
+                # messages carry any.
+                self.__next_step.submit(Message(Value(self.__pending, {}, self.__timestamp)))
+            except MessageRejected:
+                return
+
+            self.__outstanding_bytes.value += len(self.__pending.value)
+            self.__pending = None
+
+    def poll(self) -> None:
+        self.__flush()
+        self.__next_step.poll()
+
+    def close(self) -> None:
+        self.__closed = True
+
+    def terminate(self) -> None:
+        self.__closed = True
+        self.__next_step.terminate()
+
+    def join(self, timeout: float | None = None) -> None:
+        deadline = time.time() + timeout if timeout is not None else None
+        while deadline is None or time.time() < deadline:
+            if self.__payloads is None and self.__pending is None:
+                break
+            self.poll()
+
+        self.__next_step.close()
+        self.__next_step.join(
+            timeout=max(deadline - time.time(), 0) if deadline is not None else None
+        )
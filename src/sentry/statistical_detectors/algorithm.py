@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Mapping, MutableMapping
+from collections.abc import Callable, Mapping, MutableMapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
@@ -100,6 +100,17 @@ class DetectorAlgorithm(ABC):
     ) -> tuple[TrendType, float, DetectorState | None]:
         ...
 
+    def update_many(
+        self,
+        raw_states: Sequence[Mapping[str | bytes, bytes | float | int | str]],
+        payloads: Sequence[DetectorPayload],
+    ) -> list[tuple[TrendType, float, DetectorState | None]]:
+        """
+        Updates the states of many payloads at once, the results are the
+        same as calling `update` for every payload.
+        """
+        return [self.update(raw_state, payload) for raw_state, payload in zip(raw_states, payloads)]
+
 
 class MovingAverageRelativeChangeDetector(DetectorAlgorithm):
     def __init__(
@@ -118,21 +129,19 @@ class MovingAverageRelativeChangeDetector(DetectorAlgorithm):
         self.moving_avg_long_factory = moving_avg_long_factory
         self.threshold = threshold
 
-    def update(
-        self,
-        raw_state: Mapping[str | bytes, bytes | float | int | str],
-        payload: DetectorPayload,
-    ) -> tuple[TrendType, float, DetectorState | None]:
+    def _load_state(
+        self, raw_state: Mapping[str | bytes, bytes | float | int | str]
+    ) -> MovingAverageDetectorState:
         try:
-            old = MovingAverageDetectorState.from_redis_dict(raw_state)
+            return MovingAverageDetectorState.from_redis_dict(raw_state)
         except Exception as e:
-            old = MovingAverageDetectorState.empty()
-
             if raw_state:
                 # empty raw state implies that there was no
                 # previous state so no need to capture an exception
                 sentry_sdk.capture_exception(e)
+            return MovingAverageDetectorState.empty()
 
+    def _is_out_of_order(self, old: MovingAverageDetectorState, payload: DetectorPayload) -> bool:
         if old.timestamp is not None and old.timestamp > payload.timestamp:
             # In the event that the timestamp is before the payload's timestamps,
             # we do not want to process this payload.
@@ -143,6 +152,17 @@ class MovingAverageRelativeChangeDetector(DetectorAlgorithm):
                 payload.timestamp.isoformat(),
                 old.timestamp.isoformat(),
             )
+            return True
+        return False
+
+    def update(
+        self,
+        raw_state: Mapping[str | bytes, bytes | float | int | str],
+        payload: DetectorPayload,
+    ) -> tuple[TrendType, float, DetectorState | None]:
+        old = self._load_state(raw_state)
+
+        if self._is_out_of_order(old, payload):
             return TrendType.Skipped, 0, None
 
         moving_avg_short = self.moving_avg_short_factory()
@@ -157,6 +177,54 @@ class MovingAverageRelativeChangeDetector(DetectorAlgorithm):
             moving_avg_long=moving_avg_long.update(old.count, old.moving_avg_long, payload.value),
         )
 
+        return self._detect_trend(old, new)
+
+    def update_many(
+        self,
+        raw_states: Sequence[Mapping[str | bytes, bytes | float | int | str]],
+        payloads: Sequence[DetectorPayload],
+    ) -> list[tuple[TrendType, float, DetectorState | None]]:
+        # Load all states into parallel columns, so that the moving averages
+        # of all payloads are updated in one pass each.
+        olds = []
+        columns = []
+        for raw_state, payload in zip(raw_states, payloads):
+            old = self._load_state(raw_state)
+            if self._is_out_of_order(old, payload):
+                olds.append(None)
+            else:
+                olds.append(old)
+                columns.append(old)
+
+        counts = [old.count for old in columns]
+        values = [payload.value for old, payload in zip(olds, payloads) if old is not None]
+        moving_avgs_short = self.moving_avg_short_factory().update_many(
+            counts, [old.moving_avg_short for old in columns], values
+        )
+        moving_avgs_long = self.moving_avg_long_factory().update_many(
+            counts, [old.moving_avg_long for old in columns], values
+        )
+
+        results: list[tuple[TrendType, float, DetectorState | None]] = []
+        updated = iter(zip(moving_avgs_short, moving_avgs_long))
+        for old, payload in zip(olds, payloads):
+            if old is None:
+                results.append((TrendType.Skipped, 0, None))
+                continue
+
+            moving_avg_short, moving_avg_long = next(updated)
+            new = MovingAverageDetectorState(
+                timestamp=payload.timestamp,
+                count=old.count + 1,
+                moving_avg_short=moving_avg_short,
+                moving_avg_long=moving_avg_long,
+            )
+            results.append(self._detect_trend(old, new))
+        return results
+
+    def _detect_trend(
+        self, old: MovingAverageDetectorState, new: MovingAverageDetectorState
+    ) -> tuple[TrendType, float, DetectorState | None]:
         # The heuristic isn't stable initially, so ensure we have a minimum
         # number of data points before looking for a regression.
         stablized = new.count > self.min_data_points
@@ -121,7 +121,9 @@ class RegressionDetector(ABC):
 
             states = []
 
-            for raw_state, payload in zip(raw_states, payloads):
+            for payload, (trend_type, score, new_state) in zip(
+                payloads, algorithm.update_many(raw_states, payloads)
+            ):
                 metrics.distribution(
                     "statistical_detectors.objects.throughput",
                     value=payload.count,
@@ -129,8 +131,6 @@ class RegressionDetector(ABC):
                 )
                 unique_project_ids.add(payload.project_id)
 
-                trend_type, score, new_state = algorithm.update(raw_state, payload)
-
                 if trend_type == TrendType.Regressed:
                     regressed_count += 1
                 elif trend_type == TrendType.Improved:
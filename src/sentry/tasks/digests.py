@@ -1,16 +1,20 @@
 import logging
 import time
+from collections import defaultdict
 from datetime import datetime
 
+from sentry import options
 from sentry.digests import get_option_key
 from sentry.digests.backends.base import InvalidState
-from sentry.digests.notifications import build_digest, split_key
+from sentry.digests.notifications import DigestInfo, build_digest, split_key
 from sentry.digests.types import Record
 from sentry.models.options.project_option import ProjectOption
 from sentry.models.project import Project
+from sentry.notifications.types import ActionTargetType, FallthroughChoiceType
 from sentry.silo.base import SiloMode
 from sentry.tasks.base import instrumented_task
 from sentry.utils import snuba
+from sentry.utils.iterators import chunked
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +40,12 @@ def schedule_digests() -> None:
     timeout = 300
     digests.backend.maintenance(deadline - timeout)
 
+    batch_size = options.get("digests.delivery.batch-size")
+    if batch_size > 0:
+        for entries in chunked(digests.backend.schedule(deadline), batch_size):
+            deliver_digests.delay([entry.key for entry in entries])
+        return
+
     for entry in digests.backend.schedule(deadline):
         deliver_digest.delay(entry.key, entry.timestamp)
 
@@ -51,7 +61,6 @@ def deliver_digest(
     notification_uuid: str | None = None,
 ) -> None:
     from sentry import digests
-    from sentry.mail import mail_adapter
 
     try:
         project, target_type, target_identifier, fallthrough_choice = split_key(key)
@@ -75,25 +84,107 @@ def deliver_digest(
             logger.info("Skipped digest delivery: %s", error, exc_info=True)
             return
 
-        if digest.digest:
-            mail_adapter.notify_digest(
-                project,
-                digest,
-                target_type,
-                target_identifier,
-                fallthrough_choice=fallthrough_choice,
-                notification_uuid=notification_uuid,
-            )
-        else:
-            logger.info(
-                "Skipped digest delivery due to empty digest",
-                extra={
-                    "project": project.id,
-                    "target_type": target_type.value,
-                    "target_identifier": target_identifier,
-                    "fallthrough_choice": fallthrough_choice.value if fallthrough_choice else None,
-                },
-            )
+        _notify_digest(
+            project,
+            digest,
+            target_type,
+            target_identifier,
+            fallthrough_choice,
+            notification_uuid,
+        )
+
+
+@instrumented_task(
+    name="sentry.tasks.digests.deliver_digests",
+    queue="digests.delivery",
+    silo_mode=SiloMode.REGION,
+)
+def deliver_digests(keys: list[str]) -> None:
+    """
+    Deliver the digests of many timelines, claiming them with a single call per
+    Redis host instead of one lock and script call per timeline.
+    """
+    from sentry import digests
+
+    targets = {}
+    keys_by_minimum_delay: dict[int, list[str]] = defaultdict(list)
+    for key in keys:
+        try:
+            targets[key] = split_key(key)
+        except Project.DoesNotExist as error:
+            logger.info("Cannot deliver digest %s due to error: %s", key, error)
+            digests.backend.delete(key)
+            continue
+
+        minimum_delay = ProjectOption.objects.get_value(
+            targets[key][0], get_option_key("mail", "minimum_delay")
+        )
+        keys_by_minimum_delay[minimum_delay].append(key)
+
+    with snuba.options_override({"consistent": True}):
+        for minimum_delay, delay_keys in keys_by_minimum_delay.items():
+            built: dict[str, tuple[DigestInfo, str | None]] = {}
+            with digests.backend.digest_many(
+                delay_keys, minimum_delay=minimum_delay
+            ) as records_by_key:
+                for key, records in list(records_by_key.items()):
+                    try:
+                        built[key] = (
+                            build_digest(targets[key][0], records),
+                            get_notification_uuid_from_records(records),
+                        )
+                    except Exception:
+                        logger.exception("Failed to build digest", extra={"key": key})
+                        # Removing the timeline leaves it unclosed, so it is
+                        # delivered again once it is rescheduled.
+                        del records_by_key[key]
+
+            # Digests which couldn't be closed are no longer part of the mapping.
+            for key in records_by_key:
+                project, target_type, target_identifier, fallthrough_choice = targets[key]
+                digest, notification_uuid = built[key]
+                try:
+                    _notify_digest(
+                        project,
+                        digest,
+                        target_type,
+                        target_identifier,
+                        fallthrough_choice,
+                        notification_uuid,
+                    )
+                except Exception:
+                    logger.exception("Failed to deliver digest", extra={"key": key})
+
+
+def _notify_digest(
+    project: Project,
+    digest: DigestInfo,
+    target_type: ActionTargetType,
+    target_identifier: str | None,
+    fallthrough_choice: FallthroughChoiceType | None,
+    notification_uuid: str | None,
+) -> None:
+    from sentry.mail import mail_adapter
+
+    if digest.digest:
+        mail_adapter.notify_digest(
+            project,
+            digest,
+            target_type,
+            target_identifier,
+            fallthrough_choice=fallthrough_choice,
+            notification_uuid=notification_uuid,
+        )
+    else:
+        logger.info(
+            "Skipped digest delivery due to empty digest",
+            extra={
+                "project": project.id,
+                "target_type": target_type.value,
+                "target_identifier": target_identifier,
+                "fallthrough_choice": fallthrough_choice.value if fallthrough_choice else None,
+            },
+        )
 
 
 def get_notification_uuid_from_records(records: list[Record]) -> str | None:
@@ -1220,7 +1220,7 @@ def process_similarity(job: PostProcessJob) -> None:
     event = job["event"]
 
     with sentry_sdk.start_span(op="tasks.post_process_group.similarity"):
-        safe_execute(similarity.record, event.project, [event])
+        safe_execute(similarity.record_many, event.project, [event])
 
 
 def fire_error_processed(job: PostProcessJob):
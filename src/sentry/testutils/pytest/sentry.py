@@ -367,6 +367,11 @@ def pytest_runtest_teardown(item: pytest.Item) -> None:
     ProjectOption.objects.clear_local_cache()
     UserOption.objects.clear_local_cache()
 
+    from sentry.api.event_search import parse_cache
+
+    # Parsed queries depend on the types of keys, which tests often mock
+    parse_cache.clear()
+
     sentry_sdk.Scope.get_global_scope().set_client(None)
 
 
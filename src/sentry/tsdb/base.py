@@ -1,4 +1,5 @@
-from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import Generator, Iterable, Mapping, Sequence
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, TypedDict, TypeVar
@@ -145,6 +146,7 @@ class BaseTSDB(Service):
     __all__ = (
         frozenset(
             [
+                "coalesce_writes",
                 "get_earliest_timestamp",
                 "get_optimal_rollup",
                 "get_optimal_rollup_series",
@@ -200,6 +202,15 @@ class BaseTSDB(Service):
     def get_rollups(self) -> dict[int, int]:
         return self.rollups
 
+    @contextmanager
+    def coalesce_writes(self) -> Generator[None, None, None]:
+        """
+        Buffer the counter and distinct counter writes made within the block,
+        and write them all at once when the block exits. Backends which don't
+        support this write immediately.
+        """
+        yield
+
     def normalize_to_epoch(self, timestamp: datetime, seconds: int) -> int:
         """
         Given a ``timestamp`` (datetime object) normalize to an epoch timestamp.
@@ -0,0 +1,157 @@
+"""
+Client side merging and counting of Redis HyperLogLogs.
+
+Redis stores a HyperLogLog as a string which can be fetched with ``GET``. The
+string consists of a 16 byte header followed by 2^14 6-bit registers, which
+are either stored as a dense bit array or with a run-length ("sparse")
+encoding. Merging HyperLogLogs means taking the maximum of every register, and
+the cardinality is estimated from the histogram of the merged registers, with
+the same estimator Redis uses for ``PFCOUNT``.
+
+See https://github.com/redis/redis/blob/unstable/src/hyperloglog.c for the
+reference implementation.
+"""
+
+from __future__ import annotations
+
+import math
+
+HLL_MAGIC = b"HYLL"
+HLL_HEADER_SIZE = 16
+HLL_DENSE = 0
+HLL_SPARSE = 1
+
+HLL_P = 14
+HLL_Q = 64 - HLL_P
+HLL_REGISTERS = 1 << HLL_P
+HLL_BITS = 6
+HLL_REGISTER_MAX = (1 << HLL_BITS) - 1
+HLL_DENSE_SIZE = HLL_HEADER_SIZE + (HLL_REGISTERS * HLL_BITS + 7) // 8
+HLL_ALPHA_INF = 0.721347520444481703680
+
+
+class InvalidHyperLogLog(ValueError):
+    pass
+
+
+def _sigma(x: float) -> float:
+    if x == 1.0:
+        return math.inf
+    y = 1.0
+    z = x
+    while True:
+        x *= x
+        z_prime = z
+        z += x * y
+        y += y
+        if z_prime == z:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y = 1.0
+    z = 1 - x
+    while True:
+        x = math.sqrt(x)
+        z_prime = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z_prime == z:
+            return z / 3
+
+
+class HyperLogLog:
+    """
+    A HyperLogLog which raw Redis HyperLogLogs can be merged into.
+
+    >>> hll = HyperLogLog()
+    >>> for value in client.mget(keys):
+    ...     if value is not None:
+    ...         hll.merge(value)
+    >>> hll.cardinality()
+    """
+
+    def __init__(self) -> None:
+        self.registers = bytearray(HLL_REGISTERS)
+
+    def merge(self, raw: bytes) -> None:
+        """Merge a HyperLogLog as returned by ``GET`` into this one."""
+        if len(raw) < HLL_HEADER_SIZE or raw[:4] != HLL_MAGIC:
+            raise InvalidHyperLogLog("Not a HyperLogLog")
+
+        encoding = raw[4]
+        if encoding == HLL_DENSE:
+            self._merge_dense(raw)
+        elif encoding == HLL_SPARSE:
+            self._merge_sparse(raw)
+        else:
+            raise InvalidHyperLogLog(f"Unknown HyperLogLog encoding: {encoding}")
+
+    def _merge_dense(self, raw: bytes) -> None:
+        if len(raw) != HLL_DENSE_SIZE:
+            raise InvalidHyperLogLog("Invalid dense HyperLogLog size")
+
+        registers = self.registers
+        # Every 3 bytes hold 4 registers, starting from the least significant bits
+        index = 0
+        for offset in range(HLL_HEADER_SIZE, HLL_DENSE_SIZE, 3):
+            packed = raw[offset] | raw[offset + 1] << 8 | raw[offset + 2] << 16
+            if packed:
+                for shift in (0, 6, 12, 18):
+                    value = (packed >> shift) & HLL_REGISTER_MAX
+                    if value > registers[index]:
+                        registers[index] = value
+                    index += 1
+            else:
+                index += 4
+
+    def _merge_sparse(self, raw: bytes) -> None:
+        registers = self.registers
+        index = 0
+        offset = HLL_HEADER_SIZE
+        end = len(raw)
+        while offset < end:
+            opcode = raw[offset]
+            if opcode & 0x80:
+                # VAL: 1vvvvvxx, `xx + 1` registers set to `vvvvv + 1`
+                value = ((opcode >> 2) & 0x1F) + 1
+                run = (opcode & 0x3) + 1
+                if index + run > HLL_REGISTERS:
+                    raise InvalidHyperLogLog("Sparse HyperLogLog exceeds register count")
+                for i in range(index, index + run):
+                    if value > registers[i]:
+                        registers[i] = value
+                offset += 1
+            elif opcode & 0x40:
+                # XZERO: 01xxxxxx yyyyyyyy, a run of up to 16384 zeroed registers
+                if offset + 1 >= end:
+                    raise InvalidHyperLogLog("Truncated sparse HyperLogLog")
+                run = (((opcode & 0x3F) << 8) | raw[offset + 1]) + 1
+                offset += 2
+            else:
+                # ZERO: 00xxxxxx, a run of up to 64 zeroed registers
+                run = (opcode & 0x3F) + 1
+                offset += 1
+            index += run
+
+        if index != HLL_REGISTERS:
+            raise InvalidHyperLogLog("Sparse HyperLogLog doesn't cover all registers")
+
+    def cardinality(self) -> int:
+        """Estimate the cardinality exactly the way ``PFCOUNT`` does."""
+        m = float(HLL_REGISTERS)
+        histogram = [self.registers.count(value) for value in range(HLL_Q + 2)]
+
+        z = m * _tau((m - histogram[HLL_Q + 1]) / m)
+        for j in range(HLL_Q, 0, -1):
+            z += histogram[j]
+            z *= 0.5
+        z += m * _sigma(histogram[0] / m)
+        return int(_round_half_away_from_zero(HLL_ALPHA_INF * m * m / z))
+
+
+def _round_half_away_from_zero(value: float) -> float:
+    # `llroundl`, as opposed to `round` which rounds half to even
+    return math.floor(value + 0.5)
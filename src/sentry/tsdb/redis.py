@@ -2,9 +2,11 @@ import binascii
 import itertools
 import logging
 import random
+import threading
 import uuid
 from collections import defaultdict, namedtuple
-from collections.abc import Callable, Iterable, Mapping, Sequence
+from collections.abc import Callable, Generator, Iterable, Mapping, Sequence
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from functools import reduce
 from hashlib import md5
@@ -15,7 +17,10 @@ from django.utils import timezone
 from django.utils.encoding import force_bytes
 from redis.client import Script
 
+from sentry import options
 from sentry.tsdb.base import BaseTSDB, IncrMultiOptions, TSDBItem, TSDBKey, TSDBModel
+from sentry.tsdb.hyperloglog import HyperLogLog
+from sentry.utils import metrics
 from sentry.utils.dates import to_datetime
 from sentry.utils.redis import (
     check_cluster_versions,
@@ -66,6 +71,56 @@ class SuppressionWrapper(Generic[T]):
         return True
 
 
+class PendingWrites:
+    """\
+    Counter and distinct counter writes buffered by
+    ``RedisTSDB.coalesce_writes``, for a single cluster.
+
+    Increments of the same hash field are summed up, and values added to the
+    same distinct counter are merged, so that every key is only written once
+    per flush.
+    """
+
+    def __init__(self) -> None:
+        # (hash_key, hash_field) -> count
+        self.counters: dict[tuple[str, str | int], int] = defaultdict(int)
+        # hash_key -> max expiration encountered
+        self.counter_expiries: dict[str, int] = {}
+        # (routing key, distinct counter key) -> values
+        self.distinct_counters: dict[tuple[int, str | int], set[str]] = defaultdict(set)
+        # distinct counter key -> max expiration encountered
+        self.distinct_counter_expiries: dict[str | int, int] = {}
+        #: Number of commands which would have been sent without coalescing
+        self.buffered_commands = 0
+
+    @property
+    def command_count(self) -> int:
+        return (
+            len(self.counters)
+            + len(self.counter_expiries)
+            + len(self.distinct_counters)
+            + len(self.distinct_counter_expiries)
+        )
+
+    def add_counters(
+        self, key_operations: Mapping[tuple[str, str | int], int], key_expiries: Mapping[str, int]
+    ) -> None:
+        for operation, count in key_operations.items():
+            self.counters[operation] += count
+        for hash_key, expiry in key_expiries.items():
+            if self.counter_expiries.get(hash_key, 0) < expiry:
+                self.counter_expiries[hash_key] = expiry
+        self.buffered_commands += len(key_operations) + len(key_expiries)
+
+    def add_distinct_counter(
+        self, routing_key: int, key: str | int, values: Iterable[str], expiry: int
+    ) -> None:
+        self.distinct_counters[(routing_key, key)].update(values)
+        if self.distinct_counter_expiries.get(key, 0) < expiry:
+            self.distinct_counter_expiries[key] = expiry
+        self.buffered_commands += 2
+
+
 class RedisTSDB(BaseTSDB):
     """
     A time series storage backend for Redis.
@@ -119,6 +174,10 @@ class RedisTSDB(BaseTSDB):
     frequency table can be displayed as percentages of the whole data set.
     (Additional documentation and the bulk of the logic for implementing the
     frequency table API can be found in the ``cmsketch.lua`` script.)
+
+    Writes to (distinct) counters can be coalesced with ``coalesce_writes``:
+    within the block, writes of the current thread are buffered and written
+    with one pipeline per host when the block exits.
     """
 
     DEFAULT_SKETCH_PARAMETERS = SketchParameters(3, 128, 50)
@@ -129,6 +188,7 @@ class RedisTSDB(BaseTSDB):
         self.prefix = prefix
         self.vnodes = vnodes
         self.enable_frequency_sketches = options.pop("enable_frequency_sketches", False)
+        self._coalescing = threading.local()
         super().__init__(**options)
 
     def validate(self) -> None:
@@ -267,48 +327,67 @@ class RedisTSDB(BaseTSDB):
         if default_timestamp is None:
             default_timestamp = timezone.now()
 
+        pending_writes = self._get_pending_writes()
+
         for (cluster, durable), environment_ids in self.get_cluster_groups({None, environment_id}):
+            key_operations, key_expiries = self._get_counter_operations(
+                items, default_timestamp, default_count, environment_ids
+            )
+
+            if pending_writes is not None:
+                pending_writes[(cluster, durable)].add_counters(key_operations, key_expiries)
+                continue
+
             manager = cluster.map()
             if not durable:
                 manager = SuppressionWrapper(manager)
 
             with manager as client:
-                # (hash_key, hash_field) -> count
-                key_operations: dict[tuple[str, str | int], int] = defaultdict(int)
-                # (hash_key) -> "max expiration encountered"
-                key_expiries: dict[str, float] = defaultdict(float)
-
-                for rollup, max_values in self.rollups.items():
-                    for item in items:
-                        if len(item) == 2:
-                            model, key = item
-                            options: IncrMultiOptions = {
-                                "timestamp": default_timestamp,
-                                "count": default_count,
-                            }
-                        else:
-                            model, key, options = item
-
-                        count = options.get("count", default_count)
-                        _timestamp = options.get("timestamp", default_timestamp)
-
-                        expiry = self.calculate_expiry(rollup, max_values, _timestamp)
-
-                        for _environment_id in environment_ids:
-                            hash_key, hash_field = self.make_counter_key(
-                                model, rollup, _timestamp, key, _environment_id
-                            )
-
-                            if key_expiries[hash_key] < expiry:
-                                key_expiries[hash_key] = expiry
-
-                            key_operations[(hash_key, hash_field)] += count
-
                 for (hash_key, hash_field), count in key_operations.items():
                     client.hincrby(hash_key, hash_field, count)
                     if key_expiries.get(hash_key):
                         client.expireat(hash_key, key_expiries.pop(hash_key))
 
+    def _get_counter_operations(
+        self,
+        items: Sequence[tuple[TSDBModel, TSDBKey] | tuple[TSDBModel, TSDBKey, IncrMultiOptions]],
+        default_timestamp: datetime,
+        default_count: int,
+        environment_ids: Iterable[int | None],
+    ) -> tuple[dict[tuple[str, str | int], int], dict[str, int]]:
+        # (hash_key, hash_field) -> count
+        key_operations: dict[tuple[str, str | int], int] = defaultdict(int)
+        # (hash_key) -> "max expiration encountered"
+        key_expiries: dict[str, int] = defaultdict(int)
+
+        for rollup, max_values in self.rollups.items():
+            for item in items:
+                if len(item) == 2:
+                    model, key = item
+                    options: IncrMultiOptions = {
+                        "timestamp": default_timestamp,
+                        "count": default_count,
+                    }
+                else:
+                    model, key, options = item
+
+                count = options.get("count", default_count)
+                _timestamp = options.get("timestamp", default_timestamp)
+
+                expiry = self.calculate_expiry(rollup, max_values, _timestamp)
+
+                for _environment_id in environment_ids:
+                    hash_key, hash_field = self.make_counter_key(
+                        model, rollup, _timestamp, key, _environment_id
+                    )
+
+                    if key_expiries[hash_key] < expiry:
+                        key_expiries[hash_key] = expiry
+
+                    key_operations[(hash_key, hash_field)] += count
+
+        return key_operations, key_expiries
+
     def get_range(
         self,
         model: TSDBModel,
@@ -475,7 +554,19 @@ class RedisTSDB(BaseTSDB):
 
         ts = int(timestamp.timestamp())  # ``timestamp`` is not actually a timestamp :(
 
+        pending_writes = self._get_pending_writes()
+
         for (cluster, durable), environment_ids in self.get_cluster_groups({None, environment_id}):
+            if pending_writes is not None:
+                cluster_writes = pending_writes[(cluster, durable)]
+                for model, key, values in items:
+                    for rollup, max_values in self.rollups.items():
+                        expiry = self.calculate_expiry(rollup, max_values, timestamp)
+                        for _environment_id in environment_ids:
+                            k = self.make_key(model, rollup, ts, key, _environment_id)
+                            cluster_writes.add_distinct_counter(key, k, values, expiry)
+                continue
+
             manager = cluster.fanout()
             if not durable:
                 manager = SuppressionWrapper(manager)
@@ -489,6 +580,69 @@ class RedisTSDB(BaseTSDB):
                             c.pfadd(k, *values)
                             c.expireat(k, self.calculate_expiry(rollup, max_values, timestamp))
 
+    def _get_pending_writes(self) -> dict[tuple[rb.Cluster, bool], PendingWrites] | None:
+        return getattr(self._coalescing, "pending_writes", None)
+
+    @contextmanager
+    def coalesce_writes(self) -> Generator[None, None, None]:
+        if self._get_pending_writes() is not None:
+            # Nested blocks are flushed with the outermost one
+            yield
+            return
+
+        pending_writes: dict[tuple[rb.Cluster, bool], PendingWrites] = defaultdict(PendingWrites)
+        self._coalescing.pending_writes = pending_writes
+        try:
+            yield
+        finally:
+            self._coalescing.pending_writes = None
+            for (cluster, durable), writes in pending_writes.items():
+                manager: ContextManager[None] = nullcontext()
+                if not durable:
+                    manager = SuppressionWrapper(manager)
+
+                with manager:
+                    self._flush_pending_writes(cluster, writes)
+
+    def _flush_pending_writes(self, cluster: rb.Cluster, writes: PendingWrites) -> None:
+        if not writes.buffered_commands:
+            return
+
+        if is_instance_rb_cluster(cluster, False):
+            router = cluster.get_router()
+        else:
+            raise AssertionError("unreachable")
+
+        commands_by_host: dict[int, list[tuple[Any, ...]]] = defaultdict(list)
+        for (hash_key, hash_field), count in writes.counters.items():
+            commands_by_host[router.get_host_for_key(hash_key)].append(
+                ("HINCRBY", hash_key, hash_field, count)
+            )
+        # Expiries are set after the increments, once the hashes exist
+        for hash_key, expiry in writes.counter_expiries.items():
+            commands_by_host[router.get_host_for_key(hash_key)].append(
+                ("EXPIREAT", hash_key, expiry)
+            )
+        # Distinct counters are placed by their key in the model, not by the
+        # key of the HyperLogLog itself, see ``record_multi``
+        for (routing_key, key), values in writes.distinct_counters.items():
+            commands = commands_by_host[router.get_host_for_key(routing_key)]
+            commands.append(("PFADD", key, *values))
+            commands.append(("EXPIREAT", key, writes.distinct_counter_expiries[key]))
+
+        for host, commands in commands_by_host.items():
+            with cluster.get_local_client(host).pipeline(transaction=False) as pipeline:
+                for command in commands:
+                    pipeline.execute_command(*command)
+                pipeline.execute()
+
+        metrics.incr("tsdb.redis.coalesced_writes.buffered", amount=writes.buffered_commands)
+        metrics.incr("tsdb.redis.coalesced_writes.flushed", amount=writes.command_count)
+        metrics.distribution(
+            "tsdb.redis.coalesced_writes.ratio", writes.buffered_commands / writes.command_count
+        )
+        metrics.distribution("tsdb.redis.coalesced_writes.hosts", len(commands_by_host))
+
     def get_distinct_counts_series(
         self,
         model: TSDBModel,
@@ -580,6 +734,11 @@ class RedisTSDB(BaseTSDB):
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
 
+        if options.get("tsdb.redis.client-side-distinct-counts-union"):
+            return self._get_distinct_counts_union_client_side(
+                model, keys, rollup, series, environment_id
+            )
+
         temporary_id = uuid.uuid1().hex
 
         def make_temporary_key(key: str | int) -> str:
@@ -652,6 +811,37 @@ class RedisTSDB(BaseTSDB):
         reduced: dict[int, set[int]] = reduce(map_key_to_host, set(keys), defaultdict(set))
         return merge_aggregates([get_partition_aggregate(x) for x in reduced.items()])
 
+    def _get_distinct_counts_union_client_side(
+        self,
+        model: TSDBModel,
+        keys: list[int],
+        rollup: int,
+        series: list[int],
+        environment_id: int | None,
+    ) -> int:
+        """
+        Fetch the raw HyperLogLogs of all keys (concurrently across hosts) and
+        merge them in process, which doesn't write any (temporary) keys.
+        """
+        cluster, _ = self.get_cluster(environment_id)
+        with cluster.fanout() as client:
+            responses = [
+                client.target_key(key).mget(
+                    [
+                        self.make_key(model, rollup, timestamp, key, environment_id)
+                        for timestamp in series
+                    ]
+                )
+                for key in set(keys)
+            ]
+
+        hll = HyperLogLog()
+        for response in responses:
+            for value in response.value:
+                if value is not None:
+                    hll.merge(value)
+        return hll.cardinality()
+
     def merge_distinct_counts(
         self,
         model: TSDBModel,
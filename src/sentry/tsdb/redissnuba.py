@@ -1,5 +1,7 @@
 import inspect
 import time
+from collections.abc import Generator
+from contextlib import contextmanager
 
 import sentry_sdk
 
@@ -127,3 +129,9 @@ class RedisSnubaTSDB(BaseTSDB, metaclass=RedisSnubaTSDBMeta):
             "snuba": SnubaTSDB(**options.pop("snuba", {})),
         }
         super().__init__(**options)
+
+    @contextmanager
+    def coalesce_writes(self) -> Generator[None, None, None]:
+        # All counters which are written at all are written to redis
+        with self.backends["redis"].coalesce_writes():
+            yield
@@ -1,5 +1,6 @@
 import math
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 
 def mean(values):
@@ -51,6 +52,12 @@ class MovingAverage(ABC):
     def update(self, n: int, avg: float, value: float) -> float:
         raise NotImplementedError
 
+    def update_many(
+        self, ns: Sequence[int], avgs: Sequence[float], values: Sequence[float]
+    ) -> list[float]:
+        """Updates many independent moving averages, by one value each."""
+        return [self.update(n, avg, value) for n, avg, value in zip(ns, avgs, values)]
+
 
 class ExponentialMovingAverage(MovingAverage):
     def __init__(self, weight: float):
@@ -62,3 +69,13 @@ class ExponentialMovingAverage(MovingAverage):
         if n == 0:
             return value
         return value * self.weight + avg * (1 - self.weight)
+
+    def update_many(
+        self, ns: Sequence[int], avgs: Sequence[float], values: Sequence[float]
+    ) -> list[float]:
+        weight = self.weight
+        complement = 1 - weight
+        return [
+            value * weight + avg * complement if n else value
+            for n, avg, value in zip(ns, avgs, values)
+        ]
@@ -27,6 +27,8 @@ from google.protobuf.message import Message as ProtobufMessage
 from snuba_sdk import DeleteQuery, MetricsQuery, Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
+from sentry.locks import locks
 from sentry.models.environment import Environment
 from sentry.models.group import Group
 from sentry.models.grouprelease import GroupRelease
@@ -42,6 +44,9 @@ from sentry.snuba.query_sources import QuerySource
 from sentry.snuba.referrer import validate_referrer
 from sentry.utils import json, metrics
 from sentry.utils.dates import outside_retention_with_modified_start
+from sentry.utils.locking import UnableToAcquireLock
+from sentry.utils.locking.lock import Lock
+from sentry.utils.snuba_stream import ColumnarRows, decode_response
 
 logger = logging.getLogger(__name__)
 
@@ -509,6 +514,10 @@ _snuba_pool = connection_from_url(
 )
 _query_thread_pool = ThreadPoolExecutor(max_workers=10)
 
+# Size of the chunks streamed responses are read and decoded in
+STREAMING_DECODE_CHUNK_SIZE = 64 * 1024
+_revalidate_thread_pool = ThreadPoolExecutor(max_workers=2)
+
 
 epoch_naive = datetime(1970, 1, 1, tzinfo=None)
 
@@ -894,6 +903,8 @@ class SnubaRequest:
     referrer: str | None  # TODO: this should use the referrer Enum
     forward: Translator
     reverse: Translator
+    # Return the rows of the result as `ColumnarRows`
+    columnar: bool = False
 
     def __post_init__(self) -> None:
         self.validate()
@@ -922,6 +933,7 @@ def raw_snql_query(
     query_source: (
         QuerySource | None
     ) = None,  # TODO: @athena Make this field required after updated all the callsites
+    columnar: bool = False,
 ) -> Mapping[str, Any]:
     """
     Alias for `bulk_snuba_queries`, kept for backwards compatibility.
@@ -930,7 +942,11 @@ def raw_snql_query(
     # other functions do here. It does not add any automatic conditions, format
     # results, nothing. Use at your own risk.
     return bulk_snuba_queries(
-        requests=[request], referrer=referrer, use_cache=use_cache, query_source=query_source
+        requests=[request],
+        referrer=referrer,
+        use_cache=use_cache,
+        query_source=query_source,
+        columnar=columnar,
     )[0]
 
 
@@ -941,6 +957,7 @@ def bulk_snuba_queries(
     query_source: (
         QuerySource | None
     ) = None,  # TODO: @athena Make this field required after updated all the callsites
+    columnar: bool = False,
 ) -> ResultSet:
     """
     Alias for `bulk_snuba_queries_with_referrers` that uses the same referrer for every request.
@@ -952,6 +969,7 @@ def bulk_snuba_queries(
         [(request, referrer) for request in requests],
         use_cache=use_cache,
         query_source=query_source,
+        columnar=columnar,
     )
 
 
@@ -961,12 +979,16 @@ def bulk_snuba_queries_with_referrers(
     query_source: (
         QuerySource | None
     ) = None,  # TODO: @athena Make this field required after updated all the callsites
+    columnar: bool = False,
 ) -> ResultSet:
     """
     The main entrypoint to running queries in Snuba. This function accepts
     Requests for either MQL or SnQL queries and runs them on the appropriate endpoint.
 
     Every request is paired with a referrer to be used for that request.
+
+    With `columnar`, the `data` of every result is a `ColumnarRows`, which holds
+    the rows by column and takes much less memory than a list of dicts.
     """
 
     if "consistent" in OVERRIDE_OPTIONS:
@@ -987,6 +1009,7 @@ def bulk_snuba_queries_with_referrers(
             referrer=referrer,
             forward=lambda x: x,
             reverse=lambda x: x,
+            columnar=columnar,
         )
         for request, referrer in requests_with_referrers
     ]
@@ -1027,6 +1050,123 @@ def get_cache_key(query: Request) -> str:
     return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
 
 
+# How often callers waiting for the result of a coalesced query check the cache
+_COALESCE_POLL_INTERVAL = 0.05
+
+
+def _get_stale_cache_key(cache_key: str) -> str:
+    return f"{cache_key}:stale"
+
+
+def _get_cache_lease(cache_key: str) -> Lock:
+    # Queries can't take longer than the timeout, so neither can the lease
+    return locks.get(
+        f"{cache_key}:lease",
+        duration=int(settings.SENTRY_SNUBA_TIMEOUT),
+        name="snuba_query_cache",
+    )
+
+
+def _acquire_cache_lease(lease: Lock) -> bool:
+    try:
+        lease.acquire()
+    except UnableToAcquireLock:
+        return False
+    return True
+
+
+def _release_cache_lease(lease: Lock) -> None:
+    try:
+        lease.release()
+    except Exception:
+        logger.warning("snuba.query_cache.release_lease_failed", exc_info=True)
+
+
+def _is_cache_lease_held(lease: Lock) -> bool:
+    try:
+        return lease.locked()
+    except Exception:
+        return False
+
+
+def _cache_result(
+    cache_key: str,
+    snuba_request: SnubaRequest,
+    result: Mapping[str, Any],
+    stale_referrers: Collection[str],
+) -> None:
+    if isinstance(result.get("data"), ColumnarRows):
+        result = {**result, "data": list(result["data"])}
+    value = json.dumps(result)
+    cache.set(cache_key, value, settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
+    if snuba_request.referrer in stale_referrers:
+        cache.set(
+            _get_stale_cache_key(cache_key),
+            value,
+            options.get("snuba.query-cache.stale-ttl-seconds"),
+        )
+
+
+def _load_cached_result(snuba_request: SnubaRequest, value: str) -> Mapping[str, Any]:
+    result = json.loads(value)
+    if snuba_request.columnar:
+        result["data"] = ColumnarRows.from_rows(result["data"])
+    return result
+
+
+def _revalidate_cached_result(
+    snuba_request: SnubaRequest, cache_key: str, lease: Lock, stale_referrers: Collection[str]
+) -> None:
+    try:
+        [result] = _bulk_snuba_query([snuba_request])
+        _cache_result(cache_key, snuba_request, result, stale_referrers)
+    except Exception:
+        logger.warning("snuba.query_cache.revalidate_failed", exc_info=True)
+    finally:
+        _release_cache_lease(lease)
+
+
+def _query_and_cache_results(
+    to_query: Sequence[tuple[int, SnubaRequest, str | None]], stale_referrers: Collection[str]
+) -> list[tuple[int, Mapping[str, Any]]]:
+    results = []
+    query_results = _bulk_snuba_query([item[1] for item in to_query])
+    for result, (query_pos, snuba_request, opt_cache_key) in zip(query_results, to_query):
+        if opt_cache_key:
+            _cache_result(opt_cache_key, snuba_request, result, stale_referrers)
+        results.append((query_pos, result))
+    return results
+
+
+def _wait_for_coalesced_results(
+    waiting: Sequence[tuple[int, SnubaRequest, str, Lock]],
+) -> tuple[list[tuple[int, Mapping[str, Any]]], list[tuple[int, SnubaRequest, str | None]]]:
+    """
+    Waits for the callers holding the leases of the cache keys to cache their results. Queries
+    whose lease was released (or expired) without a result have to be run by the caller.
+    """
+    results = []
+    to_query: list[tuple[int, SnubaRequest, str | None]] = []
+    deadline = time.monotonic() + settings.SENTRY_SNUBA_TIMEOUT
+    while waiting:
+        time.sleep(_COALESCE_POLL_INTERVAL)
+        cache_data = cache.get_many([cache_key for _, _, cache_key, _ in waiting])
+        still_waiting = []
+        for query_pos, snuba_request, cache_key, lease in waiting:
+            metric_tags = {"referrer": snuba_request.referrer} if snuba_request.referrer else None
+            cached_result = cache_data.get(cache_key)
+            if cached_result is not None:
+                metrics.incr("snuba.query_cache.coalesced", tags=metric_tags)
+                results.append((query_pos, _load_cached_result(snuba_request, cached_result)))
+            elif time.monotonic() >= deadline or not _is_cache_lease_held(lease):
+                metrics.incr("snuba.query_cache.coalesce_abandoned", tags=metric_tags)
+                to_query.append((query_pos, snuba_request, cache_key))
+            else:
+                still_waiting.append((query_pos, snuba_request, cache_key, lease))
+        waiting = still_waiting
+    return results, to_query
+
+
 def _apply_cache_and_build_results(
     snuba_requests: Sequence[SnubaRequest],
     use_cache: bool | None = False,
@@ -1045,33 +1185,76 @@ def _apply_cache_and_build_results(
     results = []
 
     to_query: list[tuple[int, SnubaRequest, str | None]] = []
+    # Queries that another caller is running, with its lease
+    waiting: list[tuple[int, SnubaRequest, str, Lock]] = []
+    leases: list[Lock] = []
+    stale_referrers: Collection[str] = ()
 
     if use_cache:
+        coalesce = options.get("snuba.query-cache.coalesce.enabled")
+        stale_referrers = frozenset(
+            options.get("snuba.query-cache.stale-while-revalidate.referrers")
+        )
+
         cache_keys = [
             get_cache_key(snuba_request.request) for _, snuba_request in snuba_requests_list
         ]
         cache_data = cache.get_many(cache_keys)
+
+        stale_cache_data = {}
+        stale_cache_keys = [
+            _get_stale_cache_key(cache_key)
+            for (_, snuba_request), cache_key in zip(snuba_requests_list, cache_keys)
+            if cache_key not in cache_data and snuba_request.referrer in stale_referrers
+        ]
+        if stale_cache_keys:
+            stale_cache_data = cache.get_many(stale_cache_keys)
+
         for (query_pos, snuba_request), cache_key in zip(snuba_requests_list, cache_keys):
             cached_result = cache_data.get(cache_key)
             metric_tags = {"referrer": snuba_request.referrer} if snuba_request.referrer else None
-            if cached_result is None:
-                metrics.incr("snuba.query_cache.miss", tags=metric_tags)
+            if cached_result is not None:
+                metrics.incr("snuba.query_cache.hit", tags=metric_tags)
+                results.append((query_pos, _load_cached_result(snuba_request, cached_result)))
+                continue
+
+            metrics.incr("snuba.query_cache.miss", tags=metric_tags)
+            stale_result = stale_cache_data.get(_get_stale_cache_key(cache_key))
+            if stale_result is None and not coalesce:
+                to_query.append((query_pos, snuba_request, cache_key))
+                continue
+
+            lease = _get_cache_lease(cache_key)
+            has_lease = _acquire_cache_lease(lease)
+            if stale_result is not None:
+                # Serve the expired result, and refresh it unless someone else already is
+                metrics.incr("snuba.query_cache.stale_hit", tags=metric_tags)
+                results.append((query_pos, _load_cached_result(snuba_request, stale_result)))
+                if has_lease:
+                    _revalidate_thread_pool.submit(
+                        _revalidate_cached_result, snuba_request, cache_key, lease, stale_referrers
+                    )
+            elif has_lease:
+                leases.append(lease)
                 to_query.append((query_pos, snuba_request, cache_key))
             else:
-                metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
+                waiting.append((query_pos, snuba_request, cache_key, lease))
     else:
         for query_pos, snuba_request in snuba_requests_list:
             to_query.append((query_pos, snuba_request, None))
 
-    if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query])
-        for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
-            if opt_cache_key:
-                cache.set(
-                    opt_cache_key, json.dumps(result), settings.SENTRY_SNUBA_CACHE_TTL_SECONDS
-                )
-            results.append((query_pos, result))
+    try:
+        if to_query:
+            results.extend(_query_and_cache_results(to_query, stale_referrers))
+    finally:
+        for lease in leases:
+            _release_cache_lease(lease)
+
+    if waiting:
+        coalesced_results, to_query = _wait_for_coalesced_results(waiting)
+        results.extend(coalesced_results)
+        if to_query:
+            results.extend(_query_and_cache_results(to_query, stale_referrers))
 
     # Sort so that we get the results back in the original param list order
     results.sort()
@@ -1090,6 +1273,7 @@ def _is_rejected_query(body: Any) -> bool:
 
 def _bulk_snuba_query(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
     snuba_requests_list = list(snuba_requests)
+    streaming_decode = options.get("snuba.query.streaming-decode.enabled")
 
     with sentry_sdk.start_span(op="snuba_query") as span:
         span.set_tag("snuba.num_queries", len(snuba_requests_list))
@@ -1103,6 +1287,7 @@ def _bulk_snuba_query(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
                             sentry_sdk.Scope.get_isolation_scope(),
                             sentry_sdk.Scope.get_current_scope(),
                             snuba_request,
+                            streaming_decode,
                         )
                         for snuba_request in snuba_requests_list
                     ],
@@ -1116,32 +1301,39 @@ def _bulk_snuba_query(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
                         sentry_sdk.Scope.get_isolation_scope(),
                         sentry_sdk.Scope.get_current_scope(),
                         snuba_requests_list[0],
+                        streaming_decode,
                     )
                 )
             ]
 
         results = []
-        for index, item in enumerate(query_results):
+        for index, (item, streamed_body) in enumerate(query_results):
             referrer, response, _, reverse = item
-            try:
-                body = json.loads(response.data)
-                if SNUBA_INFO:
-                    if "sql" in body:
-                        log_snuba_info(
-                            "{}.sql:\n {}".format(
-                                referrer,
-                                sqlparse.format(body["sql"], reindent_aligned=True),
-                            )
+            if streamed_body is not None:
+                body = streamed_body
+            else:
+                try:
+                    body = json.loads(response.data)
+                except ValueError:
+                    if response.status != 200:
+                        logger.exception(
+                            "snuba.query.invalid-json", extra={"response.data": response.data}
                         )
-                    if "error" in body:
-                        log_snuba_info("{}.err: {}".format(referrer, body["error"]))
-            except ValueError:
-                if response.status != 200:
-                    logger.exception(
-                        "snuba.query.invalid-json", extra={"response.data": response.data}
+                        raise SnubaError("Failed to parse snuba error response")
+                    raise UnexpectedResponseError(
+                        f"Could not decode JSON response: {response.data!r}"
                     )
-                    raise SnubaError("Failed to parse snuba error response")
-                raise UnexpectedResponseError(f"Could not decode JSON response: {response.data!r}")
+
+            if SNUBA_INFO:
+                if "sql" in body:
+                    log_snuba_info(
+                        "{}.sql:\n {}".format(
+                            referrer,
+                            sqlparse.format(body["sql"], reindent_aligned=True),
+                        )
+                    )
+                if "error" in body:
+                    log_snuba_info("{}.err: {}".format(referrer, body["error"]))
 
             allocation_policy_prefix = "allocation_policy."
             if _is_rejected_query(body):
@@ -1180,8 +1372,11 @@ def _bulk_snuba_query(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
                 else:
                     raise SnubaError(f"HTTP {response.status}")
 
-            # Forward and reverse translation maps from model ids to snuba keys, per column
-            body["data"] = [reverse(d) for d in body["data"]]
+            if streamed_body is None:
+                # Forward and reverse translation maps from model ids to snuba keys, per column
+                body["data"] = [reverse(d) for d in body["data"]]
+                if snuba_requests_list[index].columnar:
+                    body["data"] = ColumnarRows.from_rows(body["data"])
             results.append(body)
 
         return results
@@ -1262,16 +1457,44 @@ def rpc(req: SnubaRPCRequest, resp_type: type[RPCResponseType]) -> RPCResponseTy
 RawResult = tuple[str, urllib3.response.HTTPResponse, Translator, Translator]
 
 
+def _decode_streamed_response(
+    response: urllib3.response.HTTPResponse, snuba_request: SnubaRequest
+) -> dict[str, Any] | None:
+    """
+    Decodes the body of a successful response while it's being read, translating
+    every row as it arrives. Other responses are left to be read in full.
+    """
+    if response.status != 200:
+        return None
+    try:
+        return decode_response(
+            response.stream(STREAMING_DECODE_CHUNK_SIZE),
+            snuba_request.reverse,
+            columnar=snuba_request.columnar,
+        )
+    except ValueError as err:
+        raise UnexpectedResponseError(f"Could not decode JSON response: {err}")
+    finally:
+        # Discards whatever is left if decoding failed, so the connection can be reused
+        response.drain_conn()
+
+
 def _snuba_query(
     params: tuple[
         sentry_sdk.Scope,
         sentry_sdk.Scope,
         SnubaRequest,
+        bool,
     ],
-) -> RawResult:
+) -> tuple[RawResult, dict[str, Any] | None]:
+    """
+    Runs a query, returning the raw result along with the body of the response if
+    it was decoded while streaming it. SnQL responses are streamed if the request
+    is columnar or `streaming_decode` is set.
+    """
     # Eventually we can get rid of this wrapper, but for now it's cleaner to unwrap
     # the params here than in the calling function. (bc of thread .map)
-    thread_isolation_scope, thread_current_scope, snuba_request = params
+    thread_isolation_scope, thread_current_scope, snuba_request, streaming_decode = params
     with sentry_sdk.scope.use_isolation_scope(thread_isolation_scope):
         with sentry_sdk.scope.use_scope(thread_current_scope):
             headers = snuba_request.headers
@@ -1295,21 +1518,19 @@ def _snuba_query(
                         _raw_mql_query(request, headers),
                         snuba_request.forward,
                         snuba_request.reverse,
-                    )
+                    ), None
                 elif isinstance(request.query, DeleteQuery):
                     return (
                         referrer,
                         _raw_delete_query(request, headers),
                         snuba_request.forward,
                         snuba_request.reverse,
-                    )
+                    ), None
 
-                return (
-                    referrer,
-                    _raw_snql_query(request, headers),
-                    snuba_request.forward,
-                    snuba_request.reverse,
-                )
+                stream = streaming_decode or snuba_request.columnar
+                response = _raw_snql_query(request, headers, preload_content=not stream)
+                body = _decode_streamed_response(response, snuba_request) if stream else None
+                return (referrer, response, snuba_request.forward, snuba_request.reverse), body
             except urllib3.exceptions.HTTPError as err:
                 raise SnubaError(err)
 
@@ -1355,7 +1576,9 @@ def _raw_mql_query(request: Request, headers: Mapping[str, str]) -> urllib3.resp
             )
 
 
-def _raw_snql_query(request: Request, headers: Mapping[str, str]) -> urllib3.response.HTTPResponse:
+def _raw_snql_query(
+    request: Request, headers: Mapping[str, str], preload_content: bool = True
+) -> urllib3.response.HTTPResponse:
     # Enter hub such that http spans are properly nested
     with timer("snql_query"):
         referrer = headers.get("referer", "<unknown>")
@@ -1368,7 +1591,11 @@ def _raw_snql_query(request: Request, headers: Mapping[str, str]) -> urllib3.res
         with sentry_sdk.start_span(op="snuba_snql.run", description=serialized_req) as span:
             span.set_tag("snuba.referrer", referrer)
             return _snuba_pool.urlopen(
-                "POST", f"/{request.dataset}/snql", body=body, headers=headers
+                "POST",
+                f"/{request.dataset}/snql",
+                body=body,
+                headers=headers,
+                preload_content=preload_content,
             )
 
 
@@ -0,0 +1,203 @@
+"""
+Incremental decoding of Snuba query responses.
+
+The body of a Snuba response is a JSON object whose `data` member holds one
+object per row. Instead of buffering the whole body and decoding it at once,
+``decode_response`` reads it in chunks and decodes one row at a time, so the
+raw body is never held in memory in full and every row is translated (and can
+be stored by column) as soon as it arrives.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from typing import Any, overload
+
+import orjson
+
+__all__ = ["ColumnarRows", "decode_response"]
+
+_decoder = json.JSONDecoder()
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Marks the columns a row doesn't have
+_MISSING: Any = object()
+
+
+class ColumnarRows(Sequence[Mapping[str, Any]]):
+    """
+    Rows of a query result, stored as a list of values per column instead of a
+    dict per row. Indexing and iterating still produce the rows as dicts.
+    """
+
+    __slots__ = ("columns", "_length")
+
+    def __init__(self) -> None:
+        self.columns: dict[str, list[Any]] = {}
+        self._length = 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> ColumnarRows:
+        result = cls()
+        for row in rows:
+            result.append(row)
+        return result
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        columns = self.columns
+        if row.keys() == columns.keys():
+            for name, column in columns.items():
+                column.append(row[name])
+            self._length += 1
+            return
+        for name in row:
+            if name not in columns:
+                columns[name] = [_MISSING] * self._length
+        for name, column in columns.items():
+            column.append(row.get(name, _MISSING))
+        self._length += 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Mapping[str, Any]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Mapping[str, Any]]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Mapping[str, Any] | Sequence[Mapping[str, Any]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if not -self._length <= index < self._length:
+            raise IndexError("row index out of range")
+        return {
+            name: column[index]
+            for name, column in self.columns.items()
+            if column[index] is not _MISSING
+        }
+
+    def __repr__(self) -> str:
+        return f"<ColumnarRows: {self._length} rows, columns={list(self.columns)!r}>"
+
+
+class _ChunkReader:
+    """Decodes JSON values from a stream of byte chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Reads the next chunk, returns `False` at the end of the body."""
+        if self.eof:
+            return False
+        # Only keep what wasn't consumed yet, so that the buffer stays around the size of a chunk
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.buffer += self._decoder.decode(b"", final=True)
+            self.eof = True
+            return False
+        self.buffer += self._decoder.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """Returns the next character that isn't whitespace, without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()  # type: ignore[union-attr]
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of response")
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in response, got {char!r}")
+        self.pos += 1
+        return char
+
+    def row(self) -> Any:
+        """Decodes a row, which in most cases is an object without nested objects."""
+        if self.peek() == "{":
+            end = self.buffer.find("}", self.pos)
+            if end != -1:
+                # If the first `}` doesn't end the row (because it's part of a nested object or a
+                # string) the row is cut short and can't be decoded.
+                try:
+                    value = orjson.loads(self.buffer[self.pos : end + 1])
+                except orjson.JSONDecodeError:
+                    pass
+                else:
+                    self.pos = end + 1
+                    return value
+        return self.value()
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value continues in the next chunk
+                if not self.fill():
+                    raise
+                continue
+            # A number at the end of the buffer might continue in the next chunk too
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _decode_rows(
+    reader: _ChunkReader, reverse: Callable[[Any], Any], columnar: bool
+) -> list[Any] | ColumnarRows:
+    rows: list[Any] | ColumnarRows = ColumnarRows() if columnar else []
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return rows
+    while True:
+        rows.append(reverse(reader.row()))
+        if reader.expect(",]") == "]":
+            return rows
+
+
+def decode_response(
+    chunks: Iterable[bytes], reverse: Callable[[Any], Any], columnar: bool = False
+) -> dict[str, Any]:
+    """
+    Decode the body of a Snuba response from its chunks, translating every row
+    of its `data` with `reverse`.
+
+    :param columnar: Return the rows as `ColumnarRows` rather than a list.
+    :raises ValueError: If the body isn't a JSON object.
+    """
+    reader = _ChunkReader(iter(chunks))
+    body: dict[str, Any] = {}
+    reader.expect("{")
+    if reader.peek() == "}":
+        return body
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError(f"Expected an object key in response, got {key!r}")
+        reader.expect(":")
+        if key == "data" and reader.peek() == "[":
+            body[key] = _decode_rows(reader, reverse, columnar)
+        else:
+            body[key] = reader.value()
+        if reader.expect(",}") == "}":
+            return body
@@ -1,12 +1,25 @@
-from sentry.api.serializers import Serializer, serialize
+import threading
+from unittest import mock
+
+from django.db import router, transaction
+
+from sentry.api.serializers import Prefetch, Serializer, serialize
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import control_silo_test
+from sentry.users.models.user import User
 
 
 class Foo:
     pass
 
 
+class Bar:
+    def __init__(self, id, children=()):
+        self.id = id
+        self.children = children
+
+
 class FooSerializer(Serializer):
     def serialize(self, *args, **kwargs):
         return "lol"
@@ -33,6 +46,33 @@ class ParentSerializer(Serializer):
         }
 
 
+class PrefetchingSerializer(Serializer):
+    def __init__(self, load_names, load_tags):
+        self.load_names = load_names
+        self.load_tags = load_tags
+
+    def get_prefetch_plan(self, item_list, user, **kwargs):
+        return {
+            "name": Prefetch(self.load_names),
+            "tags": Prefetch(self.load_tags, default=list),
+        }
+
+    def get_attrs(self, item_list, user, **kwargs):
+        return {
+            item: {"children": serialize(list(item.children), user, self)} for item in item_list
+        }
+
+    def serialize(self, obj, attrs, user, **kwargs):
+        return {"id": obj.id, **attrs}
+
+
+def build_loader(values):
+    def load(items, user):
+        return {item.id: values[item.id] for item in items if item.id in values}
+
+    return mock.Mock(side_effect=load)
+
+
 @control_silo_test
 class BaseSerializerTest(TestCase):
     def test_serialize(self):
@@ -78,3 +118,105 @@ class BaseSerializerTest(TestCase):
         result = serialize(foo, serializer=ParentSerializer())
         assert result["parent"] == "something"
         assert result["child"] is None
+
+    def test_prefetch_plan(self):
+        load_names = build_loader({1: "one", 2: "two"})
+        load_tags = build_loader({2: ["a"]})
+        serializer = PrefetchingSerializer(load_names, load_tags)
+
+        result = serialize([Bar(1), Bar(2), Bar(2)], serializer=serializer)
+        assert result == [
+            {"id": 1, "name": "one", "tags": [], "children": []},
+            {"id": 2, "name": "two", "tags": ["a"], "children": []},
+            {"id": 2, "name": "two", "tags": ["a"], "children": []},
+        ]
+
+        # every loader is called once, with one item per key
+        assert load_names.call_count == 1
+        assert [item.id for item in load_names.call_args.args[0]] == [1, 2]
+        assert load_tags.call_count == 1
+
+    def test_prefetch_plan_nested(self):
+        load_names = build_loader({1: "one", 2: "two", 3: "three"})
+        load_tags = build_loader({})
+        serializer = PrefetchingSerializer(load_names, load_tags)
+
+        result = serialize(
+            [Bar(1, children=[Bar(2)]), Bar(2, children=[Bar(3)])], serializer=serializer
+        )
+        assert result == [
+            {
+                "id": 1,
+                "name": "one",
+                "tags": [],
+                "children": [{"id": 2, "name": "two", "tags": [], "children": []}],
+            },
+            {
+                "id": 2,
+                "name": "two",
+                "tags": [],
+                "children": [{"id": 3, "name": "three", "tags": [], "children": []}],
+            },
+        ]
+
+        # nested serializers only load the keys which weren't loaded yet
+        assert [[item.id for item in c.args[0]] for c in load_names.call_args_list] == [[1, 2], [3]]
+
+        # but loaded data isn't kept across calls
+        serialize([Bar(1)], serializer=serializer)
+        assert [item.id for item in load_names.call_args.args[0]] == [1]
+
+    def test_prefetch_plan_workers(self):
+        threads = set()
+
+        def load_names(items, user):
+            threads.add(threading.current_thread().name)
+            return {item.id: str(item.id) for item in items}
+
+        serializer = PrefetchingSerializer(load_names, build_loader({1: ["a"]}))
+
+        with override_options({"api.serializers.prefetch-workers": 2}):
+            result = serialize([Bar(1), Bar(2)], serializer=serializer)
+
+        assert result == [
+            {"id": 1, "name": "1", "tags": ["a"], "children": []},
+            {"id": 2, "name": "2", "tags": [], "children": []},
+        ]
+        assert len(threads) == 1
+        assert threads.pop().startswith("serializers")
+
+    def test_prefetch_plan_not_per_user(self):
+        load_names = mock.Mock(side_effect=lambda items: {item.id: str(item.id) for item in items})
+
+        class NameSerializer(Serializer):
+            def get_prefetch_plan(self, item_list, user, **kwargs):
+                return {"name": Prefetch(load_names, per_user=False)}
+
+            def serialize(self, obj, attrs, user, **kwargs):
+                return attrs["name"]
+
+        assert serialize([Bar(1), Bar(2)], self.create_user(), NameSerializer()) == ["1", "2"]
+        assert load_names.call_count == 1
+        assert [item.id for item in load_names.call_args.args[0]] == [1, 2]
+
+    def test_prefetch_plan_workers_in_transaction(self):
+        threads = set()
+
+        def load_names(items, user):
+            threads.add(threading.current_thread().name)
+            return dict(
+                User.objects.filter(id__in=[item.id for item in items]).values_list(
+                    "id", "username"
+                )
+            )
+
+        serializer = PrefetchingSerializer(load_names, build_loader({}))
+
+        with override_options({"api.serializers.prefetch-workers": 2}):
+            with transaction.atomic(router.db_for_write(User)):
+                user = self.create_user(username="in-transaction")
+                result = serialize([Bar(user.id)], serializer=serializer)
+
+        # Loaders run inline, workers couldn't see the uncommitted user
+        assert result == [{"id": user.id, "name": "in-transaction", "tags": [], "children": []}]
+        assert threads == {threading.current_thread().name}
@@ -0,0 +1,112 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from sentry.api.serializers import serialize
+from sentry.api.serializers.models.group import GroupSerializer
+from sentry.api.serializers.models.project import ProjectSummarySerializer
+from sentry.models.group import Group
+from sentry.models.groupbookmark import GroupBookmark
+from sentry.models.projectbookmark import ProjectBookmark
+from sentry.testutils.factories import Factories
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_PROJECTS = 100
+NUM_GROUPS = 500
+
+
+@pytest.fixture
+def user():
+    return Factories.create_user()
+
+
+@pytest.fixture
+def projects(user):
+    organization = Factories.create_organization(owner=user)
+    team = Factories.create_team(organization=organization, members=[user])
+    projects = [
+        Factories.create_project(organization=organization, teams=[team], name=f"project-{i}")
+        for i in range(NUM_PROJECTS)
+    ]
+    ProjectBookmark.objects.bulk_create(
+        [ProjectBookmark(project_id=project.id, user_id=user.id) for project in projects[::3]]
+    )
+    return projects
+
+
+@pytest.fixture
+def groups(user, projects):
+    now = timezone.now()
+    Group.objects.bulk_create(
+        [
+            Group(
+                project=projects[0],
+                short_id=i,
+                message=f"error {i}",
+                first_seen=now,
+                data={"type": "default", "metadata": {"title": f"error {i}"}},
+            )
+            for i in range(1, NUM_GROUPS + 1)
+        ]
+    )
+    groups = list(Group.objects.filter(project=projects[0]))
+    GroupBookmark.objects.bulk_create(
+        [GroupBookmark(project=projects[0], group=group, user_id=user.id) for group in groups[::5]]
+    )
+    return groups
+
+
+def count_queries(objects, user, serializer):
+    with override_options({"api.serializers.prefetch-workers": 0}):
+        with CaptureQueriesContext(connection) as queries:
+            serialize(objects, user, serializer)
+    return len(queries)
+
+
+@requires_pytest_benchmark
+@django_db_all(transaction=True)
+@pytest.mark.parametrize("workers", [0, 8])
+def test_benchmark_serialize_projects(workers, user, projects, benchmark):
+    serializer = ProjectSummarySerializer()
+
+    with override_options({"api.serializers.prefetch-workers": workers}):
+        result = benchmark.pedantic(serialize, args=(projects, user, serializer), rounds=20)
+
+    assert len(result) == NUM_PROJECTS
+    assert sum(project["isBookmarked"] for project in result) == len(projects[::3])
+    benchmark.extra_info["queries"] = count_queries(projects, user, serializer)
+
+
+@requires_pytest_benchmark
+@django_db_all(transaction=True)
+@pytest.mark.parametrize("workers", [0, 8])
+def test_benchmark_serialize_groups(workers, user, groups, benchmark):
+    serializer = GroupSerializer()
+
+    def get_seen_stats(item_list, user):
+        return {
+            group: {
+                "times_seen": group.times_seen,
+                "first_seen": group.first_seen,
+                "last_seen": group.last_seen,
+                "user_count": 0,
+            }
+            for group in item_list
+        }
+
+    # Seen stats are queried from Snuba, which prefetching doesn't change.
+    with (
+        mock.patch.object(GroupSerializer, "_get_seen_stats", side_effect=get_seen_stats),
+        mock.patch.object(GroupSerializer, "_get_group_snuba_stats", return_value=None),
+        override_options({"api.serializers.prefetch-workers": workers}),
+    ):
+        result = benchmark.pedantic(serialize, args=(groups, user, serializer), rounds=20)
+        benchmark.extra_info["queries"] = count_queries(groups, user, serializer)
+
+    assert len(result) == NUM_GROUPS
+    assert sum(group["isBookmarked"] for group in result) == len(groups[::5])
@@ -1,3 +1,4 @@
+import re
 from datetime import datetime
 from unittest import mock
 from unittest.mock import MagicMock
@@ -11,10 +12,11 @@ from sentry_sdk import Scope
 
 from sentry.api.base import Endpoint, EndpointSiloLimit
 from sentry.api.exceptions import SuperuserRequired
-from sentry.api.paginator import GenericOffsetPaginator
+from sentry.api.paginator import GenericOffsetPaginator, KeysetPaginator
 from sentry.api.permissions import SuperuserPermission
 from sentry.deletions.tasks.hybrid_cloud import schedule_hybrid_cloud_foreign_key_jobs
 from sentry.models.apikey import ApiKey
+from sentry.models.organization import Organization
 from sentry.silo.base import FunctionSiloLimit, SiloMode
 from sentry.testutils.cases import APITestCase
 from sentry.testutils.helpers.options import override_options
@@ -117,6 +119,19 @@ class DummyPaginationStreamingEndpoint(Endpoint):
         )
 
 
+class DummyKeysetPaginationEndpoint(Endpoint):
+    permission_classes = ()
+
+    def get(self, request):
+        return self.paginate(
+            request=request,
+            queryset=Organization.objects.all(),
+            order_by="-date_added",
+            paginator_cls=KeysetPaginator,
+            on_results=lambda results: [organization.slug for organization in results],
+        )
+
+
 _dummy_endpoint = DummyEndpoint.as_view()
 _dummy_streaming_endpoint = DummyPaginationStreamingEndpoint.as_view()
 
@@ -491,6 +506,22 @@ class PaginateTest(APITestCase):
         response = self.view(self.request)
         assert response.status_code == 400
 
+    def test_keyset_paginator_cursor(self):
+        organizations = [self.create_organization(name=f"org-{i}") for i in range(3)]
+        view = DummyKeysetPaginationEndpoint().as_view()
+
+        self.request.GET = QueryDict("per_page=2")
+        response = view(self.request)
+        assert response.status_code == 200, response.data
+        assert response.data == [organizations[2].slug, organizations[1].slug]
+
+        # The cursor of the `KeysetPaginator` is parsed without passing its class.
+        next_cursor = re.findall(r'cursor="([^"]+)"', response["Link"])[1]
+        self.request.GET = QueryDict(f"per_page=2&cursor={next_cursor}")
+        response = view(self.request)
+        assert response.status_code == 200, response.data
+        assert response.data == [organizations[0].slug]
+
     def test_custom_response_type(self):
         response = _dummy_streaming_endpoint(self.request)
         assert response.status_code == 200
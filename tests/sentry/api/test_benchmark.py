@@ -0,0 +1,94 @@
+import contextlib
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from sentry.api.event_search import parse_cache, parse_search_query
+from sentry.api.issue_search import parse_search_query as parse_issue_search_query
+from sentry.api.paginator import KeysetPaginator, OffsetPaginator
+from sentry.models.environment import Environment
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.cursors import Cursor, StringCursor
+
+NUM_ROWS = 50_000
+PAGE_SIZE = 100
+
+# Queries of the default issue streams, dashboards and alerts
+ISSUE_QUERIES = [
+    "is:unresolved",
+    "is:unresolved issue.priority:[high, medium]",
+    "is:unresolved assigned_or_suggested:me",
+    "is:unresolved is:for_review assigned_or_suggested:[me, my_teams, none]",
+    "is:unresolved firstSeen:-24h",
+    "is:regressed",
+    "is:unresolved level:error environment:production",
+]
+EVENT_QUERIES = [
+    "",
+    "!event.type:transaction",
+    "event.type:transaction",
+    "has:user.email",
+    "error.handled:false",
+    "event.type:error browser.name:Chrome os.name:Windows",
+    "transaction:/api/0/organizations/*/issues/ http.method:GET",
+    "event.type:transaction transaction.duration:>5s",
+    "count():>100 p95(transaction.duration):>1s",
+    "user.email:*@example.com (release:1.0.0 OR release:1.0.1)",
+]
+
+
+@pytest.fixture
+def environments():
+    now = timezone.now()
+    Environment.objects.bulk_create(
+        [
+            Environment(organization_id=1, name=f"env-{i}", date_added=now - timedelta(seconds=i))
+            for i in range(NUM_ROWS)
+        ],
+        batch_size=5000,
+    )
+    return Environment.objects.filter(organization_id=1)
+
+
+@requires_pytest_benchmark
+@django_db_all
+@pytest.mark.parametrize("paginator_cls", [OffsetPaginator, KeysetPaginator])
+def test_benchmark_deep_page(paginator_cls, environments, benchmark):
+    """Fetches the last page of a large listing, the way a client walking every page ends up."""
+    paginator = paginator_cls(environments, order_by="-date_added")
+    if paginator_cls is OffsetPaginator:
+        cursor = Cursor(PAGE_SIZE, NUM_ROWS // PAGE_SIZE - 1, False)
+    else:
+        # The cursor of the second to last page points at its last row.
+        last_row = environments.order_by("-date_added", "-id")[NUM_ROWS - PAGE_SIZE - 1]
+        cursor = StringCursor(paginator._encode_key(paginator.get_item_key(last_row)), 0, False)
+
+    result = benchmark.pedantic(
+        paginator.get_result, kwargs={"limit": PAGE_SIZE, "cursor": cursor}, rounds=10
+    )
+    assert len(result) == PAGE_SIZE
+    assert not result.next
+
+
+def parse_all() -> None:
+    for query in ISSUE_QUERIES:
+        parse_issue_search_query(query)
+    for query in EVENT_QUERIES:
+        parse_search_query(query)
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("mode", ["grammar", "fast_path", "cached"])
+def test_benchmark_parse_search_query(mode, benchmark):
+    if mode == "grammar":
+        fast_path = mock.patch("sentry.api.event_search._parse_simple_query", return_value=None)
+    else:
+        fast_path = contextlib.nullcontext()
+
+    with fast_path:
+        # The cache is emptied before every round, unless cached queries are benchmarked
+        setup = parse_all if mode == "cached" else parse_cache.clear
+        benchmark.pedantic(parse_all, setup=setup, rounds=20)
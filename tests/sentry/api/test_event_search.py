@@ -1,7 +1,8 @@
 import datetime
 import os
+from copy import deepcopy
 from datetime import timedelta
-from unittest.mock import patch
+from unittest.mock import Mock, patch, sentinel
 
 import pytest
 from django.test import SimpleTestCase
@@ -14,8 +15,14 @@ from sentry.api.event_search import (
     SearchFilter,
     SearchKey,
     SearchValue,
+    SearchVisitor,
+    _parse_simple_query,
+    default_config,
+    event_search_grammar,
+    parse_cache,
     parse_search_query,
 )
+from sentry.api.issue_search import issue_search_config
 from sentry.constants import MODULE_ROOT
 from sentry.exceptions import InvalidSearchQuery
 from sentry.search.utils import parse_datetime_string, parse_duration, parse_numeric_value
@@ -739,3 +746,122 @@ def test_search_value_classify_and_format_wildcard(value, expected_kind, expecte
     kind = search_value.classify_wildcard()
     assert kind == expected_kind
     assert search_value.format_wildcard(kind) == expected_value
+
+
+class ParseSearchQueryCacheTest(SimpleTestCase):
+    def setUp(self):
+        parse_cache.clear()
+
+    def test_cached(self):
+        query = "transaction.duration:>5s count():>10"
+        expected = parse_search_query(query)
+
+        with patch.object(event_search_grammar, "parse") as grammar_parse:
+            assert parse_search_query(query) == expected
+        assert not grammar_parse.called
+
+    def test_returns_copy(self):
+        parse_search_query("user.email:foo@example.com").append(sentinel.token)
+        assert parse_search_query("user.email:foo@example.com") == [
+            SearchFilter(SearchKey("user.email"), "=", SearchValue("foo@example.com"))
+        ]
+
+    def test_returns_deep_copy(self):
+        query = "user.email:[a@example.com,b@example.com] (browser:chrome OR browser:firefox)"
+        expected = deepcopy(parse_search_query(query))
+
+        search_filters = parse_search_query(query)
+        search_filters[0].value.raw_value.append("c@example.com")
+        search_filters[1].children.pop()
+
+        assert parse_search_query(query) == expected
+
+    def test_keyed_by_config_attributes(self):
+        assert parse_search_query("foo", config_overrides={"free_text_key": "bar"}) == [
+            SearchFilter(SearchKey("bar"), "=", SearchValue("foo"))
+        ]
+        assert parse_search_query("foo") == [
+            SearchFilter(SearchKey("message"), "=", SearchValue("foo"))
+        ]
+
+    def test_keyed_by_config(self):
+        config = SearchConfig.create_from(default_config, allowed_keys={"release"})
+        assert parse_search_query("browser:chrome") == [
+            SearchFilter(SearchKey("browser"), "=", SearchValue("chrome"))
+        ]
+        with pytest.raises(InvalidSearchQuery):
+            parse_search_query("browser:chrome", config=config)
+        with pytest.raises(InvalidSearchQuery):
+            parse_search_query("browser:chrome", config_overrides={"blocked_keys": {"browser"}})
+
+    def test_errors_not_cached(self):
+        with pytest.raises(InvalidSearchQuery):
+            parse_search_query("project_id:abc")
+        assert len(parse_cache) == 0
+
+    def test_relative_dates_not_cached(self):
+        now = timezone.now()
+        with freeze_time(now):
+            assert parse_search_query("time:-1h")[0].value.raw_value == now - timedelta(hours=1)
+        with freeze_time(now + timedelta(hours=1)):
+            assert parse_search_query("time:-1h")[0].value.raw_value == now
+        assert len(parse_cache) == 0
+
+    def test_not_cached_with_builder(self):
+        builder = Mock()
+        builder.get_field_type.return_value = None
+        parse_search_query("browser:chrome", builder=builder)
+        assert len(parse_cache) == 0
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "browser:chrome",
+        "  browser:chrome   environment:production ",
+        "!browser:chrome transaction:/api/0/*",
+        "url:https://example.com/a?b=c,d",
+        "is:unresolved assigned:me !is:ignored",
+        "is:unknown",
+        "project_id:abc",
+        "timestamp:yesterday",
+        "error.handled:yes",
+    ],
+)
+@pytest.mark.parametrize("config", [default_config, issue_search_config])
+def test_parse_simple_query(query, config):
+    def parse(parser):
+        try:
+            return parser(SearchVisitor(config))
+        except InvalidSearchQuery as e:
+            # Date errors include the current time
+            return str(e).split("(e.g.")[0]
+
+    fast_path = parse(lambda visitor: _parse_simple_query(query, visitor))
+    assert fast_path is not None
+    assert fast_path == parse(lambda visitor: visitor.visit(event_search_grammar.parse(query)))
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "chrome",
+        "has:browser",
+        "browser:true",
+        "browser:>chrome",
+        "browser:-1d",
+        "browser:[chrome]",
+        "browser:1chrome",
+        'browser:"chrome"',
+        "tags[browser]:chrome",
+        "count():>1",
+        "duration:5s",
+        "release:1.0.0",
+        "browser:chrome OR browser:firefox",
+        "(browser:chrome)",
+        "browser:chrome\tos:linux",
+    ],
+)
+def test_parse_simple_query_fallback(query):
+    assert _parse_simple_query(query, SearchVisitor(default_config)) is None
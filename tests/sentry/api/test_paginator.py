@@ -26,6 +26,7 @@ from sentry.api.paginator import (
     CombinedQuerysetPaginator,
     DateTimePaginator,
     GenericOffsetPaginator,
+    KeysetPaginator,
     OffsetPaginator,
     Paginator,
     SequencePaginator,
@@ -38,7 +39,7 @@ from sentry.testutils.cases import APITestCase, SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import iso_format
 from sentry.testutils.silo import control_silo_test
 from sentry.users.models.user import User
-from sentry.utils.cursors import Cursor
+from sentry.utils.cursors import Cursor, StringCursor
 from sentry.utils.snuba import raw_snql_query
 
 
@@ -198,6 +199,122 @@ class OffsetPaginatorTest(TestCase):
             paginator.get_result()
 
 
+@control_silo_test
+class KeysetPaginatorTest(TestCase):
+    def test_simple(self):
+        res1 = self.create_user("foo@example.com")
+        res2 = self.create_user("bar@example.com")
+        res3 = self.create_user("baz@example.com")
+
+        queryset = User.objects.all()
+
+        paginator = KeysetPaginator(queryset, "id")
+        result1 = paginator.get_result(limit=1, cursor=None)
+        assert list(result1) == [res1]
+        assert result1.next
+        assert not result1.prev
+
+        result2 = paginator.get_result(limit=1, cursor=result1.next)
+        assert list(result2) == [res2]
+        assert result2.next
+        assert result2.prev
+
+        result3 = paginator.get_result(limit=1, cursor=result2.next)
+        assert list(result3) == [res3]
+        assert not result3.next
+        assert result3.prev
+
+        result4 = paginator.get_result(limit=1, cursor=result3.next)
+        assert len(result4) == 0, result4
+        assert not result4.next
+        assert result4.prev
+
+        result5 = paginator.get_result(limit=1, cursor=result4.prev)
+        assert list(result5) == [res3]
+        assert result5.next
+        assert result5.prev
+
+        result6 = paginator.get_result(limit=1, cursor=result5.prev)
+        assert list(result6) == [res2]
+        assert result6.prev
+
+        result7 = paginator.get_result(limit=1, cursor=result6.prev)
+        assert list(result7) == [res1]
+        assert not result7.prev
+
+        result8 = paginator.get_result(limit=1, cursor=result7.next)
+        assert list(result8) == [res2]
+
+    def test_order_by_multiple(self):
+        now = timezone.now()
+        users = [self.create_user(f"user{i}@example.com") for i in range(6)]
+        for i, user in enumerate(users):
+            # Pairs of users share the same join date
+            user.update(date_joined=now - timedelta(days=i // 2), is_active=i % 3 != 0)
+
+        queryset = User.objects.all()
+        expected = list(queryset.order_by("-is_active", "-date_joined", "-id"))
+        paginator = KeysetPaginator(queryset, ("-is_active", "-date_joined"))
+
+        results = []
+        cursor = None
+        for _ in range(len(users)):
+            result = paginator.get_result(limit=2, cursor=cursor)
+            results.extend(result)
+            if not result.next:
+                break
+            cursor = StringCursor.from_string(str(result.next))
+        assert results == expected
+
+        results = []
+        for _ in range(len(users)):
+            result = paginator.get_result(limit=2, cursor=cursor)
+            results[:0] = result
+            if not result.prev:
+                break
+            cursor = StringCursor.from_string(str(result.prev))
+        assert results == expected
+
+    def test_concurrent_inserts(self):
+        self.create_user("foo@example.com")
+        res2 = self.create_user("bar@example.com")
+
+        paginator = KeysetPaginator(User.objects.all(), "-id")
+        result1 = paginator.get_result(limit=1, cursor=None)
+        assert list(result1) == [res2]
+
+        # Rows added before the cursor don't shift the following pages.
+        self.create_user("baz@example.com")
+        result2 = paginator.get_result(limit=1, cursor=result1.next)
+        assert list(result2) == [User.objects.get(email="foo@example.com")]
+
+    def test_invalid_cursor(self):
+        paginator = KeysetPaginator(User.objects.all(), "id")
+        for value in ("foo", "W10", "WzEsIDJd"):
+            with pytest.raises(BadPaginationError):
+                paginator.get_result(cursor=StringCursor(value, 0, 0))
+
+    def test_invalid_order_by(self):
+        with pytest.raises(ValueError):
+            KeysetPaginator(User.objects.all(), "nope")
+
+    def test_count_hits(self):
+        self.create_user("foo@example.com")
+        self.create_user("bar@example.com")
+
+        for estimate in (False, True):
+            paginator = KeysetPaginator(User.objects.all(), "id", estimate_hits=estimate)
+            result = paginator.get_result(limit=1, count_hits=True)
+            assert result.hits == 2
+            assert result.max_hits == 1000
+
+            result = paginator.get_result(limit=1, count_hits=True, max_hits=1)
+            assert result.hits == 1
+
+            paginator = KeysetPaginator(User.objects.none(), "id", estimate_hits=estimate)
+            assert paginator.get_result(limit=1, count_hits=True).hits == 0
+
+
 @control_silo_test
 class DateTimePaginatorTest(TestCase):
     def test_ascending(self):
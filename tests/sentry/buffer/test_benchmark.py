@@ -0,0 +1,45 @@
+from unittest import mock
+
+import pytest
+
+from sentry import options
+from sentry.buffer.redis import RedisBuffer
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.skips import requires_pytest_benchmark
+
+KEY_COUNT = 500
+
+
+@pytest.fixture
+def buffer(set_sentry_option):
+    value = options.get("redis.clusters")
+    value["default"]["is_redis_cluster"] = False
+    set_sentry_option("redis.clusters", value)
+    return RedisBuffer()
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("batched", [False, True], ids=["per_key", "batched"])
+def test_benchmark_process_batch_keys(buffer, batched, benchmark):
+    model = mock.Mock()
+    model.__name__ = "Mock"
+
+    def setup():
+        keys = []
+        for i in range(KEY_COUNT):
+            buffer.incr(model, {"times_seen": 1}, {"pk": i})
+            keys.append(buffer._make_key(model, {"pk": i}))
+        return (keys,), {}
+
+    def flush(keys):
+        buffer.process(batch_keys=keys)
+
+    # Only measure the Redis side of the flush, the database updates are the
+    # same for both paths.
+    with (
+        mock.patch("sentry.buffer.base.Buffer.process"),
+        override_options({"buffer.batched-flush.enabled": batched}),
+    ):
+        benchmark.pedantic(flush, setup=setup, rounds=10)
+
+    benchmark.extra_info["keys_per_second"] = KEY_COUNT / benchmark.stats.stats.mean
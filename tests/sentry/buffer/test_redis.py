@@ -21,6 +21,7 @@ from sentry.models.project import Project
 from sentry.rules.processing.delayed_processing import process_delayed_alert_conditions
 from sentry.rules.processing.processor import PROJECT_ID_BUFFER_LIST_KEY
 from sentry.testutils.helpers.datetime import freeze_time
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import json
 from sentry.utils.redis import get_cluster_routing_client
@@ -626,6 +627,51 @@ class TestRedisBuffer:
         # signal_only should not increment the times_seen column
         assert group.times_seen == orig_times_seen
 
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_batched_flush(self, process):
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        self.buf.incr(model, {"times_seen": 2}, {"pk": 1}, extra={"foo": "bar"})
+        self.buf.incr(model, {"times_seen": 3}, {"pk": 2}, signal_only=True)
+        keys = [
+            self.buf._make_key(model, {"pk": 1}),
+            self.buf._make_key(model, {"pk": 2}),
+        ]
+
+        with override_options({"buffer.batched-flush.enabled": True}):
+            self.buf.process(batch_keys=keys)
+
+        assert process.call_count == 2
+        process.assert_any_call(mock.Mock, {"times_seen": 3}, {"pk": 1}, {"foo": "bar"}, None)
+        process.assert_any_call(mock.Mock, {"times_seen": 3}, {"pk": 2}, {}, True)
+
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        for key in keys:
+            assert not client.exists(key)
+
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_batched_flush_skips_locked_keys(self, process):
+        if self.buf.is_redis_cluster:
+            pytest.skip("batched flushing is only supported on rb clusters")
+
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 2})
+        locked_key = self.buf._make_key(model, {"pk": 1})
+        unlocked_key = self.buf._make_key(model, {"pk": 2})
+
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        client.set(self.buf._make_lock_key(locked_key), "1")
+
+        with override_options({"buffer.batched-flush.enabled": True}):
+            self.buf.process(batch_keys=[locked_key, unlocked_key])
+
+        process.assert_called_once_with(mock.Mock, {"times_seen": 1}, {"pk": 2}, {}, None)
+        assert client.exists(locked_key)
+        assert not client.exists(unlocked_key)
+
 
 @pytest.mark.parametrize(
     "value",
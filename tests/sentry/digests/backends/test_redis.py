@@ -1,13 +1,14 @@
 import time
 import uuid
-from functools import cached_property
+from functools import cached_property, partial
 
 import pytest
 
-from sentry.digests.backends.base import InvalidState
+from sentry.digests.backends.base import Backend, InvalidState
 from sentry.digests.backends.redis import RedisBackend
 from sentry.digests.types import Notification, Record
 from sentry.testutils.cases import TestCase
+from sentry.utils.locking import UnableToAcquireLock
 
 
 class RedisBackendTestCase(TestCase):
@@ -158,3 +159,128 @@ class RedisBackendTestCase(TestCase):
 
         with backend.digest("timeline", 0) as records:
             assert len(records) == n
+
+    def test_compaction(self):
+        backend = RedisBackend(compaction=True)
+
+        t = time.time()
+        for i in range(10):
+            backend.add("timeline", Record(f"record:{i}", self.notification, t + i), compact=True)
+
+        # Records of another group are compacted separately.
+        other_event = self.store_event(data={"fingerprint": ["other"]}, project_id=self.project.id)
+        other_notification = Notification(other_event, self.notification.rules)
+        for i in range(3):
+            backend.add("timeline", Record(f"other:{i}", other_notification, t + i), compact=True)
+
+        # Only the oldest and newest record of every group are kept.
+        with backend.digest("timeline", 0) as records:
+            assert [record.key for record in records] == [
+                "record:9",
+                "other:2",
+                "record:0",
+                "other:0",
+            ]
+
+        # Records which were digested don't count towards the next digest.
+        for i in range(10, 13):
+            backend.add("timeline", Record(f"record:{i}", self.notification, t + i), compact=True)
+
+        assert {entry.key for entry in backend.schedule(time.time() + 3600)} == {"timeline"}
+
+        with backend.digest("timeline", 0) as records:
+            assert [record.key for record in records] == ["record:12", "record:10"]
+
+        # Compacted records are deleted along with the timeline.
+        backend.delete("timeline")
+        assert len(backend._get_connection("timeline").keys("d:*")) == 0
+
+    def test_compaction_requires_compact(self):
+        backend = RedisBackend(compaction=True)
+
+        t = time.time()
+        for i in range(3):
+            backend.add("timeline", Record(f"record:{i}", self.notification, t + i))
+
+        with backend.digest("timeline", 0) as records:
+            assert [record.key for record in records] == ["record:2", "record:1", "record:0"]
+
+    def test_digest_many_removed_timelines(self):
+        backend = RedisBackend()
+
+        # Both the bulk and the default implementation leave removed timelines unclosed.
+        for digest_many in (backend.digest_many, partial(Backend.digest_many, backend)):
+            self._test_digest_many_removed_timelines(backend, digest_many)
+
+    def _test_digest_many_removed_timelines(self, backend, digest_many):
+        for i in range(2):
+            backend.add(f"timeline:{i}", Record(f"record:{i}", self.notification, time.time()))
+
+        with digest_many(["timeline:0", "timeline:1"], 0) as digests:
+            del digests["timeline:1"]
+
+        assert list(digests) == ["timeline:0"]
+        assert {entry.key for entry in backend.schedule(time.time())} == {"timeline:0"}
+
+        # The removed timeline wasn't closed, and its lock was released.
+        with backend.digest("timeline:1", 0) as records:
+            assert [record.key for record in records] == ["record:1"]
+
+        backend.delete("timeline:0")
+        backend.delete("timeline:1")
+
+    def test_digest_many(self):
+        backend = RedisBackend()
+
+        for i in range(5):
+            backend.add(f"timeline:{i}", Record(f"record:{i}", self.notification, time.time()))
+
+        with backend.digest_many([f"timeline:{i}" for i in range(5)], 0) as digests:
+            assert {
+                key: [record.key for record in records] for key, records in digests.items()
+            } == {f"timeline:{i}": [f"record:{i}"] for i in range(5)}
+
+        # All timelines were moved back to the waiting state, and their locks were released.
+        assert {entry.key for entry in backend.schedule(time.time())} == {
+            f"timeline:{i}" for i in range(5)
+        }
+        for i in range(5):
+            assert not backend.locks.backend.locked(
+                f"d:t:timeline:{i}", routing_key=f"d:t:timeline:{i}"
+            )
+
+        with backend.digest_many([f"timeline:{i}" for i in range(5)], 0) as digests:
+            assert digests == {f"timeline:{i}": [] for i in range(5)}
+
+    def test_digest_many_skips_unavailable_timelines(self):
+        backend = RedisBackend()
+
+        backend.add("timeline:ready", Record("record:1", self.notification, time.time()))
+        backend.add("timeline:locked", Record("record:2", self.notification, time.time()))
+
+        with backend._get_timeline_lock("timeline:locked", duration=30).acquire():
+            with backend.digest_many(
+                ["timeline:ready", "timeline:locked", "timeline:missing"], 0
+            ) as digests:
+                assert list(digests) == ["timeline:ready"]
+
+            # The lock of the skipped timeline is still held.
+            with pytest.raises(UnableToAcquireLock):
+                with backend.digest("timeline:locked", 0):
+                    pass
+
+        with backend.digest("timeline:locked", 0) as records:
+            assert [record.key for record in records] == ["record:2"]
+
+    def test_digest_many_failure_recovery(self):
+        backend = RedisBackend()
+
+        backend.add("timeline", Record("record:1", self.notification, time.time()))
+
+        with pytest.raises(Exception):
+            with backend.digest_many(["timeline"], 0):
+                raise Exception("This causes the digests to not be closed.")
+
+        # The lock was released, and the records are still part of the digest.
+        with backend.digest("timeline", 0) as records:
+            assert [record.key for record in records] == ["record:1"]
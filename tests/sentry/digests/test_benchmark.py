@@ -0,0 +1,49 @@
+import time
+import uuid
+
+import pytest
+
+from sentry.digests.backends.redis import RedisBackend
+from sentry.digests.types import Notification, Record
+from sentry.eventstore.models import Event
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_TIMELINES = 500
+RECORDS_PER_TIMELINE = 5
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("mode", ["digest", "digest_many"])
+def test_benchmark_digest_timelines(mode, benchmark):
+    backend = RedisBackend()
+    event = Event(project_id=1, event_id=uuid.uuid4().hex, group_id=1, data={})
+    notification = Notification(event, (1,), str(uuid.uuid4()))
+    keys = [f"mail:p:1:IssueOwners::{i}" for i in range(NUM_TIMELINES)]
+
+    def setup():
+        t = time.time()
+        for key in keys:
+            for i in range(RECORDS_PER_TIMELINE):
+                backend.add(key, Record(f"record:{i}", notification, t))
+        # Make sure every timeline is ready again, including the digested ones.
+        list(backend.schedule(t + 3600))
+
+    def digest_one_by_one():
+        for key in keys:
+            with backend.digest(key, 0) as records:
+                assert len(records) == RECORDS_PER_TIMELINE
+
+    def digest_many():
+        with backend.digest_many(keys, 0) as digests:
+            assert len(digests) == NUM_TIMELINES
+
+    try:
+        benchmark.pedantic(
+            digest_many if mode == "digest_many" else digest_one_by_one,
+            setup=setup,
+            rounds=5,
+        )
+        benchmark.extra_info["timelines_per_second"] = NUM_TIMELINES / benchmark.stats.stats.mean
+    finally:
+        for key in keys:
+            backend.delete(key)
@@ -0,0 +1,58 @@
+import copy
+import tracemalloc
+
+import pytest
+
+from sentry.eventstore.compressor import deduplicate, deduplicate_stream
+from sentry.testutils.skips import requires_pytest_benchmark
+
+IMAGE_COUNT = 5000
+
+
+def make_native_event(image_count: int) -> dict:
+    """
+    Builds a payload shaped like a minidump-derived native event, which
+    carries one debug image per loaded module.
+    """
+    return {
+        "platform": "native",
+        "debug_meta": {
+            "images": [
+                {
+                    "type": "pe",
+                    "image_addr": hex(0x10000000 + i * 0x10000),
+                    "image_size": 0x10000,
+                    "debug_id": f"{i:08x}-dead-beef-cafe-{i:012x}-1",
+                    "debug_file": f"C:\\\\projects\\\\build\\\\module_{i}.pdb",
+                    "code_id": f"{i:08X}10000",
+                    "code_file": f"C:\\\\Program Files\\\\App\\\\module_{i}.dll",
+                    "arch": "x86_64",
+                }
+                for i in range(image_count)
+            ]
+        },
+    }
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize(
+    "func", [deduplicate, deduplicate_stream], ids=["deduplicate", "deduplicate_stream"]
+)
+def test_benchmark_deduplicate(func, benchmark):
+    event = make_native_event(IMAGE_COUNT)
+
+    def setup():
+        return (copy.deepcopy(event),), {}
+
+    benchmark.pedantic(func, setup=setup, rounds=20)
+
+    data = copy.deepcopy(event)
+    tracemalloc.start()
+    try:
+        func(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    benchmark.extra_info["peak_bytes"] = peak
+    benchmark.extra_info["images_per_second"] = IMAGE_COUNT / benchmark.stats.stats.mean
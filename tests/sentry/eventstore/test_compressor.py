@@ -1,6 +1,8 @@
 import copy
 
-from sentry.eventstore.compressor import assemble, deduplicate
+import orjson
+
+from sentry.eventstore.compressor import assemble, assemble_lazy, deduplicate, deduplicate_stream
 
 
 def _assert_roundtrip(data, assert_extra_keys=None):
@@ -52,3 +54,66 @@ def test_basic():
             }
         },
     )
+
+
+def test_deduplicate_stream_matches_deduplicate():
+    data = {
+        "debug_meta": {
+            "images": [
+                {
+                    "image_addr": "0xdeadbeef",
+                    "debug_file": "C:/Ding/bla.pdb",
+                    "code_file": "C:/Ding/bla.exe",
+                    "debug_id": "1234abcdef",
+                    "code_id": "1234abcdefgggg",
+                },
+                None,
+                {"image_addr": "0xcafe", "debug_id": "abcd"},
+            ]
+        },
+        "message": "hello",
+    }
+
+    for payload in ({}, {"debug_meta": None}, {"debug_meta": {"images": []}}, data):
+        expected_data, expected_extra_keys = deduplicate(copy.deepcopy(payload))
+        new_data, extra_keys = deduplicate_stream(copy.deepcopy(payload))
+
+        assert new_data == expected_data
+        assert set(extra_keys) == set(expected_extra_keys)
+        for checksum, serialized in extra_keys.items():
+            assert serialized == orjson.dumps(expected_extra_keys[checksum])
+
+
+def test_assemble_lazy():
+    data = {
+        "debug_meta": {"images": [{"image_addr": "0xdeadbeef", "debug_id": "1234abcdef"}]},
+        "message": "hello",
+    }
+    new_data, extra_keys = deduplicate_stream(copy.deepcopy(data))
+    requested = []
+
+    def get_extra_keys(checksums):
+        requested.extend(checksums)
+        return extra_keys
+
+    assembled = assemble_lazy(new_data, get_extra_keys)
+    assert assembled["message"] == "hello"
+    assert "debug_meta" in assembled
+    assert requested == []
+
+    assert assembled["debug_meta"] == data["debug_meta"]
+    assert requested == list(extra_keys)
+
+    assert dict(assembled) == data
+    assert requested == list(extra_keys)
+
+
+def test_assemble_lazy_materialize():
+    data = {"debug_meta": {"images": [{"debug_id": "1234abcdef"}]}}
+    new_data, extra_keys = deduplicate(copy.deepcopy(data))
+
+    assembled = assemble_lazy(new_data, lambda checksums: extra_keys)
+    assert len(assembled) == 1
+    assert assembled.materialize() == data
+
+    assert assemble_lazy({"message": "hello"}, lambda checksums: {}) == {"message": "hello"}
@@ -5,11 +5,15 @@ from unittest.mock import MagicMock, patch
 
 from sentry.event_manager import EventManager
 from sentry.grouping.ingest.hashing import (
+    GroupHashBatch,
     _calculate_background_grouping,
     _calculate_event_grouping,
     _calculate_secondary_hashes,
+    get_or_create_grouphashes,
 )
 from sentry.models.group import Group
+from sentry.models.grouphash import GroupHash
+from sentry.models.grouphashmetadata import GroupHashMetadata
 from sentry.projectoptions.defaults import LEGACY_GROUPING_CONFIG
 from sentry.testutils.cases import TestCase
 from sentry.testutils.skips import requires_snuba
@@ -169,3 +173,57 @@ class SecondaryGroupingTest(TestCase):
             mock_capture_exception.assert_called_with(secondary_grouping_error)
             # This proves the secondary grouping crash didn't crash the overall grouping process
             assert event.group
+
+
+class GroupHashBatchTest(TestCase):
+    def test_creates_missing_grouphashes(self):
+        existing = GroupHash.objects.create(project=self.project, hash="a" * 32)
+
+        grouphashes = GroupHashBatch().get_or_create(self.project, ["b" * 32, "a" * 32])
+
+        assert [gh.hash for gh in grouphashes] == ["b" * 32, "a" * 32]
+        assert grouphashes[1].id == existing.id
+        assert grouphashes[0].id is not None
+        assert GroupHash.objects.filter(project=self.project).count() == 2
+
+    def test_one_query_per_project(self):
+        other_project = self.create_project()
+        GroupHash.objects.create(project=self.project, hash="a" * 32)
+        GroupHash.objects.create(project=self.project, hash="b" * 32)
+        GroupHash.objects.create(project=other_project, hash="a" * 32)
+
+        batch = GroupHashBatch()
+        with self.assertNumQueries(2):
+            batch.prefetch(
+                [
+                    (self.project, ["a" * 32]),
+                    (other_project, ["a" * 32]),
+                    (self.project, ["b" * 32]),
+                ]
+            )
+
+        # Everything is served from the batch from now on
+        with self.assertNumQueries(0):
+            first = batch.get_or_create(self.project, ["a" * 32, "b" * 32])
+            second = batch.get_or_create(other_project, ["a" * 32])
+
+        assert {gh.project_id for gh in first} == {self.project.id}
+        assert second[0].project_id == other_project.id
+
+    def test_creates_metadata_for_new_grouphashes(self):
+        existing = GroupHash.objects.create(project=self.project, hash="a" * 32)
+
+        with self.feature("organizations:grouphash-metadata-creation"):
+            grouphashes = GroupHashBatch().get_or_create(self.project, ["a" * 32, "b" * 32])
+
+        assert not GroupHashMetadata.objects.filter(grouphash=existing).exists()
+        assert GroupHashMetadata.objects.filter(grouphash=grouphashes[1]).exists()
+
+    def test_get_or_create_grouphashes_matches_unbatched(self):
+        hashes = ["a" * 32, "b" * 32]
+        grouphashes = get_or_create_grouphashes(self.project, hashes)
+
+        with self.options({"grouping.grouphash.batched-lookup.enabled": True}):
+            batched_grouphashes = get_or_create_grouphashes(self.project, hashes)
+
+        assert batched_grouphashes == grouphashes
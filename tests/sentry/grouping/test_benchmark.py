@@ -1,22 +1,26 @@
+import contextlib
+from unittest import mock
+
 import pytest
 
 from sentry.grouping.api import get_default_grouping_config_dict
+from sentry.grouping.parameterization import (
+    DEFAULT_PARAMETERIZATION_REGEXES_MAP,
+    Parameterizer,
+    UniqueIdExperiment,
+    UniqueIdFastExperiment,
+    parameterization_memo,
+)
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.safe import get_path
 from tests.sentry.grouping import grouping_input as grouping_inputs
+from tests.sentry.grouping.test_parameterization import UNIQ_ID_CASES
 
 CONFIGS = {key: get_default_grouping_config_dict(key) for key in sorted(CONFIGURATIONS.keys())}
 
 
-def benchmark_available() -> bool:
-    try:
-        __import__("pytest_benchmark")
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_pytest_benchmark
 @pytest.mark.parametrize(
     "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
 )
@@ -37,3 +41,60 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+def _iter_messages(data):
+    for key in ("message", "logentry"):
+        value = data.get(key)
+        if isinstance(value, dict):
+            value = value.get("formatted") or value.get("message")
+        if isinstance(value, str):
+            yield value
+    for value in get_path(data, "exception", "values", filter=True) or ():
+        if isinstance(value.get("value"), str):
+            yield value["value"]
+
+
+PARAMETERIZATION_CORPUS = [
+    message for grouping_input in grouping_inputs for message in _iter_messages(grouping_input.data)
+] + [case[1] for case in UNIQ_ID_CASES]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("engine", ["current", "fast"])
+def test_benchmark_parameterization(engine, benchmark):
+    def make_parameterizer(experiment):
+        return Parameterizer(
+            regex_pattern_keys=tuple(DEFAULT_PARAMETERIZATION_REGEXES_MAP),
+            experiments=(experiment,),
+        )
+
+    if engine == "current":
+        parameterizer = make_parameterizer(UniqueIdExperiment)
+        # Disable the prefilter and the memo to measure the plain combined regex path.
+        parameterizer._prefilter_regex = None
+        memo_patches = [
+            mock.patch.object(parameterization_memo, "get", return_value=None),
+            mock.patch.object(parameterization_memo, "set"),
+        ]
+    else:
+        parameterizer = make_parameterizer(UniqueIdFastExperiment)
+        memo_patches = []
+
+    def run():
+        return [parameterizer.parameterize_all(message) for message in PARAMETERIZATION_CORPUS]
+
+    with contextlib.ExitStack() as stack:
+        for patch in memo_patches:
+            stack.enter_context(patch)
+        results = benchmark.pedantic(run, rounds=10)
+
+    expected = [
+        make_parameterizer(UniqueIdExperiment).parameterize_all(message)
+        for message in PARAMETERIZATION_CORPUS
+    ]
+    agreement = sum(a == b for a, b in zip(results, expected)) / len(expected)
+    benchmark.extra_info["agreement"] = agreement
+    # The estimate doesn't have to match the tokenizer everywhere, but must not change how most
+    # messages are grouped.
+    assert agreement >= 0.95
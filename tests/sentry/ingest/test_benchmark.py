@@ -0,0 +1,52 @@
+import random
+import tracemalloc
+
+import pytest
+
+from sentry.ingest.transaction_clusterer.base import ReplacementRule
+from sentry.ingest.transaction_clusterer.tree import TreeClusterer
+from sentry.testutils.skips import requires_pytest_benchmark
+
+MERGE_THRESHOLD = 200
+RESOURCES = ["users", "orgs", "projects", "posts", "comments", "settings", "teams", "files"]
+
+
+def build_transaction_names(count: int) -> list[str]:
+    """
+    Builds REST style URLs alternating between resource names and (mostly high-cardinality)
+    identifiers, like `/orgs/sentry/projects/1234/settings`.
+    """
+    rng = random.Random(count)
+    names = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 4)):
+            parts.append(rng.choice(RESOURCES))
+            if rng.random() < 0.8:
+                parts.append(f"{rng.getrandbits(40):x}")
+        names.append("/" + "/".join(parts))
+    return names
+
+
+def build_rules(names: list[str]) -> list[ReplacementRule]:
+    clusterer = TreeClusterer(merge_threshold=MERGE_THRESHOLD)
+    clusterer.add_input(names)
+    return clusterer.get_rules()
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("num_names", [10_000, 100_000])
+def test_benchmark_tree_clusterer(num_names, benchmark):
+    names = build_transaction_names(num_names)
+
+    rules = benchmark.pedantic(build_rules, args=(names,), rounds=3)
+    assert rules
+
+    tracemalloc.start()
+    try:
+        clusterer = TreeClusterer(merge_threshold=MERGE_THRESHOLD)
+        clusterer.add_input(names)
+        benchmark.extra_info["tree_bytes"] = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
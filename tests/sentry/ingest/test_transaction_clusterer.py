@@ -86,6 +86,15 @@ def test_clusterer_doesnt_generate_invalid_rules():
     assert clusterer.get_rules() == []
 
 
+def test_tree_memory_is_shared_between_branches():
+    clusterer = TreeClusterer(merge_threshold=3)
+    clusterer.add_input([f"/users/{i}/posts" for i in range(3)])
+    children = clusterer._tree.children[""].children["users"].children
+    post_keys = [next(iter(child.children)) for child in children.values()]
+    assert post_keys[0] is post_keys[1] is post_keys[2]
+    assert clusterer.get_rules() == ["/users/*/**"]
+
+
 @mock.patch("sentry.ingest.transaction_clusterer.datasource.redis.MAX_SET_SIZE", 5)
 def test_collection():
     org = Organization(pk=666)
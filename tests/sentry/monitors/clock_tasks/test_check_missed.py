@@ -11,6 +11,7 @@ from sentry.constants import ObjectStatus
 from sentry.monitors.clock_tasks.check_missed import (
     dispatch_check_missing,
     mark_environment_missing,
+    mark_environments_missing,
 )
 from sentry.monitors.clock_tasks.producer import MONITORS_CLOCK_TASKS_CODEC
 from sentry.monitors.models import (
@@ -603,6 +604,75 @@ class MonitorClockTasksCheckMissingTest(TestCase):
             monitor_environment=successful_monitor_environment.id, status=CheckInStatus.MISSED
         ).exists()
 
+    def test_mark_environments_missing(self):
+        org = self.create_organization()
+        project = self.create_project(organization=org)
+
+        ts = timezone.now().replace(second=0, microsecond=0)
+
+        def create_monitor_environment(schedule_type, schedule, **kwargs):
+            monitor = Monitor.objects.create(
+                organization_id=org.id,
+                project_id=project.id,
+                type=MonitorType.CRON_JOB,
+                config={
+                    "schedule_type": schedule_type,
+                    "schedule": schedule,
+                    "checkin_margin": None,
+                    "max_runtime": None,
+                },
+            )
+            return MonitorEnvironment.objects.create(
+                **{
+                    "monitor": monitor,
+                    "environment_id": self.environment.id,
+                    "last_checkin": ts - timedelta(minutes=2),
+                    "next_checkin": ts - timedelta(minutes=1),
+                    "next_checkin_latest": ts,
+                    "status": MonitorStatus.OK,
+                    **kwargs,
+                }
+            )
+
+        missed = [
+            create_monitor_environment(ScheduleType.CRONTAB, "* * * * *"),
+            create_monitor_environment(ScheduleType.INTERVAL, [1, "minute"]),
+        ]
+        # The invalid schedule causes an exception, which doesn't fail the batch
+        failing = create_monitor_environment(ScheduleType.INTERVAL, [-2, "minute"])
+        disabled = create_monitor_environment(
+            ScheduleType.CRONTAB, "* * * * *", status=MonitorStatus.DISABLED
+        )
+        not_missed = create_monitor_environment(
+            ScheduleType.CRONTAB,
+            "* * * * *",
+            next_checkin=ts,
+            next_checkin_latest=ts + timedelta(minutes=1),
+        )
+
+        with self.assertLogs("sentry.monitors.clock_tasks.check_missed", "ERROR"):
+            mark_environments_missing(
+                [missed[0].id, failing.id, missed[1].id, disabled.id, not_missed.id], ts
+            )
+
+        for monitor_environment in missed:
+            monitor_environment.refresh_from_db()
+            assert monitor_environment.status == MonitorStatus.ERROR
+            assert monitor_environment.next_checkin == ts
+            missed_checkin = MonitorCheckIn.objects.get(
+                monitor_environment=monitor_environment.id, status=CheckInStatus.MISSED
+            )
+            assert missed_checkin.expected_time == ts - timedelta(minutes=1)
+
+        for monitor_environment in (failing, disabled, not_missed):
+            assert not MonitorEnvironment.objects.filter(
+                id=monitor_environment.id, status=MonitorStatus.ERROR
+            ).exists()
+        for monitor_environment in (disabled, not_missed):
+            assert not MonitorCheckIn.objects.filter(
+                monitor_environment=monitor_environment.id
+            ).exists()
+
     @mock.patch("sentry.monitors.clock_tasks.check_missed.produce_task")
     def test_missed_checkin_backlog_handled(self, mock_produce_task):
         """
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest import mock
 
 from arroyo.backends.kafka import KafkaPayload
@@ -68,3 +68,51 @@ def test_dispatch_mark_timeout(mock_mark_checkin_timeout):
 
     assert mock_mark_checkin_timeout.call_count == 1
     assert mock_mark_checkin_timeout.mock_calls[0] == mock.call(1, ts)
+
+
+@mock.patch("sentry.monitors.consumers.clock_tasks_consumer.mark_checkin_timeout")
+@mock.patch("sentry.monitors.consumers.clock_tasks_consumer.mark_environments_missing")
+def test_batched_mark_missing(mock_mark_environments_missing, mock_mark_checkin_timeout):
+    ts = timezone.now().replace(second=0, microsecond=0)
+    next_ts = ts + timedelta(minutes=1)
+
+    factory = MonitorClockTasksStrategyFactory(mode="batched", max_batch_size=7)
+    consumer = factory.create_with_partitions(mock.Mock(), {partition: 0})
+
+    def mark_missing(ts: datetime, monitor_environment_id: int) -> MonitorsClockTasks:
+        return {
+            "type": "mark_missing",
+            "ts": ts.timestamp(),
+            "monitor_environment_id": monitor_environment_id,
+        }
+
+    tasks: list[MonitorsClockTasks] = [
+        mark_missing(ts, 1),
+        mark_missing(ts, 2),
+        mark_missing(ts, 3),
+        # A second task for the same environment
+        mark_missing(ts, 1),
+        {
+            "type": "mark_timeout",
+            "ts": ts.timestamp(),
+            "monitor_environment_id": 4,
+            "checkin_id": 1,
+        },
+        mark_missing(ts, 5),
+        mark_missing(next_ts, 6),
+    ]
+    calls = mock.Mock()
+    calls.attach_mock(mock_mark_environments_missing, "mark_environments_missing")
+    calls.attach_mock(mock_mark_checkin_timeout, "mark_checkin_timeout")
+
+    for task in tasks:
+        send_task(consumer, ts, task)
+    consumer.poll()
+
+    assert calls.mock_calls == [
+        mock.call.mark_environments_missing([1, 2, 3], ts),
+        mock.call.mark_environments_missing([1], ts),
+        mock.call.mark_checkin_timeout(1, ts),
+        mock.call.mark_environments_missing([5], ts),
+        mock.call.mark_environments_missing([6], next_ts),
+    ]
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from sentry.monitors.clock_tasks.check_missed import (
+    mark_environment_missing,
+    mark_environments_missing,
+)
+from sentry.monitors.models import (
+    Monitor,
+    MonitorEnvironment,
+    MonitorStatus,
+    MonitorType,
+    ScheduleType,
+)
+from sentry.monitors.schedule import crontab_tick_memo
+from sentry.testutils.factories import Factories
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_MONITORS = 100
+# The crontabs of the monitors missing at the top of the hour
+CRONTABS = ["0 * * * *", "0 */2 * * *", "0 0 * * *", "0 9 * * 1-5"]
+
+
+def mark_each_missing(monitor_environment_ids, ts):
+    for monitor_environment_id in monitor_environment_ids:
+        mark_environment_missing(monitor_environment_id, ts)
+
+
+@requires_pytest_benchmark
+@django_db_all
+@pytest.mark.parametrize("mode", ["serial", "batched"])
+def test_benchmark_mark_missing(mode, benchmark):
+    """Marks monitors missed at the top of the hour, the way a clock tick dispatches them."""
+    project = Factories.create_project(organization=Factories.create_organization())
+    environment = Factories.create_environment(project=project)
+    ts = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+    monitors = Monitor.objects.bulk_create(
+        [
+            Monitor(
+                organization_id=project.organization_id,
+                project_id=project.id,
+                type=MonitorType.CRON_JOB,
+                slug=f"monitor-{i}",
+                name=f"Monitor {i}",
+                config={
+                    "schedule_type": ScheduleType.CRONTAB,
+                    "schedule": CRONTABS[i % len(CRONTABS)],
+                    "checkin_margin": None,
+                    "max_runtime": None,
+                },
+            )
+            for i in range(NUM_MONITORS)
+        ]
+    )
+
+    def setup():
+        crontab_tick_memo.clear()
+        MonitorEnvironment.objects.all().delete()
+        monitor_environments = MonitorEnvironment.objects.bulk_create(
+            [
+                MonitorEnvironment(
+                    monitor=monitor,
+                    environment_id=environment.id,
+                    last_checkin=ts - timedelta(hours=2),
+                    next_checkin=ts - timedelta(hours=1),
+                    next_checkin_latest=ts,
+                    status=MonitorStatus.OK,
+                )
+                for monitor in monitors
+            ]
+        )
+        return ([monitor_environment.id for monitor_environment in monitor_environments], ts), {}
+
+    mark_missing = mark_environments_missing if mode == "batched" else mark_each_missing
+    # Issue occurrences are produced to Kafka, which batching doesn't change.
+    with mock.patch("sentry.monitors.logic.mark_failed.create_issue_platform_occurrence"):
+        benchmark.pedantic(mark_missing, setup=setup, rounds=8)
+
+    assert not MonitorEnvironment.objects.filter(next_checkin_latest__lte=ts).exists()
@@ -1,9 +1,16 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 import pytest
-
-from sentry.monitors.schedule import get_next_schedule, get_prev_schedule
+from croniter import croniter
+
+from sentry.monitors.schedule import (
+    SCHEDULE_TABLE_SIZE,
+    CrontabTickMemo,
+    crontab_tick_memo,
+    get_next_schedule,
+    get_prev_schedule,
+)
 from sentry.monitors.types import CrontabSchedule, IntervalSchedule
 
 
@@ -83,3 +90,53 @@ def test_get_prev_schedule():
 
     # 2 hour interval: (start = 1:30) 5:35 -> 5:30
     assert get_prev_schedule(start_ts, t(5, 35), IntervalSchedule(2, "hour")) == t(5, 30)
+
+
+@pytest.mark.parametrize("tz", ["UTC", "Asia/Kolkata", "America/New_York", "Europe/Berlin"])
+@pytest.mark.parametrize(
+    "crontab", ["0 * * * *", "*/15 * * * *", "30 2 * * *", "0 2 * * 1-5", "0 0 1 1 *"]
+)
+def test_memoized_schedule_matches_croniter(tz, crontab):
+    schedule = CrontabSchedule(crontab)
+    # Steps through both daylight saving time transitions of the year
+    reference_ts = datetime(2024, 1, 1, 0, 7, 0, tzinfo=ZoneInfo(tz))
+    while reference_ts.year == 2024:
+        expected_next = croniter(crontab, reference_ts).get_next(datetime)
+        expected_prev = croniter(crontab, reference_ts).get_prev(datetime)
+
+        next_ts = get_next_schedule(reference_ts, schedule)
+        prev_ts = get_prev_schedule(reference_ts, reference_ts, schedule)
+        assert (next_ts, next_ts.utcoffset()) == (expected_next, expected_next.utcoffset())
+        assert (prev_ts, prev_ts.utcoffset()) == (expected_prev, expected_prev.utcoffset())
+
+        reference_ts += timedelta(hours=31, minutes=13)
+
+
+def test_crontab_tick_memo():
+    memo = CrontabTickMemo(max_size=2)
+
+    ticks = memo.get_ticks("0 * * * *", t(5, 30))
+    assert ticks is not None
+    assert len(ticks) == SCHEDULE_TABLE_SIZE + 1
+    assert ticks[:3] == [t(5, 0), t(6, 0), t(7, 0)]
+
+    # References within the ticks are looked up in the same table
+    assert memo.get_ticks("0 * * * *", t(9, 0)) is ticks
+    assert memo.get_ticks("0 * * * *", t(5, 0)) is not ticks
+
+    memo.get_ticks("30 * * * *", t(5, 30))
+    memo.get_ticks("15 * * * *", t(5, 30))
+    assert len(memo._tables) == 2
+
+    # Not memoized across daylight saving time transitions
+    assert memo.get_ticks("0 * * * *", datetime(2024, 3, 10, tzinfo=ZoneInfo("US/Eastern"))) is None
+
+
+def test_get_next_schedule_memoized():
+    crontab_tick_memo.clear()
+    get_next_schedule(t(5, 30), CrontabSchedule("0 * * * *"))
+    ticks = crontab_tick_memo.get_ticks("0 * * * *", t(5, 30))
+
+    assert get_next_schedule(t(8, 15), CrontabSchedule("0 * * * *")) == t(9, 0)
+    assert get_prev_schedule(t(1, 0), t(8, 15), CrontabSchedule("0 * * * *")) == t(8, 0)
+    assert crontab_tick_memo.get_ticks("0 * * * *", t(8, 15)) is ticks
@@ -0,0 +1,69 @@
+import random
+from unittest import mock
+
+import pytest
+
+from sentry.nodestore.base import lru_cache
+from sentry.testutils.helpers import override_options
+from sentry.testutils.skips import requires_pytest_benchmark
+from tests.sentry.nodestore.bigtable.test_backend import MockedBigtableNodeStorage
+
+NODE_COUNT = 2000
+TRACE_LENGTH = 20000
+
+
+def build_access_trace() -> list[list[str]]:
+    """
+    Builds a deterministic access trace that mimics how post processing, rule
+    processing and the event details endpoints load events: a small set of
+    recent events is loaded over and over again, mostly one by one and
+    occasionally in batches.
+    """
+    rng = random.Random(1234)
+    node_ids = [f"{i:032x}" for i in range(NODE_COUNT)]
+    trace = []
+    for _ in range(TRACE_LENGTH):
+        if rng.random() < 0.1:
+            trace.append([node_ids[int(rng.paretovariate(1.2)) % NODE_COUNT] for _ in range(10)])
+        else:
+            trace.append([node_ids[int(rng.paretovariate(1.2)) % NODE_COUNT]])
+    return trace
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("max_bytes", [0, 1024 * 1024, 16 * 1024 * 1024])
+def test_benchmark_replay_access_trace(max_bytes, benchmark):
+    ns = MockedBigtableNodeStorage(project="test")
+    ns.bootstrap()
+    payload = {"exception": {"values": [{"type": "Error", "value": "x" * 2000}]}}
+    trace = build_access_trace()
+
+    def replay():
+        lru_cache.clear()
+        for id_list in trace:
+            if len(id_list) == 1:
+                ns.get(id_list[0])
+            else:
+                ns.get_multi(id_list)
+
+    with override_options(
+        {
+            "nodestore.set-subkeys.enable-set-cache-item": False,
+            "nodestore.lru-cache.max-bytes": max_bytes,
+        }
+    ):
+        for i in range(NODE_COUNT):
+            ns.set(f"{i:032x}", payload)
+
+        benchmark.pedantic(replay, rounds=3)
+
+        # Replay once more outside of the measurement to record the hit rate.
+        with mock.patch("sentry.nodestore.base.metrics.incr") as incr:
+            replay()
+
+    hits = sum(
+        c.kwargs.get("amount", 1)
+        for c in incr.call_args_list
+        if c.args == ("nodestore.lru",) and c.kwargs["tags"]["result"] == "hit"
+    )
+    benchmark.extra_info["hit_rate"] = hits / sum(len(id_list) for id_list in trace)
@@ -3,9 +3,11 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 `ns` fixture to have it tested.
 """
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
 
+from sentry.nodestore.base import lru_cache
 from sentry.nodestore.django.backend import DjangoNodeStorage
 from sentry.testutils.helpers import override_options
 from tests.sentry.nodestore.bigtable.test_backend import (
@@ -97,3 +99,35 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.lru-cache.max-bytes": 1024 * 1024,
+    }
+)
+def test_lru_cache(ns):
+    lru_cache.clear()
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+
+    with mock.patch.object(ns, "_get_bytes", side_effect=AssertionError("not cached")):
+        assert ns.get("node_1") == {"foo": "a"}
+        assert ns.get("node_1", subkey="other") == {"foo": "b"}
+        assert ns.get_multi(["node_1"]) == {"node_1": {"foo": "a"}}
+
+    # every caller gets their own copy of the payload
+    ns.get("node_1")["foo"] = "mutated"
+    assert ns.get("node_1") == {"foo": "a"}
+
+    ns.delete("node_1")
+    assert ns.get("node_1") is None
+
+    ns.set("node_2", {"foo": "c"})
+    ns.set("node_3", {"foo": "d"})
+    lru_cache.clear()
+    assert ns.get_multi(["node_2", "node_3"]) == {"node_2": {"foo": "c"}, "node_3": {"foo": "d"}}
+    assert len(lru_cache) == 2
+
+    ns.delete_multi(["node_2", "node_3"])
+    assert len(lru_cache) == 0
@@ -0,0 +1,63 @@
+from unittest import mock
+
+from sentry.nodestore.lru import NodeLRUCache
+
+
+def test_get_set():
+    cache = NodeLRUCache()
+    cache.set("a", b"aaaa", ttl=60, max_bytes=100)
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "b"]) == {"a": b"aaaa"}
+    assert cache.size == 4
+
+
+def test_evicts_least_recently_used():
+    cache = NodeLRUCache()
+    cache.set("a", b"aaaa", ttl=60, max_bytes=10)
+    cache.set("b", b"bbbb", ttl=60, max_bytes=10)
+    # touch "a" so that "b" becomes the least recently used item
+    assert cache.get("a") == b"aaaa"
+    cache.set("c", b"cccc", ttl=60, max_bytes=10)
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": b"aaaa", "c": b"cccc"}
+    assert cache.size == 8
+
+
+def test_skips_oversized_items():
+    cache = NodeLRUCache()
+    cache.set("a", b"aaaa", ttl=60, max_bytes=10)
+    cache.set("b", b"b" * 11, ttl=60, max_bytes=10)
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("b") is None
+
+
+def test_overwrite_updates_size():
+    cache = NodeLRUCache()
+    cache.set("a", b"aaaa", ttl=60, max_bytes=10)
+    cache.set("a", b"aa", ttl=60, max_bytes=10)
+    assert cache.get("a") == b"aa"
+    assert cache.size == 2
+
+
+def test_expiry():
+    cache = NodeLRUCache()
+    with mock.patch("sentry.nodestore.lru.time.monotonic", return_value=100.0):
+        cache.set("a", b"aaaa", ttl=10, max_bytes=10)
+    with mock.patch("sentry.nodestore.lru.time.monotonic", return_value=109.0):
+        assert cache.get("a") == b"aaaa"
+    with mock.patch("sentry.nodestore.lru.time.monotonic", return_value=110.0):
+        assert cache.get("a") is None
+    assert cache.size == 0
+    assert len(cache) == 0
+
+
+def test_delete():
+    cache = NodeLRUCache()
+    cache.set("a", b"aaaa", ttl=60, max_bytes=100)
+    cache.set("b", b"bbbb", ttl=60, max_bytes=100)
+    cache.set("c", b"cccc", ttl=60, max_bytes=100)
+    cache.delete("a")
+    cache.delete_many(["b", "missing"])
+    assert cache.get_many(["a", "b", "c"]) == {"c": b"cccc"}
+    assert cache.size == 4
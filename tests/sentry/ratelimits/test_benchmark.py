@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from sentry.ratelimits.sliding_windows import Quota, RedisSlidingWindowRateLimiter, RequestedQuota
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_ORGS = 200
+NUM_DECISIONS = 5_000
+BATCH_SIZE = 100
+QUOTAS = [
+    Quota(window_seconds=3600, granularity_seconds=60, limit=1_000_000),
+    Quota(window_seconds=60, granularity_seconds=10, limit=100_000),
+]
+
+
+def build_requests() -> list[RequestedQuota]:
+    """Quota requests of a stream of messages, mostly from a few hot orgs."""
+    rng = random.Random(NUM_DECISIONS)
+    return [
+        RequestedQuota(
+            prefix=f"benchmark-org-{int(rng.paretovariate(1.2)) % NUM_ORGS}",
+            requested=1,
+            quotas=QUOTAS,
+        )
+        for _ in range(NUM_DECISIONS)
+    ]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("mode", ["per_request", "bulk", "prefetch"])
+def test_benchmark_quota_decisions(mode, benchmark):
+    limiter = RedisSlidingWindowRateLimiter(prefetch=50 if mode == "prefetch" else 0)
+    requests = build_requests()
+    batches = [[request] for request in requests]
+
+    def decide():
+        timestamp = 1_000_000
+        if mode == "bulk":
+            for offset in range(0, len(batches), BATCH_SIZE):
+                chunk = batches[offset : offset + BATCH_SIZE]
+                timestamp, grants = limiter.check_within_quotas_bulk(chunk, timestamp)
+                limiter.use_quotas_bulk(chunk, grants, timestamp)
+        else:
+            for request in requests:
+                limiter.check_and_use_quotas([request], timestamp)
+
+    benchmark.pedantic(decide, rounds=3, iterations=1)
+    benchmark.extra_info["decisions_per_second"] = NUM_DECISIONS / benchmark.stats.stats.mean
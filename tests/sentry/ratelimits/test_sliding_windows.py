@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 
 from sentry.ratelimits.sliding_windows import (
@@ -71,3 +73,114 @@ def test_basic(limiter):
         )
 
         assert resp == [GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)]
+
+
+def test_bulk(limiter):
+    org_quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=5)]
+    global_quota = Quota(window_seconds=10, granularity_seconds=1, limit=8, prefix_override="all")
+    batches = [
+        [
+            RequestedQuota(prefix=f"org:{org_id}", requested=3, quotas=org_quotas),
+            RequestedQuota(prefix=f"org:{org_id}", requested=3, quotas=[global_quota]),
+        ]
+        for org_id in range(3)
+    ]
+
+    with mock.patch.object(limiter.client, "pipeline", wraps=limiter.client.pipeline) as pipeline:
+        timestamp, grants = limiter.check_within_quotas_bulk(batches, TIMESTAMP_OFFSET)
+        assert pipeline.call_count == 1
+
+    assert timestamp == TIMESTAMP_OFFSET
+    assert [[grant.granted for grant in batch] for batch in grants] == [[3, 3], [3, 3], [3, 2]]
+
+    limiter.use_quotas_bulk(batches, grants, timestamp)
+    _, grants = limiter.check_within_quotas_bulk(batches, TIMESTAMP_OFFSET + 1)
+    assert [[grant.granted for grant in batch] for batch in grants] == [[2, 0], [2, 0], [2, 0]]
+
+
+def test_prefetch():
+    limiter = RedisSlidingWindowRateLimiter(prefetch=4)
+    quotas = [Quota(window_seconds=10, granularity_seconds=5, limit=10)]
+    request = RequestedQuota(prefix="prefetch", requested=1, quotas=quotas)
+
+    with mock.patch.object(
+        limiter.impl, "check_within_quotas", wraps=limiter.impl.check_within_quotas
+    ) as check_within_quotas:
+        granted = [
+            limiter.check_and_use_quotas([request], TIMESTAMP_OFFSET)[0].granted for _ in range(12)
+        ]
+        # Every redis check reserves 4 tokens for the following 4 requests, until
+        # the quota is exhausted
+        assert check_within_quotas.call_count == 4
+
+    assert granted == [1] * 10 + [0] * 2
+
+    # Prefetched tokens were consumed in redis
+    limiter.prefetch = 0
+    assert limiter.check_within_quotas([request], TIMESTAMP_OFFSET)[1] == [
+        GrantedQuota(prefix="prefetch", granted=0, reached_quotas=quotas)
+    ]
+
+
+def test_prefetch_lease_expires():
+    limiter = RedisSlidingWindowRateLimiter(prefetch=4)
+    quotas = [Quota(window_seconds=10, granularity_seconds=5, limit=100)]
+    request = RequestedQuota(prefix="prefetch-expires", requested=2, quotas=quotas)
+
+    with mock.patch.object(
+        limiter.impl, "check_within_quotas", wraps=limiter.impl.check_within_quotas
+    ) as check_within_quotas:
+        limiter.check_and_use_quotas([request], TIMESTAMP_OFFSET)
+        limiter.check_and_use_quotas([request], TIMESTAMP_OFFSET + 4)
+        assert check_within_quotas.call_count == 1
+
+        # The tokens were prefetched for a granule which is over
+        limiter.check_and_use_quotas([request], TIMESTAMP_OFFSET + 5)
+        assert check_within_quotas.call_count == 2
+
+        limiter.check_and_use_quotas([request], TIMESTAMP_OFFSET + 5)
+        limiter.check_and_use_quotas([request], TIMESTAMP_OFFSET + 5)
+        assert check_within_quotas.call_count == 2
+
+        # All prefetched tokens are used up
+        limiter.check_and_use_quotas([request], TIMESTAMP_OFFSET + 5)
+        assert check_within_quotas.call_count == 3
+
+
+def test_prefetch_not_used():
+    limiter = RedisSlidingWindowRateLimiter(prefetch=4)
+    quotas = [Quota(window_seconds=10, granularity_seconds=5, limit=100)]
+    request = RequestedQuota(prefix="prefetch-not-used", requested=2, quotas=quotas)
+
+    # Tokens are only prefetched once the grant is used
+    limiter.check_within_quotas([request], TIMESTAMP_OFFSET)
+    with mock.patch.object(
+        limiter.impl, "check_within_quotas", wraps=limiter.impl.check_within_quotas
+    ) as check_within_quotas:
+        limiter.check_within_quotas([request], TIMESTAMP_OFFSET)
+        assert check_within_quotas.call_count == 1
+
+
+def test_prefetch_prefix_override():
+    limiter = RedisSlidingWindowRateLimiter(prefetch=4)
+    quotas = [
+        Quota(window_seconds=10, granularity_seconds=5, limit=100),
+        Quota(window_seconds=10, granularity_seconds=5, limit=3, prefix_override="global"),
+    ]
+    requests = [
+        RequestedQuota(prefix=f"prefetch-override-{i}", requested=1, quotas=quotas)
+        for i in range(2)
+    ]
+
+    # The global quota is shared by both prefixes, so no tokens are leased
+    # to either of them
+    with mock.patch.object(
+        limiter.impl, "check_within_quotas", wraps=limiter.impl.check_within_quotas
+    ) as check_within_quotas:
+        granted = [
+            limiter.check_and_use_quotas([request], TIMESTAMP_OFFSET)[0].granted
+            for request in requests * 2
+        ]
+        assert check_within_quotas.call_count == 4
+
+    assert granted == [1, 1, 1, 0]
@@ -0,0 +1,95 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from sentry.models.rule import Rule
+from sentry.rules.conditions.event_frequency import ComparisonType
+from sentry.rules.processing.delayed_processing import (
+    generate_unique_queries,
+    get_rules_to_fire,
+    get_rules_to_fire_columnar,
+)
+from sentry.testutils.skips import requires_pytest_benchmark
+
+ENVIRONMENT_ID = 1
+NUM_RULES = 20
+COUNT_CONDITION = {
+    "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+    "value": 50,
+    "interval": "1h",
+}
+PERCENT_CONDITION = {
+    **COUNT_CONDITION,
+    "comparisonType": ComparisonType.PERCENT,
+    "comparisonInterval": "1d",
+    "value": 20,
+}
+UNIQUE_USER_CONDITION = {
+    "id": "sentry.rules.conditions.event_frequency.EventUniqueUserFrequencyCondition",
+    "value": 10,
+    "interval": "1h",
+}
+
+
+def build_delayed_processing_input(num_groups):
+    """
+    A project with `NUM_RULES` rules mixing count, percent and unique user conditions, every rule
+    applying to a random tenth of `num_groups` groups, and random query results for every group.
+    """
+    rng = random.Random(num_groups)
+    group_ids = list(range(1, num_groups + 1))
+
+    rules_to_slow_conditions = defaultdict(list)
+    rules_to_groups = defaultdict(set)
+    for rule_id in range(1, NUM_RULES + 1):
+        conditions = [
+            [COUNT_CONDITION],
+            [PERCENT_CONDITION],
+            [COUNT_CONDITION, UNIQUE_USER_CONDITION],
+            [COUNT_CONDITION, PERCENT_CONDITION, UNIQUE_USER_CONDITION],
+        ][rule_id % 4]
+        rule = Rule(
+            id=rule_id,
+            project_id=1,
+            environment_id=ENVIRONMENT_ID,
+            data={
+                "conditions": conditions,
+                "action_match": "all" if rule_id % 2 else "any",
+            },
+        )
+        rules_to_slow_conditions[rule].extend(conditions)
+        rules_to_groups[rule_id].update(rng.sample(group_ids, max(1, num_groups // 10)))
+
+    condition_group_results = {}
+    for condition in (COUNT_CONDITION, PERCENT_CONDITION, UNIQUE_USER_CONDITION):
+        for unique_query in generate_unique_queries(condition, ENVIRONMENT_ID):
+            condition_group_results[unique_query] = {
+                group_id: rng.randint(0, 100) for group_id in group_ids
+            }
+
+    return condition_group_results, rules_to_slow_conditions, rules_to_groups
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("num_groups", [1_000, 10_000, 100_000])
+@pytest.mark.parametrize("mode", ["rowwise", "columnar"])
+def test_benchmark_get_rules_to_fire(mode, num_groups, benchmark):
+    (
+        condition_group_results,
+        rules_to_slow_conditions,
+        rules_to_groups,
+    ) = build_delayed_processing_input(num_groups)
+    get_rules_to_fire_fn = get_rules_to_fire_columnar if mode == "columnar" else get_rules_to_fire
+
+    rules_to_fire = benchmark.pedantic(
+        get_rules_to_fire_fn,
+        args=(condition_group_results, rules_to_slow_conditions, rules_to_groups, 1),
+        rounds=3,
+    )
+
+    assert rules_to_fire == get_rules_to_fire(
+        condition_group_results, rules_to_slow_conditions, rules_to_groups, 1
+    )
+    benchmark.extra_info["rule_group_pairs"] = sum(len(g) for g in rules_to_groups.values())
+    benchmark.extra_info["fired_pairs"] = sum(len(g) for g in rules_to_fire.values())
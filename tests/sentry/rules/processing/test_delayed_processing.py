@@ -31,6 +31,7 @@ from sentry.rules.processing.delayed_processing import (
     get_condition_query_groups,
     get_group_to_groupevent,
     get_rules_to_fire,
+    get_rules_to_fire_columnar,
     get_rules_to_groups,
     get_slow_conditions,
     parse_rulegroup_to_event_data,
@@ -573,6 +574,83 @@ class GetRulesToFireTest(TestCase):
         assert result[rule2] == {self.group2.id}
 
 
+class GetRulesToFireColumnarTest(TestCase):
+    def setUp(self):
+        self.project = self.create_project()
+        self.environment = self.create_environment(project=self.project)
+        self.percent_condition: EventFrequencyConditionData = {
+            **TEST_RULE_SLOW_CONDITION,
+            "comparisonType": ComparisonType.PERCENT,
+            "comparisonInterval": "15m",
+            "value": 50,
+        }
+        self.count_query, self.comparison_query = generate_unique_queries(
+            self.percent_condition, self.environment.id
+        )
+        self.condition_group_results: dict[UniqueConditionQuery, dict[int, int]] = {
+            self.count_query: {1: 2, 2: 1, 3: 4},
+            self.comparison_query: {1: 1, 2: 1, 3: 4},
+        }
+        self.rules_to_groups: DefaultDict[int, set[int]] = defaultdict(set)
+        self.rules_to_slow_conditions: DefaultDict[
+            Rule, list[EventFrequencyConditionData]
+        ] = defaultdict(list)
+
+    def add_rule(self, conditions, group_ids, action_match="any"):
+        rule = self.create_project_rule(
+            project=self.project,
+            condition_match=conditions,
+            environment_id=self.environment.id,
+        )
+        rule.data["action_match"] = action_match
+        self.rules_to_slow_conditions[rule].extend(conditions)
+        self.rules_to_groups[rule.id].update(group_ids)
+        return rule
+
+    def get_rules_to_fire(self, fn):
+        return fn(
+            self.condition_group_results,
+            self.rules_to_slow_conditions,
+            self.rules_to_groups,
+            self.project.id,
+        )
+
+    def test_matches_get_rules_to_fire(self):
+        count_rule = self.add_rule([TEST_RULE_SLOW_CONDITION], {1, 2, 3})
+        percent_rule = self.add_rule([self.percent_condition], {1, 2, 3})
+        any_rule = self.add_rule([TEST_RULE_SLOW_CONDITION, self.percent_condition], {1, 2, 3})
+        all_rule = self.add_rule(
+            [TEST_RULE_SLOW_CONDITION, self.percent_condition], {1, 2, 3}, action_match="all"
+        )
+        # Group 4 has no query results at all
+        missing_rule = self.add_rule([TEST_RULE_SLOW_CONDITION], {3, 4})
+
+        result = self.get_rules_to_fire(get_rules_to_fire_columnar)
+
+        assert result == self.get_rules_to_fire(get_rules_to_fire)
+        assert result[count_rule] == {1, 3}
+        assert result[percent_rule] == {1}
+        assert result[any_rule] == {1, 3}
+        assert result[all_rule] == {1}
+        assert result[missing_rule] == {3}
+
+    def test_missing_query(self):
+        del self.condition_group_results[self.comparison_query]
+        rule = self.add_rule([self.percent_condition], {1, 2, 3})
+
+        result = self.get_rules_to_fire(get_rules_to_fire_columnar)
+
+        assert rule not in result
+
+    def test_all_without_slow_conditions(self):
+        rule = self.add_rule([], {1, 2}, action_match="all")
+
+        result = self.get_rules_to_fire(get_rules_to_fire_columnar)
+
+        assert result == self.get_rules_to_fire(get_rules_to_fire)
+        assert result[rule] == {1, 2}
+
+
 class GetRulesToGroupsTest(TestCase):
     def test_empty_input(self):
         result = get_rules_to_groups({})
@@ -712,6 +712,53 @@ class RuleProcessorTestFilters(TestCase):
         results = list(rp.apply())
         assert len(results) == 0
 
+    @patch("sentry.rules.processing.processor.metrics")
+    def test_rule_index_skips_rules(self, mock_metrics):
+        Rule.objects.filter(project=self.group_event.project).delete()
+        ProjectOwnership.objects.create(project_id=self.project.id, fallthrough=True)
+        env = self.create_environment(project=self.project)
+        Rule.objects.create(
+            project=self.group_event.project,
+            environment_id=env.id,
+            data={"conditions": [EVERY_EVENT_COND_DATA], "actions": [EMAIL_ACTION_DATA]},
+        )
+        Rule.objects.create(
+            project=self.group_event.project,
+            data={
+                "conditions": [
+                    EVERY_EVENT_COND_DATA,
+                    {
+                        "id": "sentry.rules.filters.tagged_event.TaggedEventFilter",
+                        "key": "missing",
+                        "match": "is",
+                    },
+                ],
+                "actions": [EMAIL_ACTION_DATA],
+            },
+        )
+        self.rule = Rule.objects.create(
+            project=self.group_event.project,
+            data={"conditions": [EVERY_EVENT_COND_DATA], "actions": [EMAIL_ACTION_DATA]},
+        )
+
+        rp = RuleProcessor(
+            self.group_event,
+            is_new=True,
+            is_regression=True,
+            is_new_group_environment=True,
+            has_reappeared=True,
+        )
+        with self.options({"rules.processing.rule-index.enabled": True}):
+            results = list(rp.apply())
+
+        assert len(results) == 1
+        callback, futures = results[0]
+        assert [future.rule for future in futures] == [self.rule]
+        assert GroupRuleStatus.objects.filter(group=self.group_event.group).count() == 1
+        mock_metrics.distribution.assert_any_call(
+            "rule_processor.rules_skipped", 2, tags={"has_candidates": True}
+        )
+
     def test_last_active_too_recent(self):
         Rule.objects.filter(project=self.group_event.project).delete()
         self.rule = Rule.objects.create(
@@ -0,0 +1,140 @@
+from typing import cast
+
+from django.core.cache import cache
+
+from sentry.issues.grouptype import GroupCategory
+from sentry.models.group import Group
+from sentry.models.rule import Rule
+from sentry.rules.processing.rule_index import (
+    RuleIndex,
+    RuleRequirements,
+    get_rule_index_cache_key,
+    get_rule_requirements,
+)
+from sentry.testutils.cases import TestCase
+from sentry.testutils.skips import requires_snuba
+
+pytestmark = [requires_snuba]
+
+EVERY_EVENT_COND_DATA = {"id": "sentry.rules.conditions.every_event.EveryEventCondition"}
+LEVEL_FILTER_ERROR_DATA = {
+    "id": "sentry.rules.filters.level.LevelFilter",
+    "match": "gte",
+    "level": "40",
+}
+ISSUE_CATEGORY_FILTER_DATA = {
+    "id": "sentry.rules.filters.issue_category.IssueCategoryFilter",
+    "value": str(GroupCategory.PERFORMANCE.value),
+}
+TAGGED_EVENT_FILTER_DATA = {
+    "id": "sentry.rules.filters.tagged_event.TaggedEventFilter",
+    "key": "Foo",
+    "match": "eq",
+    "value": "bar",
+}
+
+
+class GetRuleRequirementsTest(TestCase):
+    def test_no_requirements(self):
+        rule = self.create_project_rule(project=self.project)
+        assert get_rule_requirements(rule) == RuleRequirements()
+
+    def test_all_filters(self):
+        environment = self.create_environment(project=self.project)
+        rule = Rule(
+            project=self.project,
+            environment_id=environment.id,
+            data={
+                "conditions": [
+                    EVERY_EVENT_COND_DATA,
+                    LEVEL_FILTER_ERROR_DATA,
+                    ISSUE_CATEGORY_FILTER_DATA,
+                    TAGGED_EVENT_FILTER_DATA,
+                    {
+                        "id": "sentry.rules.filters.tagged_event.TaggedEventFilter",
+                        "key": "baz",
+                        "match": "ns",
+                    },
+                ],
+                "filter_match": "all",
+            },
+        )
+
+        assert get_rule_requirements(rule) == RuleRequirements(
+            environment_id=environment.id,
+            levels=frozenset(["error", "fatal"]),
+            categories=frozenset([GroupCategory.PERFORMANCE.value]),
+            tag_keys=frozenset(["foo"]),
+        )
+
+    def test_any_filter_match(self):
+        rule = Rule(
+            project=self.project,
+            data={
+                "conditions": [LEVEL_FILTER_ERROR_DATA, TAGGED_EVENT_FILTER_DATA],
+                "filter_match": "any",
+            },
+        )
+        assert get_rule_requirements(rule) == RuleRequirements()
+
+    def test_conditions(self):
+        level_condition = {
+            **LEVEL_FILTER_ERROR_DATA,
+            "id": "sentry.rules.conditions.level.LevelCondition",
+        }
+        rule = Rule(
+            project=self.project,
+            data={"conditions": [level_condition], "action_match": "all"},
+        )
+        assert get_rule_requirements(rule).levels == frozenset(["error", "fatal"])
+
+        rule.data["action_match"] = "any"
+        assert get_rule_requirements(rule).levels is None
+
+
+class RuleIndexTest(TestCase):
+    def setUp(self):
+        event = self.store_event(
+            data={"level": "warning", "tags": {"foo": "bar"}, "environment": "prod"},
+            project_id=self.project.id,
+        )
+        self.group_event = event.for_group(cast(Group, event.group))
+        self.environment = self.group_event.get_environment()
+
+    def create_rule(self, conditions, environment_id=None):
+        return Rule.objects.create(
+            project=self.project,
+            environment_id=environment_id,
+            data={"conditions": [EVERY_EVENT_COND_DATA, *conditions], "actions": []},
+        )
+
+    def test_get_candidate_rules(self):
+        other_environment = self.create_environment(project=self.project, name="staging")
+        rules = [
+            self.create_rule([]),
+            self.create_rule([LEVEL_FILTER_ERROR_DATA]),
+            self.create_rule([ISSUE_CATEGORY_FILTER_DATA]),
+            self.create_rule([TAGGED_EVENT_FILTER_DATA]),
+            self.create_rule([{**TAGGED_EVENT_FILTER_DATA, "key": "missing"}]),
+            self.create_rule([], environment_id=self.environment.id),
+            self.create_rule([], environment_id=other_environment.id),
+        ]
+
+        index = RuleIndex(rules)
+        candidates = index.get_candidate_rules(rules, self.group_event)
+
+        assert candidates == [rules[0], rules[3], rules[5]]
+
+    def test_unknown_rules_are_candidates(self):
+        rule = self.create_rule([LEVEL_FILTER_ERROR_DATA])
+        index = RuleIndex([])
+
+        assert index.get_candidate_rules([rule], self.group_event) == [rule]
+
+    def test_cache_cleared_on_rule_save(self):
+        rule = self.create_rule([])
+        RuleIndex.get_for_project(self.project.id, [rule])
+        assert cache.get(get_rule_index_cache_key(self.project.id)) is not None
+
+        rule.save()
+        assert cache.get(get_rule_index_cache_key(self.project.id)) is None
@@ -5,9 +5,15 @@ from sentry.api.event_search import SearchFilter, SearchKey, SearchValue
 from sentry.exceptions import InvalidSearchQuery
 from sentry.search.events.constants import TIMESTAMP_FIELDS
 from sentry.search.events.types import SnubaParams
-from sentry.search.snuba.executors import GroupAttributesPostgresSnubaQueryExecutor
+from sentry.search.snuba.executors import (
+    GroupAttributesPostgresSnubaQueryExecutor,
+    PostgresSnubaQueryExecutor,
+    QueryPlan,
+    SelectivityEstimate,
+)
 from sentry.testutils.cases import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now
+from sentry.testutils.helpers.options import override_options
 
 
 class GroupAttributesPostgresSnubaQueryExecutorTest(SnubaTestCase, TestCase):
@@ -56,3 +62,53 @@ class GroupAttributesPostgresSnubaQueryExecutorTest(SnubaTestCase, TestCase):
                         end=self.two_min_ago,
                     ),
                 )
+
+
+class PostgresSnubaQueryExecutorPlanTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.query_executor = PostgresSnubaQueryExecutor()
+
+    def plan_query(self, estimate, sort_by="date", search_filters=None):
+        with override_options(
+            {
+                "snuba.search.max-chunk-size": 1000,
+                "snuba.search.planner.joined-query-min-chunks": 3,
+            }
+        ):
+            return self.query_executor.plan_query(estimate, sort_by, 100, search_filters)
+
+    def test_plan_query_sampled_every_group(self):
+        estimate = SelectivityEstimate(snuba_total=50, hit_ratio=0.2, group_ids=list(range(10)))
+        assert estimate.hits == 10
+        assert self.plan_query(estimate) == (QueryPlan.POSTGRES_FIRST, 10)
+
+    def test_plan_query_snuba_first(self):
+        estimate = SelectivityEstimate(snuba_total=100_000, hit_ratio=0.5)
+        assert self.plan_query(estimate) == (QueryPlan.SNUBA_FIRST, 200)
+
+        # Can't expect to read more than there is in Snuba
+        estimate = SelectivityEstimate(snuba_total=150, hit_ratio=0.5)
+        assert self.plan_query(estimate) == (QueryPlan.SNUBA_FIRST, 150)
+
+    def test_plan_query_joined(self):
+        estimate = SelectivityEstimate(snuba_total=100_000, hit_ratio=0.01)
+        assert self.plan_query(estimate) == (QueryPlan.JOINED, 10_000)
+
+        # No hits in the sample
+        estimate = SelectivityEstimate(snuba_total=100_000, hit_ratio=0.0)
+        assert self.plan_query(estimate) == (QueryPlan.JOINED, 100_000)
+
+        # The joined query doesn't support every sort and filter
+        assert self.plan_query(estimate, sort_by="trends") == (QueryPlan.SNUBA_FIRST, 100_000)
+        search_filters = [SearchFilter(SearchKey("bookmarked_by"), "=", SearchValue([self.user]))]
+        assert self.plan_query(estimate, search_filters=search_filters) == (
+            QueryPlan.SNUBA_FIRST,
+            100_000,
+        )
+
+        with override_options({"snuba.search.planner.joined-query-min-chunks": 0}):
+            assert self.query_executor.plan_query(estimate, "date", 100, None) == (
+                QueryPlan.SNUBA_FIRST,
+                100_000,
+            )
@@ -7,6 +7,7 @@ the mock indexer actually behaves the same as the postgres indexer.
 """
 
 from collections.abc import Mapping
+from unittest import mock
 
 import pytest
 
@@ -596,3 +597,48 @@ def test_bulk_reverse_resolve(indexer):
         actual_result = static_indexer.bulk_reverse_resolve(use_case_id, org_id, indexes)
 
         assert actual_result == expected_result
+
+
+def test_local_cache(indexer, indexer_cache, use_case_id) -> None:
+    with override_options(
+        {
+            "sentry-metrics.indexer.read-new-cache-namespace": False,
+            "sentry-metrics.indexer.write-new-cache-namespace": False,
+            "sentry-metrics.indexer.local-cache.max-size": 100,
+        }
+    ):
+        org_id = 1
+        strings = {"hello", "hey", "hi"}
+        caching_indexer = CachingIndexer(indexer_cache, indexer)
+
+        results = caching_indexer.bulk_record({use_case_id: {org_id: strings}})
+        expected = results[use_case_id][org_id]
+        assert None not in expected.values()
+
+        # Drop the shared cache, lookups are now served from the local one
+        indexer_cache.cache.clear()
+        with (
+            mock.patch.object(indexer, "bulk_record") as bulk_record,
+            mock.patch.object(indexer, "resolve") as resolve,
+            mock.patch.object(indexer_cache, "get_many") as get_many,
+        ):
+            results = caching_indexer.bulk_record({use_case_id: {org_id: strings}})
+            assert caching_indexer.resolve(use_case_id, org_id, "hello") == expected["hello"]
+
+        assert results[use_case_id][org_id] == expected
+        assert_fetch_type_for_tag_string_set(
+            results.get_fetch_metadata()[use_case_id][org_id], FetchType.CACHE_HIT, strings
+        )
+        assert not bulk_record.called
+        assert not resolve.called
+        assert not get_many.called
+
+        id = expected["hey"]
+        assert caching_indexer.reverse_resolve(use_case_id, org_id, id) == "hey"
+        with mock.patch.object(indexer, "reverse_resolve") as reverse_resolve:
+            assert caching_indexer.reverse_resolve(use_case_id, org_id, id) == "hey"
+        assert not reverse_resolve.called
+
+    with override_options({"sentry-metrics.indexer.local-cache.max-size": 0}):
+        with mock.patch.object(indexer, "resolve", return_value=None):
+            assert caching_indexer.resolve(use_case_id, org_id, "hello") is None
@@ -0,0 +1,48 @@
+import pytest
+
+from sentry.sentry_metrics.indexer.postgres.models import TABLE_MAPPING
+from sentry.sentry_metrics.indexer.postgres.postgres_v2 import PGStringIndexerV2
+from sentry.sentry_metrics.use_case_id_registry import UseCaseID
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark
+
+NUM_ORGS = 100
+STRINGS_PER_ORG = 20
+
+
+def build_indexer_batch(round: int) -> dict[UseCaseID, dict[int, set[str]]]:
+    """
+    Builds the strings of an indexer consumer batch spanning many orgs and use cases, with
+    strings that haven't been seen in previous rounds.
+    """
+    return {
+        use_case_id: {
+            org_id: {f"{use_case_id.value}-{round}-{i}" for i in range(STRINGS_PER_ORG)}
+            for org_id in range(1, NUM_ORGS + 1)
+        }
+        for use_case_id in (UseCaseID.TRANSACTIONS, UseCaseID.SPANS)
+    }
+
+
+@requires_pytest_benchmark
+@django_db_all(transaction=True)
+@pytest.mark.parametrize("workers", [0, 8])
+def test_benchmark_pg_bulk_record(workers, benchmark):
+    indexer = PGStringIndexerV2()
+    rounds = iter(range(1_000))
+
+    def setup():
+        return (build_indexer_batch(next(rounds)),), {}
+
+    try:
+        with override_options({"sentry-metrics.indexer.postgres.parallel-workers": workers}):
+            results = benchmark.pedantic(indexer.bulk_record, setup=setup, rounds=3)
+    finally:
+        for table in TABLE_MAPPING.values():
+            table.objects.all().delete()
+
+    assert len(results.get_mapped_strings_to_ints()) == 2 * NUM_ORGS * STRINGS_PER_ORG
+    benchmark.extra_info["strings_per_second"] = (
+        2 * NUM_ORGS * STRINGS_PER_ORG / benchmark.stats.stats.mean
+    )
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from sentry.sentry_metrics.indexer.local_cache import FrequencySketch, TinyLFUCache
+
+
+def test_frequency_sketch() -> None:
+    sketch = FrequencySketch(100)
+    for _ in range(3):
+        sketch.increment("hot")
+    sketch.increment("warm")
+
+    assert sketch.frequency("hot") >= 3
+    assert sketch.frequency("warm") >= 1
+    assert sketch.frequency("hot") > sketch.frequency("cold")
+
+
+def test_frequency_sketch_saturates_and_ages() -> None:
+    sketch = FrequencySketch(16)
+    for _ in range(100):
+        sketch.increment("hot")
+    # Counters saturate at 15 and are halved after 160 increments
+    assert sketch.frequency("hot") == 15
+
+    for i in range(200):
+        sketch.increment(f"key-{i}")
+    assert sketch.frequency("hot") < 15
+
+
+def test_get_and_set() -> None:
+    cache = TinyLFUCache(10)
+    assert cache.get("a") is None
+
+    cache.set("a", 1, timeout=60)
+    cache.set_many({"b": 2, ("c", 1, 3): "c"}, timeout=60)
+
+    assert cache.get("a") == 1
+    assert cache.get_many(["a", "b", ("c", 1, 3), "d"]) == {"a": 1, "b": 2, ("c", 1, 3): "c"}
+    assert len(cache) == 3
+
+
+def test_expiration() -> None:
+    cache = TinyLFUCache(10)
+    with mock.patch("time.monotonic", return_value=1000.0):
+        cache.set("a", 1, timeout=60)
+    with mock.patch("time.monotonic", return_value=1059.0):
+        assert cache.get("a") == 1
+    with mock.patch("time.monotonic", return_value=1060.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_admission() -> None:
+    cache = TinyLFUCache(2)
+    for key in ("a", "b"):
+        for _ in range(3):
+            cache.get(key)
+    cache.set_many({"a": 1, "b": 2}, timeout=60)
+
+    # A key requested once doesn't evict frequently requested ones
+    cache.get("c")
+    cache.set("c", 3, timeout=60)
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+
+    # Once it's requested more often than the least recently used key it does
+    for _ in range(10):
+        cache.get("c")
+    cache.set("c", 3, timeout=60)
+    assert cache.get_many(["a", "b", "c"]) == {"b": 2, "c": 3}
+    assert len(cache) == 2
+
+
+def test_update_existing_key_when_full() -> None:
+    cache = TinyLFUCache(1)
+    cache.set("a", 1, timeout=60)
+    cache.set("a", 2, timeout=60)
+    assert cache.get("a") == 2
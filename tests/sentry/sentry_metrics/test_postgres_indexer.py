@@ -5,7 +5,8 @@ from sentry.sentry_metrics.indexer.base import FetchType, Metadata, UseCaseKeyCo
 from sentry.sentry_metrics.indexer.cache import CachingIndexer
 from sentry.sentry_metrics.indexer.postgres.postgres_v2 import PGStringIndexerV2, indexer_cache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
-from sentry.testutils.cases import TestCase
+from sentry.testutils.cases import TestCase, TransactionTestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
 
 
@@ -41,3 +42,100 @@ class PostgresIndexerV2Test(TestCase):
         )
 
         assert indexer_cache.get("br", key) is None
+
+
+class PostgresIndexerV2ParallelTest(TransactionTestCase):
+    def setUp(self) -> None:
+        self.indexer = PGStringIndexerV2()
+
+    def test_partition_strings(self):
+        strings = {
+            UseCaseID.SESSIONS: {1: {"a"}, 2: {"b"}, 3: set()},
+            UseCaseID.TRANSACTIONS: {1: {"c"}, 3: {"d"}},
+            UseCaseID.SPANS: {1: {"e"}},
+        }
+        partitions = self.indexer._partition_strings(strings, 2)
+        assert sorted(partitions, key=repr) == sorted(
+            [
+                {UseCaseID.SESSIONS: {2: {"b"}}},
+                {UseCaseID.SESSIONS: {1: {"a"}}},
+                {UseCaseID.TRANSACTIONS: {1: {"c"}, 3: {"d"}}, UseCaseID.SPANS: {1: {"e"}}},
+            ],
+            key=repr,
+        )
+
+    def test_bulk_record_parallel(self):
+        strings = {
+            UseCaseID.TRANSACTIONS: {
+                org_id: {f"string-{org_id}-{i}" for i in range(5)} for org_id in range(1, 9)
+            },
+            UseCaseID.SPANS: {1: {"span-string"}, 2: {"span-string"}},
+        }
+        with override_options({"sentry-metrics.indexer.postgres.parallel-workers": 4}):
+            results = self.indexer.bulk_record(strings)
+            # The second time around, everything is read from the database
+            reread_results = self.indexer.bulk_record(strings)
+
+        for use_case_id, org_strings in strings.items():
+            for org_id, org_string_set in org_strings.items():
+                for string in org_string_set:
+                    id = results[use_case_id][org_id][string]
+                    assert id is not None
+                    assert self.indexer.resolve(use_case_id, org_id, string) == id
+                    assert reread_results[use_case_id][org_id][string] == id
+
+                meta = results.get_fetch_metadata()[use_case_id][org_id]
+                assert_fetch_type_for_tag_string_set(meta, FetchType.FIRST_SEEN, org_string_set)
+                meta = reread_results.get_fetch_metadata()[use_case_id][org_id]
+                assert_fetch_type_for_tag_string_set(meta, FetchType.DB_READ, org_string_set)
+
+        # Serial and parallel results are the same
+        assert self.indexer.bulk_record(strings) == reread_results
+
+    def test_bulk_record_release_health_parallel(self):
+        strings = {UseCaseID.SESSIONS: {1: {"a", "b"}, 2: {"a"}, 3: {"c"}}}
+        with override_options({"sentry-metrics.indexer.postgres.parallel-workers": 3}):
+            results = self.indexer.bulk_record(strings)
+
+        assert results[UseCaseID.SESSIONS][1]["a"] != results[UseCaseID.SESSIONS][2]["a"]
+        for org_id, org_string_set in strings[UseCaseID.SESSIONS].items():
+            for string in org_string_set:
+                assert (
+                    self.indexer.resolve(UseCaseID.SESSIONS, org_id, string)
+                    == results[UseCaseID.SESSIONS][org_id][string]
+                )
+
+    def test_bulk_record_parallel_global_write_limit(self):
+        limit = [{"window_seconds": 10, "granularity_seconds": 10, "limit": 5}]
+
+        def count_writes(results, use_case_id):
+            return sum(
+                metadata.fetch_type == FetchType.FIRST_SEEN
+                for org_metadata in results.get_fetch_metadata()[use_case_id].values()
+                for metadata in org_metadata.values()
+            )
+
+        def strings(use_case_id):
+            return {
+                use_case_id: {
+                    org_id: {f"string-{org_id}-{i}" for i in range(3)} for org_id in range(1, 9)
+                }
+            }
+
+        # Both use cases have their own global quota, so that the serial and
+        # the parallel run don't share it.
+        with override_options(
+            {
+                "sentry-metrics.writes-limiter.limits.performance.global": limit,
+                "sentry-metrics.writes-limiter.limits.spans.global": limit,
+            }
+        ):
+            with override_options({"sentry-metrics.indexer.postgres.parallel-workers": 1}):
+                serial_results = self.indexer.bulk_record(strings(UseCaseID.TRANSACTIONS))
+            with override_options({"sentry-metrics.indexer.postgres.parallel-workers": 4}):
+                parallel_results = self.indexer.bulk_record(strings(UseCaseID.SPANS))
+
+        serial_writes = count_writes(serial_results, UseCaseID.TRANSACTIONS)
+        parallel_writes = count_writes(parallel_results, UseCaseID.SPANS)
+        assert serial_writes == 5
+        assert parallel_writes <= serial_writes
@@ -197,6 +197,41 @@ class RedisScriptMinHashIndexBackendTestCase(TestCase):
             == [("4", [1.0, None]), ("1", [1.0, 0.0]), ("2", [1.0, 0.0]), ("3", [1.0, 0.0])]
         )
 
+    def test_record_many(self):
+        timestamp = int(time.time())
+        records = [
+            ("1", [("index:a", "hello world"), ("index:b", "hello world")], None),
+            ("2", [("index:a", "jello world")], None),
+            ("3", [("index:b", "")], None),
+            ("4", [], None),
+            # Records of the same key at other timestamps
+            ("1", [("index:a", "hello there")], timestamp - self.index.interval),
+            ("2", [("index:b", "jello there")], timestamp - 1),
+        ]
+        self.index.record_many("example", records, timestamp=timestamp)
+        for key, items, record_timestamp in records:
+            self.index.record("other", key, items, timestamp=record_timestamp or timestamp)
+
+        items = [("index:a", key) for key in "1234"] + [("index:b", key) for key in "1234"]
+        exported = self.index.export("example", items, timestamp=timestamp)
+        assert exported == self.index.export("other", items, timestamp=timestamp)
+        assert [msgpack.unpackb(data) == [] for data in exported] == [
+            False,
+            False,
+            True,
+            True,
+            False,
+            False,
+            True,
+            True,
+        ]
+
+        assert self.index.compare("example", "1", [("index:a", 0), ("index:b", 0)]) == (
+            self.index.compare("other", "1", [("index:a", 0), ("index:b", 0)])
+        )
+
+        assert self.index.record_many("example", [("5", [], None)]) == []
+
     def test_merge(self):
         self.index.record("example", "1", [("index", ["foo", "bar"])])
         self.index.record("example", "2", [("index", ["baz"])])
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from sentry.similarity import text_shingle
+from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.testutils.skips import requires_pytest_benchmark
+
+BATCH_SIZE = 1_000
+MESSAGES = [
+    "ConnectionError: could not connect to {host}:{port}",
+    "KeyError: '{key}'",
+    "TimeoutError: request to {host} timed out after {timeout}s",
+    "ValueError: invalid literal for int() with base 10: '{key}'",
+]
+
+
+def build_feature_sets() -> list[list[str]]:
+    """
+    Builds the message shingles of a batch of events, which mostly share a few message templates
+    with varying parameters.
+    """
+    rng = random.Random(BATCH_SIZE)
+    feature_sets = []
+    for _ in range(BATCH_SIZE):
+        message = rng.choice(MESSAGES).format(
+            host=f"db-{rng.randint(1, 5)}.internal",
+            port=rng.choice([5432, 6379]),
+            key=f"{rng.getrandbits(16):x}",
+            timeout=rng.randint(1, 30),
+        )
+        feature_sets.append(text_shingle(5, message))
+    return feature_sets
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("mode", ["single", "batch"])
+def test_benchmark_signatures(mode, benchmark):
+    signature_builder = MinHashSignatureBuilder(16, 0xFFFF)
+    feature_sets = build_feature_sets()
+
+    def build_single():
+        return [signature_builder(features) for features in feature_sets]
+
+    def build_batch():
+        return signature_builder.build_many(feature_sets)
+
+    signatures = benchmark.pedantic(
+        build_batch if mode == "batch" else build_single, rounds=5, iterations=1
+    )
+
+    assert signatures == build_single()
+    benchmark.extra_info["signatures_per_second"] = BATCH_SIZE / benchmark.stats.stats.mean
@@ -148,3 +148,54 @@ class TestRedisSpansBuffer:
             b"1710280892",
             b"segment:segment_3:1:process-segment",
         ]
+
+    @django_db_all
+    def test_iter_many_segments(self):
+        buffer = RedisSpansBuffer()
+        keys = [
+            "segment:segment_1:1:process-segment",
+            "segment:segment_2:1:process-segment",
+            "segment:missing:1:process-segment",
+            "segment:segment_3:1:process-segment",
+        ]
+        buffer.client.rpush(keys[0], *[b"span %d" % i for i in range(5)])
+        buffer.client.rpush(keys[1], b"span")
+        buffer.client.rpush(keys[3], b"a" * 15, b"b" * 15, b"c" * 15)
+
+        segments = buffer.iter_many_segments(keys, batch_size=2, chunk_size=2, max_bytes=35)
+
+        assert next(segments) == (keys[0], [b"span %d" % i for i in range(5)])
+        # Keys are deleted as soon as their last chunk was read
+        assert not buffer.client.exists(keys[0])
+        assert next(segments) == (keys[1], [b"span"])
+        # Reading stops once the segment is larger than `max_bytes`
+        assert next(segments) == (keys[3], None)
+        assert list(segments) == []
+
+        for key in keys:
+            assert not buffer.client.exists(key)
+
+    @django_db_all
+    def test_iter_many_segments_concurrent_push(self):
+        buffer = RedisSpansBuffer()
+        keys = [
+            "segment:segment_1:1:process-segment",
+            "segment:segment_2:1:process-segment",
+        ]
+        buffer.client.rpush(keys[0], b"span 0", b"span 1")
+        buffer.client.rpush(keys[1], b"span 0", b"span 1")
+
+        segments = buffer.iter_many_segments(keys, batch_size=2, chunk_size=2, max_bytes=100)
+        assert next(segments) == (keys[0], [b"span 0", b"span 1"])
+
+        # The first chunk of the second segment was already read, the first segment was read and
+        # deleted in full.
+        buffer.client.rpush(keys[0], b"late span")
+        buffer.client.rpush(keys[1], b"late span")
+
+        assert next(segments) == (keys[1], [b"span 0", b"span 1", b"late span"])
+        assert list(segments) == []
+
+        # The late span of the first segment is kept for the segment's next flush.
+        assert buffer.client.lrange(keys[0], 0, -1) == [b"late span"]
+        assert not buffer.client.exists(keys[1])
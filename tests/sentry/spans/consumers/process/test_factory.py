@@ -504,3 +504,55 @@ def test_with_expand_segment():
         ]
 
         assert redis_client.ttl("segment:a96c2bcd49de0c43:1:process-segment") == -2
+
+
+@django_db_all
+@override_options(
+    {
+        "standalone-spans.process-spans-consumer.enable": True,
+        "standalone-spans.process-spans-consumer.project-allowlist": [1],
+        "standalone-spans.expand-segments.streaming.enable": True,
+    }
+)
+def test_streaming_produces_valid_segment_to_kafka():
+    redis_client = get_redis_client()
+    topic = ArroyoTopic(get_topic_definition(Topic.SNUBA_SPANS)["real_topic_name"])
+    partition = Partition(topic, 0)
+    factory = process_spans_strategy()
+    with mock.patch.object(
+        factory,
+        "producer",
+        new=mock.Mock(),
+    ) as mock_producer:
+        strategy = factory.create_with_partitions(
+            commit=mock.Mock(),
+            partitions={},
+        )
+
+        large_span_data = build_mock_span(
+            project_id=1, segment_id="89225fa064375ee5", description="a" * 1000 * 1000 * 10
+        )
+        message1 = build_mock_message(large_span_data, topic)
+        strategy.submit(make_payload(message1, partition, 1, datetime.now() - timedelta(minutes=3)))
+
+        span_data = build_mock_span(project_id=1, is_segment=True)
+        message2 = build_mock_message(span_data, topic)
+        strategy.submit(make_payload(message2, partition, 2, datetime.now() - timedelta(minutes=3)))
+
+        span_data = build_mock_span(project_id=1)
+        message3 = build_mock_message(span_data, topic)
+        strategy.submit(make_payload(message3, partition, 3))
+
+        strategy.poll()
+        strategy.join(1)
+        strategy.terminate()
+
+        # The oversized segment is dropped, the other one produced
+        mock_producer.produce.assert_called_once()
+        decoded_segment = BUFFERED_SEGMENT_SCHEMA.decode(
+            mock_producer.produce.call_args.args[1].value
+        )
+        assert len(decoded_segment["spans"]) == 2
+        assert mock_producer.produce.call_args.args[0] == ArroyoTopic("buffered-segments")
+        assert not redis_client.exists("segment:89225fa064375ee5:1:process-segment")
+        assert not redis_client.exists("segment:a49b42af9fb69da0:1:process-segment")
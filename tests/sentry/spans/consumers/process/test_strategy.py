@@ -0,0 +1,89 @@
+from datetime import datetime
+from unittest import mock
+
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.processing.strategies.abstract import MessageRejected
+from arroyo.types import FILTERED_PAYLOAD, Message, Value
+
+from sentry.spans.consumers.process.strategy import (
+    ExpandSegments,
+    OutstandingBytes,
+    ReleaseOutstandingBytes,
+)
+
+
+def make_payload(size):
+    return KafkaPayload(None, b"x" * size, [])
+
+
+def test_expand_segments_reads_lazily():
+    payloads = [make_payload(10) for _ in range(3)]
+    consumed = []
+
+    def generator(value):
+        for payload in payloads:
+            consumed.append(payload)
+            yield payload
+
+    next_step = mock.Mock()
+    next_step.submit.side_effect = [None, MessageRejected, None, None]
+    outstanding_bytes = OutstandingBytes()
+    strategy = ExpandSegments(generator, next_step, outstanding_bytes, max_outstanding_bytes=100)
+
+    strategy.submit(Message(Value([], {}, datetime.now())))
+    # The second payload was rejected, the third must not have been read yet
+    assert consumed == payloads[:2]
+    assert outstanding_bytes.value == 10
+
+    # No new work is accepted while the generator is not exhausted
+    try:
+        strategy.submit(Message(Value([], {}, datetime.now())))
+    except MessageRejected:
+        pass
+    else:
+        raise AssertionError("Expected MessageRejected")
+
+    strategy.poll()
+    assert consumed == payloads
+    assert [call.args[0].payload for call in next_step.submit.call_args_list] == [
+        payloads[0],
+        payloads[1],
+        payloads[1],
+        payloads[2],
+    ]
+    assert outstanding_bytes.value == 30
+
+
+def test_expand_segments_backpressure():
+    payloads = [make_payload(60) for _ in range(3)]
+    next_step = mock.Mock()
+    outstanding_bytes = OutstandingBytes()
+    release_step = ReleaseOutstandingBytes(outstanding_bytes)
+    strategy = ExpandSegments(
+        lambda value: iter(payloads), next_step, outstanding_bytes, max_outstanding_bytes=100
+    )
+
+    strategy.submit(Message(Value([], {}, datetime.now())))
+    # The ceiling is reached after two payloads
+    assert next_step.submit.call_count == 2
+    assert outstanding_bytes.value == 120
+
+    strategy.poll()
+    assert next_step.submit.call_count == 2
+
+    # Once the producer is done with a payload, the next one is read
+    release_step.submit(Message(Value(payloads[0], {})))
+    strategy.poll()
+    assert next_step.submit.call_count == 3
+    assert outstanding_bytes.value == 120
+
+
+def test_expand_segments_forwards_filtered_payloads():
+    next_step = mock.Mock()
+    strategy = ExpandSegments(
+        lambda value: iter([]), next_step, OutstandingBytes(), max_outstanding_bytes=100
+    )
+
+    message = Message(Value(FILTERED_PAYLOAD, {}))
+    strategy.submit(message)
+    next_step.submit.assert_called_once_with(message)
@@ -324,3 +324,58 @@ def test_moving_average_relative_change_detector(
 
     assert all_regressed == [payloads[i] for i in regressed_indices]
     assert all_improved == [payloads[i] for i in improved_indices]
+
+
+def test_moving_average_relative_change_detector_update_many():
+    now = datetime(2023, 8, 31, 11, 28, 52, tzinfo=timezone.utc)
+
+    detector = MovingAverageRelativeChangeDetector(
+        "transaction",
+        "endpoint",
+        min_data_points=3,
+        moving_avg_short_factory=lambda: ExponentialMovingAverage(2 / 3),
+        moving_avg_long_factory=lambda: ExponentialMovingAverage(2 / 5),
+        threshold=0.15,
+    )
+
+    payloads = [
+        DetectorPayload(
+            project_id=1,
+            group=i,
+            fingerprint=f"{i}",
+            count=1,
+            value=value,
+            timestamp=now,
+        )
+        for i, value in enumerate([100, 200, 50, 100, 100, 100])
+    ]
+    raw_states: list[Mapping[str | bytes, bytes | float | int | str]] = [
+        {},  # no previous state
+        MovingAverageDetectorState(
+            timestamp=now - timedelta(hours=1), count=10, moving_avg_short=100, moving_avg_long=100
+        ).to_redis_dict(),  # regression
+        MovingAverageDetectorState(
+            timestamp=now - timedelta(hours=1), count=10, moving_avg_short=100, moving_avg_long=100
+        ).to_redis_dict(),  # improvement
+        MovingAverageDetectorState(
+            timestamp=now + timedelta(hours=1), count=10, moving_avg_short=100, moving_avg_long=100
+        ).to_redis_dict(),  # out of order
+        {"C": "invalid"},
+        MovingAverageDetectorState(
+            timestamp=None, count=1, moving_avg_short=0, moving_avg_long=0
+        ).to_redis_dict(),  # zero moving averages
+    ]
+
+    results = detector.update_many(raw_states, payloads)
+    assert results == [
+        detector.update(raw_state, payload) for raw_state, payload in zip(raw_states, payloads)
+    ]
+    assert [trend_type for trend_type, _, _ in results] == [
+        TrendType.Unchanged,
+        TrendType.Regressed,
+        TrendType.Improved,
+        TrendType.Skipped,
+        TrendType.Unchanged,
+        TrendType.Unchanged,
+    ]
+    assert detector.update_many([], []) == []
@@ -0,0 +1,80 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from sentry.statistical_detectors.algorithm import MovingAverageRelativeChangeDetector
+from sentry.statistical_detectors.base import DetectorPayload
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.math import ExponentialMovingAverage
+
+
+def build_detector_input(num_payloads):
+    """
+    Builds the payloads of one hourly run and the states stored for them by previous runs, a few
+    of which are missing, invalid or newer than the payload.
+    """
+    rng = random.Random(num_payloads)
+    now = datetime(2024, 6, 1, 12, tzinfo=timezone.utc)
+    last_run = int((now - timedelta(hours=1)).timestamp())
+
+    payloads = []
+    raw_states = []
+    for i in range(num_payloads):
+        payloads.append(
+            DetectorPayload(
+                project_id=rng.randint(1, 100),
+                group=i,
+                fingerprint=f"{i:x}",
+                count=rng.randint(1, 1000),
+                value=rng.uniform(50, 150),
+                timestamp=now,
+            )
+        )
+        kind = rng.random()
+        if kind < 0.05:
+            raw_states.append({})
+        elif kind < 0.06:
+            raw_states.append({"C": "invalid"})
+        else:
+            raw_states.append(
+                {
+                    "T": str(last_run + 7200 if kind < 0.07 else last_run),
+                    "C": str(rng.randint(1, 100)),
+                    "S": str(rng.uniform(50, 150)),
+                    "L": str(rng.uniform(50, 150)),
+                }
+            )
+    return raw_states, payloads
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("num_payloads", [10_000, 100_000, 1_000_000])
+@pytest.mark.parametrize("mode", ["single", "batch"])
+def test_benchmark_detector_update(mode, num_payloads, benchmark):
+    detector = MovingAverageRelativeChangeDetector(
+        source="transaction",
+        kind="endpoint",
+        min_data_points=18,
+        moving_avg_short_factory=lambda: ExponentialMovingAverage(2 / 21),
+        moving_avg_long_factory=lambda: ExponentialMovingAverage(2 / 41),
+        threshold=0.15,
+    )
+    raw_states, payloads = build_detector_input(num_payloads)
+
+    def update_single():
+        return [
+            detector.update(raw_state, payload) for raw_state, payload in zip(raw_states, payloads)
+        ]
+
+    def update_batch():
+        return detector.update_many(raw_states, payloads)
+
+    results = benchmark.pedantic(
+        update_batch if mode == "batch" else update_single,
+        rounds=1 if num_payloads > 100_000 else 3,
+    )
+
+    if num_payloads <= 100_000:
+        assert results == update_single()
+    benchmark.extra_info["payloads_per_second"] = num_payloads / benchmark.stats.stats.mean
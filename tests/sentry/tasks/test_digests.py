@@ -1,3 +1,4 @@
+import time
 import uuid
 from unittest import mock
 
@@ -5,24 +6,33 @@ from django.core import mail
 from django.core.mail.message import EmailMultiAlternatives
 
 import sentry
+from sentry.digests.backends.base import ScheduleEntry
 from sentry.digests.backends.redis import RedisBackend
-from sentry.digests.notifications import event_to_record
+from sentry.digests.notifications import event_to_record, unsplit_key
+from sentry.mail import mail_adapter
 from sentry.models.projectownership import ProjectOwnership
 from sentry.models.rule import Rule
-from sentry.tasks.digests import deliver_digest
+from sentry.notifications.types import ActionTargetType
+from sentry.ownership import grammar
+from sentry.ownership.grammar import Matcher, Owner, dump_schema
+from sentry.tasks.digests import deliver_digest, deliver_digests, schedule_digests
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.skips import requires_snuba
+from sentry.types.rules import RuleFuture
+from tests.sentry.mail import make_event_data
 
 pytestmark = [requires_snuba]
 
 
 class DeliverDigestTest(TestCase):
-    def run_test(self, key: str) -> None:
+    def run_test(self, key: str, bulk: bool = False) -> None:
         """Simple integration test to make sure that digests are firing as expected."""
         with mock.patch.object(sentry, "digests") as digests:
             backend = RedisBackend()
             digests.backend.digest = backend.digest
+            digests.backend.digest_many = backend.digest_many
 
             rule = Rule.objects.create(project=self.project, label="Test Rule", data={})
             ProjectOwnership.objects.create(project_id=self.project.id, fallthrough=True)
@@ -48,7 +58,10 @@ class DeliverDigestTest(TestCase):
                 maximum_delay=0,
             )
             with self.tasks():
-                deliver_digest(key)
+                if bulk:
+                    deliver_digests([key])
+                else:
+                    deliver_digest(key)
 
     def test_old_key(self):
         self.run_test(f"mail:p:{self.project.id}")
@@ -77,3 +90,109 @@ class DeliverDigestTest(TestCase):
     def test_no_records(self):
         # This shouldn't error if no records are present
         deliver_digest(f"mail:p:{self.project.id}:IssueOwners:")
+
+    def test_bulk_delivery(self):
+        self.run_test(f"mail:p:{self.project.id}:IssueOwners::AllMembers", bulk=True)
+        assert "2 new alerts since" in mail.outbox[0].subject
+
+    def test_compaction_keeps_events_of_every_owner(self):
+        user = self.create_user(email="foo@example.com")
+        user2 = self.create_user(email="baz@example.com")
+        self.create_member(user=user, organization=self.organization, teams=[self.team])
+        self.create_member(user=user2, organization=self.organization, teams=[self.team])
+        ProjectOwnership.objects.create(
+            project_id=self.project.id,
+            schema=dump_schema(
+                [
+                    grammar.Rule(Matcher("path", "*.py"), [Owner("user", user.email)]),
+                    grammar.Rule(Matcher("path", "*.jx"), [Owner("user", user2.email)]),
+                ]
+            ),
+            fallthrough=False,
+        )
+        rule = Rule.objects.create(project=self.project, label="Test Rule", data={})
+        key = unsplit_key(self.project, ActionTargetType.ISSUE_OWNERS, None, None)
+
+        with (
+            mock.patch.object(sentry, "digests") as digests,
+            mock.patch("sentry.mail.adapter.digests", digests),
+        ):
+            digests.backend = backend = RedisBackend(compaction=True)
+
+            # The event routed to the second owner is neither the oldest nor
+            # the newest of its group.
+            for filename in ("foo.py", "foo.jx", "foo.py"):
+                event = self.store_event(
+                    data={**make_event_data(filename), "fingerprint": ["group-1"]},
+                    project_id=self.project.id,
+                )
+                mail_adapter.rule_notify(
+                    event, [RuleFuture(rule, {})], ActionTargetType.ISSUE_OWNERS
+                )
+
+            with self.tasks():
+                deliver_digest(key)
+
+        assert sorted(email.to[0] for email in mail.outbox) == [user2.email, user.email]
+
+    @mock.patch("sentry.tasks.digests._notify_digest")
+    @mock.patch("sentry.tasks.digests.build_digest")
+    def test_bulk_delivery_errors(self, build_digest, notify_digest):
+        keys = [f"mail:p:{self.project.id}:Member:{i}" for i in range(3)]
+        rule = Rule.objects.create(project=self.project, label="Test Rule", data={})
+        events = [
+            self.store_event(data={"fingerprint": [f"group-{i}"]}, project_id=self.project.id)
+            for i in range(3)
+        ]
+
+        def build(project, records):
+            if records[0].key == events[1].event_id:
+                raise Exception("build failed")
+            return mock.sentinel.digest
+
+        build_digest.side_effect = build
+        notify_digest.side_effect = [Exception("delivery failed"), None]
+
+        with mock.patch.object(sentry, "digests") as digests:
+            digests.backend = backend = RedisBackend()
+            for key, event in zip(keys, events):
+                backend.add(key, event_to_record(event, [rule]), increment_delay=0, maximum_delay=0)
+
+            deliver_digests(keys)
+
+        # A failed delivery doesn't prevent the remaining digests from being delivered.
+        assert notify_digest.call_count == 2
+
+        # Only the digest which couldn't be built is left unclosed, the others
+        # are waiting for their next schedule.
+        assert {entry.key for entry in backend.schedule(time.time() + 3600)} == {keys[0], keys[2]}
+        for key in (keys[0], keys[2]):
+            with backend.digest(key, 0) as records:
+                assert records == []
+        with backend.digest(keys[1], 0) as records:
+            assert [record.key for record in records] == [events[1].event_id]
+
+    def test_bulk_delivery_no_records(self):
+        deliver_digests([f"mail:p:{self.project.id}:IssueOwners:"])
+        assert len(mail.outbox) == 0
+
+
+class ScheduleDigestsTest(TestCase):
+    @mock.patch("sentry.tasks.digests.deliver_digests.delay")
+    @mock.patch("sentry.tasks.digests.deliver_digest.delay")
+    def test_batches(self, deliver_digest_delay, deliver_digests_delay):
+        keys = [f"mail:p:{self.project.id}:Member:{i}" for i in range(5)]
+        with mock.patch.object(sentry, "digests") as digests:
+            digests.backend.schedule.return_value = [ScheduleEntry(key, 0.0) for key in keys]
+
+            schedule_digests()
+            assert deliver_digest_delay.call_count == 5
+            assert not deliver_digests_delay.called
+
+            with override_options({"digests.delivery.batch-size": 2}):
+                schedule_digests()
+            assert deliver_digests_delay.call_args_list == [
+                mock.call(keys[:2]),
+                mock.call(keys[2:4]),
+                mock.call(keys[4:]),
+            ]
@@ -0,0 +1,62 @@
+import random
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from sentry.event_manager import _tsdb_record_all_metrics
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.tsdb.base import ONE_DAY, ONE_HOUR, ONE_MINUTE
+from sentry.tsdb.redis import RedisTSDB
+
+BATCH_SIZE = 500
+REDIS_CLUSTERS = {"tsdb": {"hosts": {i - 6: {"db": i} for i in range(6, 9)}}}
+
+
+def build_save_event_batch() -> list[dict]:
+    """
+    Builds the jobs of a save_event batch: events of a handful of projects, mostly hitting a few
+    hot groups, with a release, environment and user each.
+    """
+    rng = random.Random(BATCH_SIZE)
+    now = datetime.now(timezone.utc)
+    jobs = []
+    for _ in range(BATCH_SIZE):
+        project_id = rng.randint(1, 5)
+        group_id = project_id * 1000 + int(rng.paretovariate(1.5)) % 50
+        jobs.append(
+            {
+                "project_id": project_id,
+                "event": SimpleNamespace(datetime=now),
+                "release": SimpleNamespace(id=project_id * 10 + rng.randint(0, 1)),
+                "environment": SimpleNamespace(id=project_id * 100),
+                "user": SimpleNamespace(tag_value=f"id:{rng.randint(1, 200)}"),
+                "groups": [SimpleNamespace(group=SimpleNamespace(id=group_id), group_release=None)],
+            }
+        )
+    return jobs
+
+
+@requires_pytest_benchmark
+@django_db_all
+@pytest.mark.parametrize("coalesce_writes", [False, True])
+def test_benchmark_tsdb_record_all_metrics(coalesce_writes, benchmark):
+    with override_options({"redis.clusters": REDIS_CLUSTERS}):
+        db = RedisTSDB(
+            rollups=((10, 30), (ONE_MINUTE, 120), (ONE_HOUR, 24), (ONE_DAY, 30)),
+            cluster="tsdb",
+        )
+    jobs = build_save_event_batch()
+
+    try:
+        with (
+            override_options({"store.tsdb-coalesce-writes": coalesce_writes}),
+            mock.patch("sentry.event_manager.tsdb", new=SimpleNamespace(backend=db)),
+        ):
+            benchmark.pedantic(_tsdb_record_all_metrics, args=(jobs,), rounds=5)
+    finally:
+        with db.cluster.all() as client:
+            client.flushdb()
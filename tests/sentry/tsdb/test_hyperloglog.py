@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from sentry.tsdb.hyperloglog import HyperLogLog, InvalidHyperLogLog
+from sentry.utils import redis
+
+
+@pytest.fixture
+def client():
+    client = redis.redis_clusters.get_binary("default")
+    keys = [f"hll:{i}" for i in range(3)]
+    client.delete(*keys)
+    yield client
+    client.delete(*keys)
+
+
+def test_empty():
+    assert HyperLogLog().cardinality() == 0
+
+
+@pytest.mark.parametrize("size", [1, 10, 1_000, 5_000, 100_000])
+def test_cardinality_matches_pfcount(client, size):
+    rng = random.Random(size)
+    for i in range(3):
+        client.pfadd(f"hll:{i}", *(rng.randint(0, size * 2) for _ in range(size)))
+    keys = [f"hll:{i}" for i in range(3)]
+
+    hll = HyperLogLog()
+    for key in keys:
+        hll.merge(client.get(key))
+        assert hll.cardinality() == client.pfcount(*keys[: keys.index(key) + 1])
+
+
+def test_merge_dense_and_sparse(client):
+    client.pfadd("hll:0", *range(50_000))
+    client.pfadd("hll:1", *range(49_990, 50_010))
+    assert client.get("hll:0")[4] == 0
+    assert client.get("hll:1")[4] == 1
+
+    hll = HyperLogLog()
+    hll.merge(client.get("hll:1"))
+    hll.merge(client.get("hll:0"))
+    assert hll.cardinality() == client.pfcount("hll:0", "hll:1")
+
+
+def test_invalid():
+    with pytest.raises(InvalidHyperLogLog):
+        HyperLogLog().merge(b"not a hyperloglog")
+    with pytest.raises(InvalidHyperLogLog):
+        HyperLogLog().merge(b"HYLL" + bytes([1]) + bytes(11) + bytes([0x40]))
+    with pytest.raises(InvalidHyperLogLog):
+        HyperLogLog().merge(b"HYLL" + bytes(12) + bytes(10))
@@ -1,5 +1,7 @@
+import random
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from unittest import mock
 
 import pytest
 
@@ -323,6 +325,124 @@ class RedisTSDBTest(TestCase):
         )
         assert results == {1: 0, 2: 0}
 
+    def test_coalesce_writes(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(4)]
+
+        def timestamp(d):
+            t = int(d.timestamp())
+            return t - (t % 3600)
+
+        model = TSDBModel.users_affected_by_group
+
+        with mock.patch("sentry.tsdb.redis.metrics") as mock_metrics:
+            with self.db.coalesce_writes():
+                self.db.incr(TSDBModel.project, 1, dts[0])
+                self.db.incr(TSDBModel.project, 1, dts[1], count=2)
+                self.db.incr(TSDBModel.project, 1, dts[1], environment_id=1)
+                with self.db.coalesce_writes():
+                    self.db.incr_multi(
+                        [(TSDBModel.project, 1), (TSDBModel.project, 2)], dts[3], environment_id=1
+                    )
+                self.db.incr_multi(
+                    [(TSDBModel.project, 1), (TSDBModel.project, 2)], dts[3], environment_id=1
+                )
+                self.db.record(model, 1, ("foo", "bar"), dts[0])
+                self.db.record_multi(((model, 1, ("foo", "baz")), (model, 2, ("bar",))), dts[0])
+                self.db.record(model, 2, ("foo",), dts[3], environment_id=1)
+
+                # Nothing is written before the block exits
+                assert self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1]) == {
+                    1: 0,
+                    2: 0,
+                }
+                assert self.db.get_distinct_counts_totals(model, [1, 2], dts[0], dts[-1]) == {
+                    1: 0,
+                    2: 0,
+                }
+
+        results = self.db.get_range(TSDBModel.project, [1, 2], dts[0], dts[-1])
+        assert results == {
+            1: [
+                (timestamp(dts[0]), 1),
+                (timestamp(dts[1]), 3),
+                (timestamp(dts[2]), 0),
+                (timestamp(dts[3]), 2),
+            ],
+            2: [
+                (timestamp(dts[0]), 0),
+                (timestamp(dts[1]), 0),
+                (timestamp(dts[2]), 0),
+                (timestamp(dts[3]), 2),
+            ],
+        }
+        assert self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1) == {
+            1: 3,
+            2: 2,
+        }
+
+        assert self.db.get_distinct_counts_totals(model, [1, 2], dts[0], dts[-1]) == {1: 3, 2: 2}
+        assert self.db.get_distinct_counts_union(model, [1, 2], dts[0], dts[-1]) == 3
+        assert (
+            self.db.get_distinct_counts_union(model, [1, 2], dts[0], dts[-1], environment_id=1) == 1
+        )
+
+        # Every written key expires
+        with self.db.cluster.all() as client:
+            keys = client.keys("ts:*")
+        for host, host_keys in keys.value.items():
+            for key in host_keys:
+                assert self.db.cluster.get_local_client(host).ttl(key) > 0
+
+        buffered = mock_metrics.incr.call_args_list[0]
+        flushed = mock_metrics.incr.call_args_list[1]
+        assert buffered.args == ("tsdb.redis.coalesced_writes.buffered",)
+        assert flushed.args == ("tsdb.redis.coalesced_writes.flushed",)
+        assert buffered.kwargs["amount"] > flushed.kwargs["amount"]
+
+    def test_coalesce_writes_non_durable(self):
+        with mock.patch.object(self.db, "get_cluster", return_value=(self.db.cluster, False)):
+            with mock.patch.object(
+                self.db, "_flush_pending_writes", side_effect=Exception("Boom!")
+            ):
+                with self.db.coalesce_writes():
+                    self.db.incr(TSDBModel.project, 1)
+
+        with mock.patch.object(self.db, "_flush_pending_writes", side_effect=Exception("Boom!")):
+            with pytest.raises(Exception):
+                with self.db.coalesce_writes():
+                    self.db.incr(TSDBModel.project, 1)
+
+    def test_distinct_counts_union_client_side(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(4)]
+        model = TSDBModel.users_affected_by_group
+        rng = random.Random(1234)
+
+        # Groups with a few users (sparse HyperLogLogs) and many users (dense ones)
+        for key, size in [(1, 3), (2, 100), (3, 2_000), (4, 20_000)]:
+            for dt in dts:
+                values = [f"user:{rng.randint(0, size * 2)}" for _ in range(size)]
+                self.db.record(model, key, values, dt)
+                self.db.record(model, key, values[: size // 2], dt, environment_id=1)
+
+        for keys in [[1], [1, 2], [2, 3], [1, 2, 3, 4], [5], [1, 5]]:
+            for environment_id in [None, 1, 2]:
+                for rollup in [3600, None]:
+                    args = (model, keys, dts[0], dts[-1], rollup, environment_id)
+                    expected = self.db.get_distinct_counts_union(*args)
+                    with override_options({"tsdb.redis.client-side-distinct-counts-union": True}):
+                        assert self.db.get_distinct_counts_union(*args) == expected
+
+        # The client side merge doesn't write any temporary keys
+        with self.db.cluster.all() as client:
+            key_counts_before = client.dbsize()
+        with override_options({"tsdb.redis.client-side-distinct-counts-union": True}):
+            assert self.db.get_distinct_counts_union(model, [1, 2, 3, 4], dts[0], dts[-1]) > 0
+        with self.db.cluster.all() as client:
+            key_counts_after = client.dbsize()
+        assert key_counts_after.value == key_counts_before.value
+
     def test_frequency_tables(self):
         now = datetime.now(timezone.utc)
         model = TSDBModel.frequent_issues_by_project
@@ -0,0 +1,52 @@
+import tracemalloc
+
+import pytest
+
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+from sentry.utils.snuba_stream import decode_response
+
+NUM_ROWS = 20_000
+NUM_COLUMNS = 30
+CHUNK_SIZE = 64 * 1024
+
+
+def build_response() -> list[bytes]:
+    """The chunks of a wide discover query response."""
+    rows = [
+        {f"column_{j}": i * j if j % 2 else f"value-{i}-{j}" for j in range(NUM_COLUMNS)}
+        for i in range(NUM_ROWS)
+    ]
+    body = json.dumps({"meta": [], "data": rows, "timing": {}}).encode()
+    return [body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+
+
+def decode_buffered(chunks: list[bytes]) -> dict:
+    body = json.loads(b"".join(chunks))
+    body["data"] = [dict(row) for row in body["data"]]
+    return body
+
+
+def peak_memory(decode, chunks: list[bytes]) -> int:
+    tracemalloc.start()
+    try:
+        decode(chunks)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("mode", ["buffered", "streaming", "columnar"])
+def test_benchmark_decode_response(mode, benchmark):
+    chunks = build_response()
+    decode = {
+        "buffered": decode_buffered,
+        "streaming": lambda chunks: decode_response(chunks, lambda row: row),
+        "columnar": lambda chunks: decode_response(chunks, lambda row: row, columnar=True),
+    }[mode]
+
+    body = benchmark.pedantic(decode, args=(chunks,), rounds=5)
+
+    assert len(body["data"]) == NUM_ROWS
+    benchmark.extra_info["peak_memory"] = peak_memory(decode, chunks)
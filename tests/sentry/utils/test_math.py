@@ -69,3 +69,13 @@ def test_exponential_moving_average(sequence, expected):
     for i, x in enumerate(sequence):
         t = avg.update(i, t, x)
     assert t == pytest.approx(expected, abs=1e-3)
+
+
+def test_exponential_moving_average_update_many():
+    avg = ExponentialMovingAverage(2 / 11)
+    ns = [0, 1, 5, 10]
+    avgs = [0.0, 1.0, 2.5, 7.0]
+    values = [3.0, 1.0, 0.0, 10.0]
+    assert avg.update_many(ns, avgs, values) == [
+        avg.update(n, a, x) for n, a, x in zip(ns, avgs, values)
+    ]
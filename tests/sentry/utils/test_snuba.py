@@ -1,10 +1,15 @@
+import io
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from unittest import mock
 
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
-from urllib3 import HTTPConnectionPool
+from snuba_sdk import Column, Condition, Entity, Limit, Op, Query, Request
+from urllib3 import HTTPConnectionPool, HTTPResponse
 from urllib3.exceptions import HTTPError, ReadTimeoutError
 
 from sentry.models.grouprelease import GroupRelease
@@ -12,18 +17,26 @@ from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.utils import json
 from sentry.utils.snuba import (
     ROUND_UP,
     RetrySkipTimeout,
     SnubaQueryParams,
+    UnexpectedResponseError,
     UnqualifiedQueryError,
+    _get_cache_lease,
+    _get_stale_cache_key,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
     get_snuba_translators,
     quantize_time,
+    raw_snql_query,
 )
+from sentry.utils.snuba_stream import ColumnarRows
 
 
 class SnubaUtilsTest(TestCase):
@@ -443,3 +456,193 @@ def test_retries():
         snuba_pool.urlopen("POST", "/query", body="{}")
 
     assert connection_mock.request.call_count == 1
+
+
+class SnubaQueryCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = Request(
+            dataset="events",
+            app_id="tests",
+            tenant_ids={"referrer": "testing.test", "organization_id": 1},
+            query=Query(
+                Entity("events"),
+                select=[Column("event_id")],
+                where=[Condition(Column("project_id"), Op.EQ, 1)],
+                limit=Limit(1),
+            ),
+        )
+
+    def query(self):
+        return raw_snql_query(self.request, referrer="testing.test", use_cache=True)
+
+    def get_cache_key(self):
+        # The request is updated with the referrer and parent api before it's cached
+        with mock.patch(
+            "sentry.utils.snuba._bulk_snuba_query", return_value=[{"data": []}]
+        ) as bulk_query:
+            self.query()
+        [[[snuba_request]], _] = bulk_query.call_args
+        cache.clear()
+        return get_cache_key(snuba_request.request)
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query", return_value=[{"data": [1]}])
+    @override_options({"snuba.query-cache.coalesce.enabled": True})
+    def test_coalesce_first_caller(self, bulk_query):
+        cache_key = self.get_cache_key()
+
+        assert self.query() == {"data": [1]}
+        assert self.query() == {"data": [1]}
+        assert bulk_query.call_count == 1
+        assert json.loads(cache.get(cache_key)) == {"data": [1]}
+        assert not _get_cache_lease(cache_key).locked()
+
+    @mock.patch("sentry.utils.snuba.metrics")
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query", return_value=[{"data": [1]}])
+    @override_options({"snuba.query-cache.coalesce.enabled": True})
+    def test_coalesce_waits_for_result(self, bulk_query, metrics):
+        cache_key = self.get_cache_key()
+        lease = _get_cache_lease(cache_key)
+        lease.acquire()
+
+        def finish_query():
+            cache.set(cache_key, json.dumps({"data": [2]}), 60)
+            lease.release()
+
+        timer = threading.Timer(0.2, finish_query)
+        timer.start()
+        try:
+            assert self.query() == {"data": [2]}
+        finally:
+            timer.join()
+
+        assert bulk_query.call_count == 0
+        metrics.incr.assert_any_call(
+            "snuba.query_cache.coalesced", tags={"referrer": "testing.test"}
+        )
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query", return_value=[{"data": [1]}])
+    @override_options({"snuba.query-cache.coalesce.enabled": True})
+    def test_coalesce_lease_released_without_result(self, bulk_query):
+        cache_key = self.get_cache_key()
+        lease = _get_cache_lease(cache_key)
+        lease.acquire()
+
+        timer = threading.Timer(0.2, lease.release)
+        timer.start()
+        try:
+            assert self.query() == {"data": [1]}
+        finally:
+            timer.join()
+
+        assert bulk_query.call_count == 1
+        assert json.loads(cache.get(cache_key)) == {"data": [1]}
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query", return_value=[{"data": [1]}])
+    def test_coalesce_disabled(self, bulk_query):
+        cache_key = self.get_cache_key()
+        lease = _get_cache_lease(cache_key)
+        lease.acquire()
+        try:
+            assert self.query() == {"data": [1]}
+        finally:
+            lease.release()
+
+        assert bulk_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba.metrics")
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    @override_options({"snuba.query-cache.stale-while-revalidate.referrers": ["testing.test"]})
+    def test_stale_while_revalidate(self, bulk_query, metrics):
+        cache_key = self.get_cache_key()
+
+        bulk_query.return_value = [{"data": [1]}]
+        assert self.query() == {"data": [1]}
+        assert json.loads(cache.get(_get_stale_cache_key(cache_key))) == {"data": [1]}
+
+        # the cached result expired
+        cache.delete(cache_key)
+        bulk_query.return_value = [{"data": [2]}]
+        revalidate_pool = ThreadPoolExecutor(max_workers=1)
+        with mock.patch("sentry.utils.snuba._revalidate_thread_pool", revalidate_pool):
+            assert self.query() == {"data": [1]}
+            revalidate_pool.shutdown(wait=True)
+
+        metrics.incr.assert_any_call(
+            "snuba.query_cache.stale_hit", tags={"referrer": "testing.test"}
+        )
+        assert bulk_query.call_count == 2
+        assert json.loads(cache.get(cache_key)) == {"data": [2]}
+        assert json.loads(cache.get(_get_stale_cache_key(cache_key))) == {"data": [2]}
+        assert not _get_cache_lease(cache_key).locked()
+        assert self.query() == {"data": [2]}
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query", return_value=[{"data": [1]}])
+    def test_stale_while_revalidate_other_referrer(self, bulk_query):
+        cache_key = self.get_cache_key()
+
+        assert self.query() == {"data": [1]}
+        assert cache.get(_get_stale_cache_key(cache_key)) is None
+
+
+class SnubaStreamingDecodeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = Request(
+            dataset="events",
+            app_id="tests",
+            tenant_ids={"referrer": "testing.test", "organization_id": 1},
+            query=Query(
+                Entity("events"),
+                select=[Column("event_id"), Column("title")],
+                where=[Condition(Column("project_id"), Op.EQ, 1)],
+                limit=Limit(2),
+            ),
+        )
+        self.body = {
+            "data": [{"event_id": "a" * 32, "title": "a"}, {"event_id": "b" * 32, "title": "b"}],
+            "meta": [{"name": "event_id", "type": "String"}, {"name": "title", "type": "String"}],
+        }
+
+    def urlopen(self, response_body: bytes, status: int = 200):
+        def urlopen(method, url, body=None, headers=None, preload_content=True):
+            return HTTPResponse(
+                body=io.BytesIO(response_body), status=status, preload_content=preload_content
+            )
+
+        return mock.patch("sentry.utils.snuba._snuba_pool.urlopen", side_effect=urlopen)
+
+    def test_streaming_decode(self):
+        with self.urlopen(json.dumps(self.body).encode()) as urlopen:
+            with override_options({"snuba.query.streaming-decode.enabled": True}):
+                assert raw_snql_query(self.request, referrer="testing.test") == self.body
+        assert urlopen.call_args.kwargs["preload_content"] is False
+
+    def test_columnar(self):
+        with self.urlopen(json.dumps(self.body).encode()) as urlopen:
+            result = raw_snql_query(self.request, referrer="testing.test", columnar=True)
+        assert urlopen.call_args.kwargs["preload_content"] is False
+        assert isinstance(result["data"], ColumnarRows)
+        assert result["data"].columns["title"] == ["a", "b"]
+        assert list(result["data"]) == self.body["data"]
+
+    def test_columnar_cached(self):
+        with self.urlopen(json.dumps(self.body).encode()) as urlopen:
+            raw_snql_query(self.request, referrer="testing.test", use_cache=True, columnar=True)
+            result = raw_snql_query(
+                self.request, referrer="testing.test", use_cache=True, columnar=True
+            )
+        assert urlopen.call_count == 1
+        assert isinstance(result["data"], ColumnarRows)
+        assert list(result["data"]) == self.body["data"]
+
+    def test_streaming_decode_error_response(self):
+        error = {"error": {"type": "invalid_query", "message": "invalid"}}
+        with self.urlopen(json.dumps(error).encode(), status=400):
+            with pytest.raises(UnqualifiedQueryError):
+                raw_snql_query(self.request, referrer="testing.test", columnar=True)
+
+    def test_streaming_decode_invalid_response(self):
+        with self.urlopen(b'{"data": [{"event_id": '):
+            with pytest.raises(UnexpectedResponseError):
+                raw_snql_query(self.request, referrer="testing.test", columnar=True)
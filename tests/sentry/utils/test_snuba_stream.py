@@ -0,0 +1,82 @@
+import pytest
+
+from sentry.utils import json
+from sentry.utils.snuba_stream import ColumnarRows, decode_response
+
+BODY = {
+    "meta": [{"name": "title", "type": "String"}, {"name": "count", "type": "UInt64"}],
+    "data": [
+        {"title": "Ünïcödé", "count": 123456789, "tags": {"level": "error"}},
+        {"title": "a } in a string", "count": 0.5, "tags": {}},
+        {"title": None, "count": 2**70, "tags": {"nested": [{"a": 1}]}},
+    ],
+    "timing": {"timestamp": 1, "duration_ms": 5},
+    "sql": "SELECT title, count() FROM errors",
+}
+
+
+def chunked(body: bytes, size: int) -> list[bytes]:
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 65536])
+def test_decode_response(chunk_size):
+    raw = json.dumps(BODY).encode()
+    assert decode_response(chunked(raw, chunk_size), lambda row: row) == BODY
+
+
+def test_decode_response_whitespace():
+    raw = (
+        b' \n{ "data" : [ \n'
+        + b",\n ".join(json.dumps(row).encode() for row in BODY["data"])
+        + b'\n] , "sql": "" }\n'
+    )
+    assert decode_response(chunked(raw, 5), lambda row: row) == {
+        "data": BODY["data"],
+        "sql": "",
+    }
+
+
+def test_decode_response_translates_rows():
+    raw = json.dumps({"data": [{"project_id": 1}, {"project_id": 2}]}).encode()
+    body = decode_response(chunked(raw, 4), lambda row: {"project": row["project_id"] * 10})
+    assert body == {"data": [{"project": 10}, {"project": 20}]}
+
+
+def test_decode_response_empty():
+    assert decode_response([b"{}"], lambda row: row) == {}
+    assert decode_response([b'{"data": []}'], lambda row: row) == {"data": []}
+    assert len(decode_response([b'{"data": []}'], lambda row: row, columnar=True)["data"]) == 0
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [b"", b"[]", b'{"data": [{"a": 1}', b'{"data": [{"a": 1} {"a": 2}]}', b'{"data": [{"a": }]}'],
+)
+def test_decode_response_invalid(raw):
+    with pytest.raises(ValueError):
+        decode_response(chunked(raw, 3), lambda row: row)
+
+
+def test_decode_response_columnar():
+    raw = json.dumps(BODY).encode()
+    body = decode_response(chunked(raw, 16), lambda row: row, columnar=True)
+
+    rows = body["data"]
+    assert isinstance(rows, ColumnarRows)
+    assert rows.columns["title"] == ["Ünïcödé", "a } in a string", None]
+    assert list(rows) == BODY["data"]
+    assert body["sql"] == BODY["sql"]
+
+
+def test_columnar_rows():
+    rows = ColumnarRows.from_rows([{"a": 1, "b": 2}, {"a": 3}, {"c": 4}])
+
+    assert len(rows) == 3
+    assert rows[0] == {"a": 1, "b": 2}
+    assert rows[1] == {"a": 3}
+    assert rows[-1] == {"c": 4}
+    assert rows[1:] == [{"a": 3}, {"c": 4}]
+    assert list(rows) == [{"a": 1, "b": 2}, {"a": 3}, {"c": 4}]
+    with pytest.raises(IndexError):
+        rows[3]
@@ -35,6 +35,7 @@ from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import SnubaTestCase, TestCase, TransactionTestCase
 from sentry.testutils.helpers import Feature, apply_feature_flag_on_cls
 from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.skips import xfail_if_not_postgres
 from sentry.types.group import GroupSubStatus, PriorityLevel
 from sentry.utils import json
@@ -1888,6 +1889,25 @@ class EventsSnubaSearchTestCases(EventsDatasetTestSetup):
         finally:
             options.set("snuba.search.max-pre-snuba-candidates", prev_max_pre)
 
+    def test_planned_pre_and_post_filtering(self):
+        # With a sample of one group the query is post-filtered or joined, otherwise every
+        # group matching in Snuba is sampled and passed back down as candidates.
+        for sample_size, joined_query_min_chunks in [(100, 0), (1, 0), (1, 1)]:
+            with override_options(
+                {
+                    "snuba.search.max-pre-snuba-candidates": 1,
+                    "snuba.search.hits-sample-size": sample_size,
+                    "snuba.search.planner.enabled": True,
+                    "snuba.search.planner.joined-query-min-chunks": joined_query_min_chunks,
+                }
+            ):
+                results = self.make_query(search_filter_query="foo", sort_by="freq")
+                assert set(results) == {self.group1}
+
+                results = self.make_query(sort_by="freq", count_hits=True)
+                assert set(results) == {self.group1, self.group2}
+                assert results.hits == 2
+
     def test_optimizer_enabled(self):
         prev_optimizer_enabled = options.get("snuba.search.pre-snuba-candidates-optimizer")
         options.set("snuba.search.pre-snuba-candidates-optimizer", True)